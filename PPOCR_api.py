@@ -7,6 +7,8 @@ import socket  # 套接字
 import atexit  # 退出处理
 import subprocess  # 进程，管道
 import re  # regex
+import threading  # 连接池锁
+from collections import deque  # 空闲连接池
 from json import loads as jsonLoads, dumps as jsonDumps
 from sys import platform as sysPlatform  # popen静默模式
 from base64 import b64encode  # base64 编码
@@ -36,6 +38,10 @@ class PPOCR_pipe:  # 调用OCR（管道模式）
         if isinstance(argument, dict):
             for key, value in argument.items():
                 # Popen() 要求输入list里所有的元素都是 str 或 bytes
+                if isinstance(value, bool):
+                    # gflags 的布尔参数不读取下一个参数作为值（"--key false" 会被解析为 true），必须写成 "--key=false"
+                    cmds.append(f"--{key}={'true' if value else 'false'}")
+                    continue
                 cmds += [
                     f"--{key}",
                     str(value),
@@ -175,12 +181,34 @@ class PPOCR_pipe:  # 调用OCR（管道模式）
 class PPOCR_socket(PPOCR_pipe):
     """调用OCR（套接字模式）"""
 
-    def __init__(self, exePath: str, modelsPath: str = None, argument: dict = None):
+    # 接收缓冲区初始大小（不足时按倍数扩容）
+    RECV_BUFFER_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        exePath: str,
+        modelsPath: str = None,
+        argument: dict = None,
+        connectTimeout: float = 5.0,
+        readTimeout: float = 60.0,
+        maxIdleConnections: int = 4,
+    ):
         """初始化识别器（套接字模式）。\n
         `exePath`: 识别器`PaddleOCR_json.exe`的路径。\n
         `modelsPath`: 识别库`models`文件夹的路径。若为None则默认识别库与识别器在同一目录下。\n
-        `argument`: 启动参数，字典`{"键":值}`。参数说明见 https://github.com/hiroi-sora/PaddleOCR-json
+        `argument`: 启动参数，字典`{"键":值}`。参数说明见 https://github.com/hiroi-sora/PaddleOCR-json\n
+        `connectTimeout`: 建立连接的超时秒数，None为不限。\n
+        `readTimeout`: 等待识别结果的超时秒数，None为不限。\n
+        `maxIdleConnections`: 保持存活的空闲连接数上限（服务器不关闭连接时复用）。
         """
+        # 连接参数与空闲连接池
+        self.connectTimeout = connectTimeout
+        self.readTimeout = readTimeout
+        self.maxIdleConnections = maxIdleConnections
+        self.__idleConnections = deque()
+        self.__connLock = threading.Lock()
+        self.__keepAlive = True  # 发现服务器每次回复后都关闭连接时置为 False，不再复用连接
+
         # 处理参数
         if not argument:
             argument = {}
@@ -240,29 +268,43 @@ class PPOCR_socket(PPOCR_pipe):
                 return {"code": 901, "data": f"子进程已崩溃。"}
 
         # 通信
-        writeStr = jsonDumps(writeDict, ensure_ascii=True, indent=None) + "\n"
-        try:
-            # 创建TCP连接
-            clientSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            clientSocket.connect((self.ip, self.port))
-            # 发送数据
-            clientSocket.sendall(writeStr.encode())
-            # 接收数据
-            resData = b""
-            while True:
-                chunk = clientSocket.recv(1024)
-                if not chunk:
-                    break
-                resData += chunk
-            getStr = resData.decode()
-        except ConnectionRefusedError:
-            return {"code": 902, "data": "连接被拒绝"}
-        except TimeoutError:
-            return {"code": 903, "data": "连接超时"}
-        except Exception as e:
-            return {"code": 904, "data": f"网络错误：{e}"}
-        finally:
-            clientSocket.close()  # 关闭连接
+        writeBytes = (jsonDumps(writeDict, ensure_ascii=True, indent=None) + "\n").encode()
+        getStr = ""
+        for attempt in range(2):
+            clientSocket, reused = self.__acquireConnection()
+            try:
+                if clientSocket is None:
+                    clientSocket = socket.create_connection(
+                        (self.ip, self.port), timeout=self.connectTimeout
+                    )
+                clientSocket.settimeout(self.readTimeout)
+                # 发送数据
+                clientSocket.sendall(writeBytes)
+                # 接收数据（以换行或连接关闭作为一条响应的结束）
+                resData, keepAlive = self.__recvResponse(clientSocket)
+            except ConnectionRefusedError:
+                self.__closeConnection(clientSocket)
+                return {"code": 902, "data": "连接被拒绝"}
+            except (socket.timeout, TimeoutError):
+                self.__closeConnection(clientSocket)
+                return {"code": 903, "data": "连接超时"}
+            except OSError as e:
+                self.__closeConnection(clientSocket)
+                if reused and attempt == 0:  # 复用的连接已被服务器关闭，换新连接重试
+                    self.__disableKeepAlive()
+                    continue
+                return {"code": 904, "data": f"网络错误：{e}"}
+            if not resData and reused and attempt == 0:
+                # 复用的连接已被服务器关闭（未收到任何数据），换新连接重试
+                self.__closeConnection(clientSocket)
+                self.__disableKeepAlive()
+                continue
+            if keepAlive and self.__keepAlive:
+                self.__releaseConnection(clientSocket)
+            else:
+                self.__closeConnection(clientSocket)
+            getStr = resData.decode("utf-8", errors="ignore")
+            break
         # 反序列输出信息
         try:
             return jsonLoads(getStr)
@@ -272,8 +314,87 @@ class PPOCR_socket(PPOCR_pipe):
                 "data": f"识别器输出值反序列化JSON失败。异常信息：[{e}]。原始内容：[{getStr}]",
             }
 
+    def __recvResponse(self, clientSocket):
+        """读取一条响应：写入预分配的缓冲区，遇到换行或连接关闭即结束。\n
+        `return`: (响应字节, 连接是否可复用)"""
+        buffer = bytearray(self.RECV_BUFFER_SIZE)
+        view = memoryview(buffer)
+        size = 0
+        try:
+            while True:
+                if size == len(buffer):  # 缓冲区已满，扩容一倍
+                    view.release()
+                    buffer.extend(bytes(len(buffer)))
+                    view = memoryview(buffer)
+                count = clientSocket.recv_into(view[size:])
+                if count == 0:  # 服务器关闭连接
+                    return bytes(view[:size]), False
+                newline = buffer.find(b"\n", size, size + count)
+                size += count
+                if newline >= 0:
+                    # 收到完整的一行；若换行后还有多余数据，说明协议不一致，不再复用该连接
+                    return bytes(view[:newline]), newline + 1 == size
+        finally:
+            view.release()
+
+    def __acquireConnection(self):
+        """从空闲连接池取出一个仍然打开的连接（已被服务器关闭的直接丢弃）。\n
+        `return`: (socket或None, 是否为复用连接)"""
+        while True:
+            with self.__connLock:
+                if not self.__idleConnections:
+                    return None, False
+                clientSocket = self.__idleConnections.pop()
+            if self.__isConnectionOpen(clientSocket):
+                return clientSocket, True
+            self.__closeConnection(clientSocket)
+
+    @staticmethod
+    def __isConnectionOpen(clientSocket):
+        """非阻塞地窥探空闲连接：没有可读数据说明仍然打开；读到EOF（服务器已关闭）或多余数据都不可复用"""
+        try:
+            clientSocket.setblocking(False)
+            clientSocket.recv(1, socket.MSG_PEEK)
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+        return False
+
+    def __disableKeepAlive(self):
+        """服务器在回复后关闭了连接：之后每个请求都使用新连接，不再先在失效的连接上发送一次"""
+        if self.__keepAlive:
+            self.__keepAlive = False
+            self.closeIdleConnections()
+
+    def __releaseConnection(self, clientSocket):
+        """归还可复用的连接"""
+        with self.__connLock:
+            if len(self.__idleConnections) < self.maxIdleConnections:
+                self.__idleConnections.append(clientSocket)
+                return
+        clientSocket.close()
+
+    @staticmethod
+    def __closeConnection(clientSocket):
+        if clientSocket is not None:
+            try:
+                clientSocket.close()
+            except OSError:
+                pass
+
+    def closeIdleConnections(self):
+        """关闭所有空闲连接"""
+        if not hasattr(self, "_PPOCR_socket__connLock"):
+            return
+        with self.__connLock:
+            idle, self.__idleConnections = self.__idleConnections, deque()
+        for clientSocket in idle:
+            self.__closeConnection(clientSocket)
+
     def exit(self):
         """关闭引擎子进程"""
+        self.closeIdleConnections()
         # 仅在本地模式下关闭引擎进程
         if hasattr(self, "ret"):
             if self.__runningMode == "local":
@@ -315,16 +436,21 @@ class PPOCR_socket(PPOCR_pipe):
 
 
 def GetOcrApi(
-    exePath: str, modelsPath: str = None, argument: dict = None, ipcMode: str = "pipe"
+    exePath: str,
+    modelsPath: str = None,
+    argument: dict = None,
+    ipcMode: str = "pipe",
+    **socketOptions,
 ):
     """获取识别器API对象。\n
     `exePath`: 识别器`PaddleOCR_json.exe`的路径。\n
     `modelsPath`: 识别库`models`文件夹的路径。若为None则默认识别库与识别器在同一目录下。\n
     `argument`: 启动参数，字典`{"键":值}`。参数说明见 https://github.com/hiroi-sora/PaddleOCR-json\n
-    `ipcMode`: 进程通信模式，可选值为套接字模式`socket` 或 管道模式`pipe`。用法上完全一致。
+    `ipcMode`: 进程通信模式，可选值为套接字模式`socket` 或 管道模式`pipe`。用法上完全一致。\n
+    `socketOptions`: 套接字模式的连接参数（connectTimeout / readTimeout / maxIdleConnections）。
     """
     if ipcMode == "socket":
-        return PPOCR_socket(exePath, modelsPath, argument)
+        return PPOCR_socket(exePath, modelsPath, argument, **socketOptions)
     elif ipcMode == "pipe":
         return PPOCR_pipe(exePath, modelsPath, argument)
     else:
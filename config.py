@@ -11,6 +11,7 @@
    控制开关（默认都启用）：
      PADDLE_ENABLED = True   # 是否启用PaddleOCR
      RAPID_ENABLED = True    # 是否启用RapidOCR
+     ONNX_ENABLED = True     # 是否启用原生ONNX引擎（进程内推理，无需wine）
    
    如需禁用某个本地引擎（如仅使用PaddleOCR）：
      PADDLE_ENABLED = True   # 启用
@@ -120,23 +121,121 @@ class Config:
     COLOR_RECT_DRAWING = "blue"
     
     # OCR配置
-    OCR_ENGINE = 'paddle'  # 引擎选择：paddle=PaddleOCR（本地运行，极高精度，推荐）, aliyun=阿里云OCR（在线服务，需配置密钥）, rapid=RapidOCR（本地运行，高速度）, deepseek=DeepSeek OCR（在线服务，需配置密钥）
+    OCR_ENGINE = 'paddle'  # 引擎选择：paddle=PaddleOCR（本地运行，极高精度，推荐）, aliyun=阿里云OCR（在线服务，需配置密钥）, rapid=RapidOCR（本地运行，高速度）, deepseek=DeepSeek OCR（在线服务，需配置密钥）, remote=远程PaddleOCR服务器集群（需配置 OCR_REMOTE_ENDPOINTS）
     # 注意：paddle引擎为本地运行，无需配置密钥，自动检测硬件并选择最优配置
+    OCR_ENGINE_INIT_MODE = 'parallel'  # 其他引擎的启动方式：parallel=后台并行启动（切换时无需等待）, lazy=首次选用时才启动（未使用的引擎不占内存与启动CPU）
+    OCR_ENGINE_INIT_WORKERS = 4  # parallel 模式下同时启动的引擎数
+    OCR_AVAILABILITY_CACHE = True  # 缓存引擎可用性检测结果（配置、可执行文件、模型目录、已安装的SDK都没变时启动时不再检测，改为后台刷新）
+    OCR_AVAILABILITY_CACHE_FILE = ''  # 缓存文件路径，空=配置目录下的 engine_availability.json
+
+    # 自适应引擎路由（每个请求按各引擎的实时延迟、错误率、排队深度选择引擎，出错或超时自动切换到下一个引擎，见 ocr_router.py）
+    OCR_ROUTING_ENABLED = False  # 是否启用（参与路由的是已启动的引擎，OCR_ENGINE_INIT_MODE='lazy' 时只有用过的引擎）
+    OCR_ROUTING_POLICY = 'local-first'  # 路由策略：local-first=本地引擎优先, fastest=预计耗时最短, cheapest=按次计费最低优先
+    OCR_ROUTING_ENGINES = []  # 参与路由的引擎类型，如 ['onnx', 'paddle', 'remote']，空=全部已启动的引擎
+    OCR_ROUTING_TIMEOUT = 30  # 单次请求超时秒数，超时即切换到下一个引擎，0=不限
+    OCR_ROUTING_EWMA_ALPHA = 0.2  # 延迟与错误率滑动平均的平滑系数（越大越偏重最近的请求）
+    OCR_ROUTING_BACKOFF = 5  # 引擎失败后的冷却秒数（连续失败时翻倍）
+    OCR_ROUTING_MAX_BACKOFF = 300  # 冷却时间上限（秒）
+    OCR_ROUTING_MAX_ABANDONED = 4  # 每个引擎最多保留的超时未结束请求数（超时的请求无法中断，各占用一个线程），达到上限时暂不向该引擎派发
     OCR_USE_GPU = 'auto'  # GPU设置：'auto'=自动检测，True=强制GPU，False=强制CPU
     OCR_USE_ANGLE_CLS = True  # 是否使用角度分类（处理旋转文字）
-    OCR_LANG = 'ch'  # 语言：ch=中英文, en=英文, chinese_cht=繁体中文
+    OCR_LANG = 'ch'  # 默认识别语言：ch=中英文, en=英文, chinese_cht=繁体中文, japan=日文, korean=韩文, cyrillic=俄文（本地引擎按区域语言路由，见 ocr_language_registry.py）
+    OCR_LANG_MAX_ENGINES = 2  # 默认语言之外最多同时保留的语言引擎数（超出时关闭最久未使用的）
     OCR_SHOW_LOG = False  # 是否显示详细日志（建议关闭以提高性能）
+    OCR_PROFILE = 'balanced'  # 本地引擎性能档位：fast=速度优先, balanced=均衡, accurate=精度优先（映射为引擎启动参数，见 ocr_profiles.py）
+    OCR_MODEL_SET = 'fp32'  # ONNX模型精度：fp32=原始模型, int8=量化模型（由 ocr_quantize.py 生成，不存在时回退fp32；适用于ONNX引擎与RapidOCR）
     
     # 本地OCR引擎配置,True(启用),False(禁用)
     PADDLE_ENABLED = True   # 是否启用PaddleOCR（本地引擎，推荐）
     RAPID_ENABLED = False    # 是否启用RapidOCR（本地引擎，轻量级）
-    
+    ONNX_ENABLED = True    # 是否启用原生ONNX引擎（进程内推理，Linux下无需wine；需安装onnxruntime并提供识别模型）
+
+    # 原生ONNX引擎模型（文件名相对于模型目录；默认与RapidOCR-json共用 models/RapidOCR-json/.../models）
+    ONNX_MODELS_DIR = ''  # 模型目录，留空使用默认目录
+    ONNX_DET_MODEL = 'ch_PP-OCRv3_det_infer.onnx'  # 检测模型
+    ONNX_CLS_MODEL = 'ch_ppocr_mobile_v2.0_cls_infer.onnx'  # 方向分类模型（性能档位关闭方向分类时不加载）
+    ONNX_REC_MODEL = 'ch_PP-OCRv3_rec_infer.onnx'  # 识别模型（未随项目提供，需放入模型目录）
+    ONNX_REC_KEYS = 'ppocr_keys_v1.txt'  # 识别字典
+    ONNX_DROP_SCORE = 0.5  # 整图识别时丢弃置信度低于该值的文本行
+    ONNX_REC_BATCH_SIZE = 32  # 每次识别推理的最大文本行数（0表示使用性能档位的 rec_batch_num）
+    ONNX_REC_BUCKETS = (128, 192, 256, 320, 384, 480, 640, 800, 960, 1280)  # 文本行补齐宽度的分桶边界（像素，高度48）；同一桶内的文本行合并为一个批量张量
+
+    # 本地引擎图片传输配置（裁剪后的区域通过内存字节流发送给引擎，不再写临时文件）
+    OCR_IMAGE_TRANSPORT = 'auto'  # 传输方式：auto=按图片大小自动选择, bmp=无压缩BMP, png0=PNG不压缩, png1=PNG快速压缩, file=临时PNG文件（旧方式）
+    OCR_BMP_MAX_BYTES = 65536  # auto模式下使用BMP的最大体积（字节，单行字段约为此值以内），超过则使用PNG快速压缩
+
+    # 本地引擎进程池配置（多区域/批量识别时分散到多个引擎进程并发执行）
+    OCR_POOL_MAX_SIZE = 0  # 最大引擎进程数上限，0=由CPU预算自动分配
+    OCR_POOL_MIN_SIZE = 1  # 常驻引擎进程数（启动时创建，空闲也不回收）
+    OCR_POOL_IDLE_TIMEOUT = 60  # 多余进程空闲多少秒后回收（释放内存），0=不回收
+    OCR_PIPELINE_DEPTH = 2  # 每个引擎进程同时在途的请求数（>1时引擎无需等待Python解析上一个结果）
+    OCR_CPU_LIMIT = 0  # CPU预算总核数，0=自动检测（考虑CPU亲和性与cgroup配额）；核数在活跃的引擎之间平均分配
+    OCR_REQUEST_TIMEOUT = 60  # 单个识别请求的截止时间（秒），超时视为引擎卡死并自动重启重试，0=不限
+
+    # OCR守护进程（本地引擎常驻后台并保持预热，多个程序实例与命令行工具共用，省去每次启动引擎的开销）
+    OCR_DAEMON_ENABLED = False  # 是否启用（paddle / rapid 引擎；守护进程未运行时自动在后台启动，不可用时改为在本进程内启动引擎）
+    OCR_DAEMON_PORT = 52110  # 守护进程监听的本机端口（仅 127.0.0.1）
+    OCR_DAEMON_IDLE_TIMEOUT = 600  # 多少秒没有识别请求后守护进程自动退出（释放内存），0=不退出；退出后下次请求时自动重新启动
+    OCR_DAEMON_START_TIMEOUT = 10  # 启动守护进程后等待其就绪的秒数（不含引擎启动时间）
+
+    # 远程PaddleOCR服务器集群（各服务器以套接字模式运行：PaddleOCR-json.exe -port=1224 -addr=any）
+    OCR_REMOTE_ENABLED = False  # 是否启用（OCR_ENGINE = 'remote' 时使用）
+    OCR_REMOTE_ENDPOINTS = []  # 服务器地址列表，如 ['192.168.1.10:1224', '192.168.1.11:1224']；请求派发给在途请求最少的服务器
+    OCR_REMOTE_CONNECT_TIMEOUT = 3  # 建立连接的超时秒数（识别结果的等待时间沿用 OCR_REQUEST_TIMEOUT）
+    OCR_REMOTE_HEALTH_INTERVAL = 10  # 健康检查间隔（秒），0=不检查（摘除的服务器不再恢复）
+    OCR_REMOTE_BACKOFF = 5  # 服务器故障被摘除后，首次重新探测前等待的秒数（连续失败时翻倍）
+    OCR_REMOTE_MAX_BACKOFF = 300  # 重新探测的最长等待秒数
+
+    # 区域拼图识别配置（多个小区域拼到一张画布上，一次引擎调用完成，结果按位置分回各区域）
+    OCR_MOSAIC_ENABLED = True  # 是否启用拼图识别
+    OCR_MOSAIC_MAX_SIDE = 960  # 画布最大边长，应不超过引擎的 limit_side_len（PaddleOCR-json 默认960），否则画布会被缩小
+    OCR_MOSAIC_GAP = 24  # 区域之间的最小留白（像素）；实际留白随每行最高的区域增大到一个文字高度（不超过 OCR_CROP_MAX_TEXT_HEIGHT），防止不同区域的文字被检测为同一行
+    OCR_MOSAIC_WINDOW_MS = 15  # 微批时间窗口（毫秒）：窗口内同时到达的区域请求合并为一次识别
+
+    # 单行区域快速通道（身份证号、日期、金额等单行字段跳过文本检测与方向分类，仅做识别）
+    OCR_REC_ONLY_ENABLED = True  # 是否启用（仅 PaddleOCR-json 支持关闭检测）
+    OCR_SINGLE_LINE_MAX_HEIGHT = 96  # 单行区域的最大高度（像素）
+    OCR_SINGLE_LINE_MIN_ASPECT = 2.0  # 单行区域的最小宽高比；满足尺寸条件后再用水平投影确认只有一行文字
+    OCR_REC_ONLY_MIN_SCORE = 0.5  # 仅识别结果的置信度低于该值时退回完整流程（检测+识别）
+
+    # 空白区域预过滤（逐区域识别前用墨迹比例、灰度标准差、边缘密度判断，明显空白的区域直接返回空文本，不调用引擎）
+    OCR_BLANK_FILTER_ENABLED = True  # 是否启用（跳过数量见 OCREngineManager.get_blank_filter_stats）
+    OCR_BLANK_MAX_INK = 0.003  # 空白区域的墨迹像素占比上限
+    OCR_BLANK_MAX_EDGE = 0.004  # 空白区域的边缘像素占比上限（浅色文字墨迹少但边缘多，靠此项保留）
+    OCR_BLANK_MAX_INK_PIXELS = 30  # 空白区域的墨迹像素数上限（原图分辨率，边缘像素数上限为其两倍）；宽字段中只写一个字符时比例很低，靠此项保留
+    OCR_BLANK_MAX_STD = 3.0  # 没有边缘、灰度标准差不超过该值的区域也视为空白（整块纯色填充）
+    OCR_BLANK_INSET = 0.1  # 统计前每条边向内收缩的距离占区域短边的比例（排除模板框线、表格线）
+    OCR_BLANK_INK_CONTRAST = 60  # 比页面背景深多少灰度级算作墨迹
+    OCR_BLANK_EDGE_CONTRAST = 40  # 相邻像素灰度差超过多少算作边缘
+
+    # 区域截图规范化（识别前按文字高度缩放、无色彩时转灰度，见 ImageUtils.normalize_crop；本地与在线引擎均适用）
+    OCR_CROP_NORMALIZE = True  # 是否启用
+    OCR_CROP_TARGET_TEXT_HEIGHT = 40  # 缩放后的文字高度（像素），略低于识别模型的输入高度48（32时高DPI截图的准确率开始下降）
+    OCR_CROP_MAX_TEXT_HEIGHT = 56  # 文字高于该值时缩小（高DPI扫描件，减少编码、传输与检测的像素）
+    OCR_CROP_MIN_TEXT_HEIGHT = 8  # 文字低于该值时放大（检测模型漏检过小的文字；9~12像素的文字放大后准确率没有提高，只增加像素）
+    OCR_CROP_GRAYSCALE = True  # 色彩对识别没有帮助时转为单通道灰度
+    OCR_CROP_MAX_CHROMA = 40  # 色度（RGB最大值-最小值）不超过该值的像素视为无色
+    OCR_CROP_MAX_COLOR_RATIO = 0.01  # 彩色像素占比不超过该值时转为灰度（红色印章、彩色标注等保留彩色）
+
+    # 区域识别模式
+    OCR_REGION_MODE = 'crop'  # crop=逐区域裁剪识别, page=整页识别一次后按文本行位置分配给各区域（新增/删除区域无需再调用引擎）
+    OCR_PAGE_MIN_OVERLAP = 0.5  # 整页模式下文本行面积落在区域内的最小比例，达到才归属该区域
+
+    # 整页方向预处理（读取图片时把整页旋转 90°/180°/270° 的扫描页转正，再按区域裁剪）
+    OCR_PAGE_ORIENTATION = False  # 是否启用（投影轮廓判断横竖，方向分类模型或墨迹分布判断正倒，每页一次）
+    OCR_PAGE_ORIENTATION_SKIP_CLS = True  # 启用后引擎关闭逐行方向分类（页面已转正，省去每个文本行的分类耗时）
+
+    # 批量识别（OCREngineManager.batch_recognize / iter_batch_recognize）
+    OCR_BATCH_CHUNK_SIZE = 8  # 每次交给引擎的图片数（块内由引擎并发识别，结果按输入顺序逐块返回）
+    OCR_BATCH_PREFETCH = 2  # 后台线程提前读取/解码的块数（与当前块的识别重叠进行）
+
     # 阿里云OCR配置
     ALIYUN_ENABLED = False  # 是否启用阿里云OCR（配置密钥后改为True）
     ALIYUN_ACCESS_KEY_ID = os.getenv('ALIYUN_ACCESS_KEY_ID', '')  # 阿里云AccessKey ID（从环境变量读取，或在此直接填写）
     ALIYUN_ACCESS_KEY_SECRET = os.getenv('ALIYUN_ACCESS_KEY_SECRET', '')  # 阿里云AccessKey Secret（从环境变量读取，或在此直接填写）
     ALIYUN_REGION = 'cn-hangzhou'  # 阿里云区域（根据实际API端点配置）
     ALIYUN_RECOGNITION_TYPE = 'general'  # 识别类型：general=通用, receipt=票据, id_card=身份证等
+    ALIYUN_MAX_CONCURRENCY = 4  # 批量识别时同时在途的API请求数（受账号QPS限制，超限请求会失败）
     
     # DeepSeek OCR配置（硅基流动平台）
     DEEPSEEK_ENABLED = False  # 是否启用DeepSeek OCR（配置密钥后改为True）
@@ -145,15 +244,14 @@ class Config:
     DEEPSEEK_MODEL = 'deepseek-ai/DeepSeek-OCR'  # DeepSeek OCR模型名称
     DEEPSEEK_OCR_PROMPT = '<image>\nFree OCR.'  # OCR识别提示词（Free OCR模式：无布局标记，纯文本输出）
     
-    # PaddleOCR精度优化参数（已内置到优化版引擎中，这里仅作记录）
-    # 注意：优化版PaddleOCR引擎已自动应用以下最优参数
+    # PaddleOCR精度优化参数（accurate 档位使用，作为引擎启动参数传入）
     # 检测模型参数
-    OCR_DET_DB_THRESH = 0.2  # 检测阈值（降低提高召回率）- 已应用
-    OCR_DET_DB_BOX_THRESH = 0.4  # 文本框阈值（降低检测更多文本）- 已应用
-    OCR_DET_DB_UNCLIP_RATIO = 2.0  # 文本框扩大比例（增加提高准确率）- 已应用
+    OCR_DET_DB_THRESH = 0.2  # 检测阈值（降低提高召回率）
+    OCR_DET_DB_BOX_THRESH = 0.4  # 文本框阈值（降低检测更多文本）
+    OCR_DET_DB_UNCLIP_RATIO = 2.0  # 文本框扩大比例（增加提高准确率）
     
     # 识别模型参数
-    OCR_REC_BATCH_NUM = 6  # 识别批次大小 - 已应用
+    OCR_REC_BATCH_NUM = 6  # 识别批次大小
     
     # 高精度模型（优化版引擎已自动使用最优模型）
     OCR_USE_SERVER_MODEL = True  # 使用server模型（精度更高）- 已应用
@@ -238,6 +336,7 @@ class OCRRect:
         self.y2 = max(y1, y2)
         self.name = name
         self.text = ""  # 识别结果文本
+        self.lang = None  # 识别语言（None表示使用默认语言 Config.OCR_LANG）
     
     def get_coords(self):
         """获取坐标元组"""
@@ -265,7 +364,8 @@ class OCRRect:
             'x2': self.x2,
             'y2': self.y2,
             'name': self.name,
-            'text': self.text
+            'text': self.text,
+            'lang': self.lang
         }
     
     @classmethod
@@ -273,4 +373,5 @@ class OCRRect:
         """从字典创建实例"""
         rect = cls(data['x1'], data['y1'], data['x2'], data['y2'], data.get('name', ''))
         rect.text = data.get('text', '')
+        rect.lang = data.get('lang')
         return rect
@@ -67,6 +67,7 @@ static bool init_database_schema(sqlite3* db, std::string& error) {
         "  x2 REAL NOT NULL,"
         "  y2 REAL NOT NULL,"
         "  text TEXT,"
+        "  lang TEXT,"
         "  FOREIGN KEY(file_path) REFERENCES files(file_path) ON DELETE CASCADE"
         ")",
         
@@ -91,6 +92,9 @@ static bool init_database_schema(sqlite3* db, std::string& error) {
         }
     }
     
+    // 旧版本数据库的区域表没有 lang 列：补上（列已存在时报错，忽略即可）
+    sqlite3_exec(db, "ALTER TABLE ocr_rects ADD COLUMN lang TEXT", nullptr, nullptr, nullptr);
+    
     return true;
 }
 
@@ -134,6 +138,17 @@ int ocr_engine_save_result(void* engine_ptr,
                            int rect_count,
                            const double* rect_coords,
                            const char** rect_texts) {
+    return ocr_engine_save_result_ex(engine_ptr, file_path, status, rect_count,
+                                     rect_coords, rect_texts, nullptr);
+}
+
+int ocr_engine_save_result_ex(void* engine_ptr,
+                              const char* file_path,
+                              const char* status,
+                              int rect_count,
+                              const double* rect_coords,
+                              const char** rect_texts,
+                              const char** rect_langs) {
     if (!engine_ptr || !file_path) return -1;
     
     OCRCacheEngine* engine = static_cast<OCRCacheEngine*>(engine_ptr);
@@ -183,8 +198,8 @@ int ocr_engine_save_result(void* engine_ptr,
     
     // 插入新的区域数据
     if (rect_count > 0 && rect_coords && rect_texts) {
-        const char* sql_rect = "INSERT INTO ocr_rects (file_path, rect_index, x1, y1, x2, y2, text) "
-                              "VALUES (?, ?, ?, ?, ?, ?, ?)";
+        const char* sql_rect = "INSERT INTO ocr_rects (file_path, rect_index, x1, y1, x2, y2, text, lang) "
+                              "VALUES (?, ?, ?, ?, ?, ?, ?, ?)";
         
         if (sqlite3_prepare_v2(engine->db, sql_rect, -1, &stmt, nullptr) != SQLITE_OK) {
             engine->last_error = sqlite3_errmsg(engine->db);
@@ -201,6 +216,11 @@ int ocr_engine_save_result(void* engine_ptr,
             sqlite3_bind_double(stmt, 5, rect_coords[i * 4 + 2]);
             sqlite3_bind_double(stmt, 6, rect_coords[i * 4 + 3]);
             sqlite3_bind_text(stmt, 7, rect_texts[i] ? rect_texts[i] : "", -1, SQLITE_TRANSIENT);
+            if (rect_langs && rect_langs[i] && rect_langs[i][0]) {
+                sqlite3_bind_text(stmt, 8, rect_langs[i], -1, SQLITE_TRANSIENT);
+            } else {
+                sqlite3_bind_null(stmt, 8);  // 默认语言
+            }
             
             if (sqlite3_step(stmt) != SQLITE_DONE) {
                 engine->last_error = sqlite3_errmsg(engine->db);
@@ -253,7 +273,7 @@ char* ocr_engine_load_all(void* engine_ptr) {
         json << "\"rects\":[";
         
         // 查询该文件的所有区域
-        const char* sql_rects = "SELECT x1, y1, x2, y2, text FROM ocr_rects "
+        const char* sql_rects = "SELECT x1, y1, x2, y2, text, lang FROM ocr_rects "
                                "WHERE file_path = ? ORDER BY rect_index";
         sqlite3_stmt* stmt_rects;
         
@@ -270,13 +290,15 @@ char* ocr_engine_load_all(void* engine_ptr) {
                 double x2 = sqlite3_column_double(stmt_rects, 2);
                 double y2 = sqlite3_column_double(stmt_rects, 3);
                 const char* text = reinterpret_cast<const char*>(sqlite3_column_text(stmt_rects, 4));
+                const char* lang = reinterpret_cast<const char*>(sqlite3_column_text(stmt_rects, 5));
                 
                 json << "{";
                 json << "\"x1\":" << x1 << ",";
                 json << "\"y1\":" << y1 << ",";
                 json << "\"x2\":" << x2 << ",";
                 json << "\"y2\":" << y2 << ",";
-                json << "\"text\":" << escape_json_string(text);
+                json << "\"text\":" << escape_json_string(text) << ",";
+                json << "\"lang\":" << escape_json_string(lang);
                 json << "}";
             }
             
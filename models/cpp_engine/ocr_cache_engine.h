@@ -35,6 +35,20 @@ int ocr_engine_save_result(void* engine,
                            const double* rect_coords,
                            const char** rect_texts);
 
+/**
+ * 保存单个文件的OCR识别结果（带每个区域的识别语言）
+ * @param rect_langs 区域识别语言数组，NULL或空字符串表示默认语言；整个数组为NULL时等同于 ocr_engine_save_result
+ * 其余参数同 ocr_engine_save_result
+ * @return 0=成功, -1=失败
+ */
+int ocr_engine_save_result_ex(void* engine,
+                              const char* file_path,
+                              const char* status,
+                              int rect_count,
+                              const double* rect_coords,
+                              const char** rect_texts,
+                              const char** rect_langs);
+
 /**
  * 加载所有OCR结果
  * @param engine 引擎句柄
@@ -0,0 +1,215 @@
+"""
+引擎可用性检测
+启动时要判断各引擎能否使用（SDK是否安装、密钥是否配置、可执行文件与模型是否存在），这一步发生在任何引擎可用之前：
+  - SDK 只用 importlib.util.find_spec 判断是否安装，不真正导入（阿里云SDK、OpenAI SDK 的导入耗时与内存都很可观）
+  - 检测结果缓存到磁盘（配置目录下的 engine_availability.json），缓存键为相关配置项与检测时依赖的文件/目录修改时间：
+    配置没变、可执行文件/模型目录/site-packages 没有变化时直接使用缓存，不再检测
+  - 使用缓存时在后台线程重新检测一次，结果有变化时通过回调更新（并写回缓存）
+"""
+
+import os
+import sys
+import json
+import hashlib
+import threading
+import importlib.util
+from config import Config, get_resource_path
+from ocr_model_sets import PADDLE_EXE_RELATIVE_PATH, RAPID_EXE_RELATIVE_PATH, get_models_dir, get_model_paths
+
+# 缓存格式版本（检测逻辑变化时递增，使旧缓存失效）
+CACHE_VERSION = 1
+
+
+def get_cache_path():
+    """可用性缓存文件路径（Config.OCR_AVAILABILITY_CACHE_FILE，为空时放在配置目录下）"""
+    path = getattr(Config, 'OCR_AVAILABILITY_CACHE_FILE', '')
+    if path:
+        return path
+    return os.path.join(Config._get_config_dir(), "engine_availability.json")
+
+
+def _config_fingerprint():
+    """影响检测结果的配置项（密钥只记录是否已配置）"""
+    names = ("ALIYUN_ENABLED", "PADDLE_ENABLED", "RAPID_ENABLED", "ONNX_ENABLED", "ONNX_MODELS_DIR",
+             "ONNX_DET_MODEL", "ONNX_CLS_MODEL", "ONNX_REC_MODEL", "ONNX_REC_KEYS", "OCR_MODEL_SET",
+             "OCR_REMOTE_ENABLED", "OCR_REMOTE_ENDPOINTS", "DEEPSEEK_ENABLED")
+    secrets = ("ALIYUN_ACCESS_KEY_ID", "ALIYUN_ACCESS_KEY_SECRET", "DEEPSEEK_API_KEY")
+    values = {name: getattr(Config, name, None) for name in names}
+    values.update({name: bool(getattr(Config, name, '')) for name in secrets})
+    values["python"] = [sys.executable, sys.version]
+    return hashlib.sha1(json.dumps(values, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _mtime(path):
+    """文件/目录的修改时间（纳秒）；不存在时为 None"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class _Probe:
+    """一次检测：记录检测结果与检测时依赖的文件/目录"""
+
+    def __init__(self, verbose):
+        self.verbose = verbose
+        self.results = {}
+        self.watched = set()
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    def path_exists(self, path):
+        self.watched.add(path)
+        return os.path.exists(path)
+
+    def has_module(self, name):
+        """SDK 是否已安装（只查找，不导入）"""
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, ValueError):
+            spec = None
+        if spec is None:
+            # 未安装：安装后 site-packages 目录的修改时间会变化
+            self.watched.update(p for p in sys.path
+                                if os.path.basename(p) in ('site-packages', 'dist-packages') and os.path.isdir(p))
+            return False
+        locations = list(spec.submodule_search_locations or []) or [spec.origin]
+        self.watched.update(p for p in locations if p and os.path.exists(p))
+        return True
+
+    def set(self, engine, label, available, reason="未满足条件"):
+        self.results[engine] = available
+        self.log(f"[{label}] ✓ 可用" if available else f"[{label}] ✗ 不可用（{reason}）")
+
+
+def probe_engine_availability(verbose=True):
+    """
+    检测各引擎的可用性
+    :param verbose: 是否打印检测过程
+    :return: ({引擎类型: 是否可用}, [检测时依赖的文件/目录])
+    """
+    probe = _Probe(verbose)
+
+    # 阿里云OCR：SDK已安装、ENABLED=True、有密钥
+    if probe.has_module('alibabacloud_ocr_api20210707'):
+        enabled = getattr(Config, 'ALIYUN_ENABLED', False)
+        has_key_id = bool(getattr(Config, 'ALIYUN_ACCESS_KEY_ID', ''))
+        has_key_secret = bool(getattr(Config, 'ALIYUN_ACCESS_KEY_SECRET', ''))
+        probe.log(f"[阿里云OCR] 配置检查: ENABLED={enabled}, 有KEY_ID={has_key_id}, 有KEY_SECRET={has_key_secret}")
+        probe.set('aliyun', "阿里云OCR", enabled and has_key_id and has_key_secret)
+    else:
+        probe.set('aliyun', "阿里云OCR", False, "SDK未安装")
+
+    # PaddleOCR / RapidOCR（C++ 引擎）：ENABLED=True 且可执行文件存在
+    for engine, label, option, relative_path in (("paddle", "PaddleOCR", 'PADDLE_ENABLED', PADDLE_EXE_RELATIVE_PATH),
+                                                 ("rapid", "RapidOCR", 'RAPID_ENABLED', RAPID_EXE_RELATIVE_PATH)):
+        enabled = getattr(Config, option, True)
+        has_exe = probe.path_exists(get_resource_path(os.path.join(*relative_path)))
+        probe.log(f"[{label}] 配置检查: ENABLED={enabled}, 可执行文件存在={has_exe}")
+        probe.set(engine, label, enabled and has_exe)
+
+    # 原生 ONNX 引擎：onnxruntime 已安装且模型文件齐全
+    enabled = getattr(Config, 'ONNX_ENABLED', True)
+    has_runtime = probe.has_module('onnxruntime')
+    has_models = False
+    if enabled and has_runtime:
+        probe.watched.add(get_models_dir())  # 模型文件增删会改变目录的修改时间
+        has_models = all(get_model_paths()[key] for key in ("det", "rec", "keys"))
+    probe.log(f"[ONNX] 配置检查: ENABLED={enabled}, onnxruntime已安装={has_runtime}, 模型文件齐全={has_models}")
+    probe.set('onnx', "ONNX", enabled and has_runtime and has_models)
+
+    # 远程服务器集群（只检查配置；服务器是否在线在初始化时探测）
+    enabled = getattr(Config, 'OCR_REMOTE_ENABLED', False)
+    endpoints = getattr(Config, 'OCR_REMOTE_ENDPOINTS', [])
+    probe.log(f"[远程集群] 配置检查: ENABLED={enabled}, 服务器数={len(endpoints)}")
+    probe.set('remote', "远程集群", bool(enabled and endpoints))
+
+    # DeepSeek OCR：SDK已安装、ENABLED=True、有API Key
+    if probe.has_module('openai'):
+        enabled = getattr(Config, 'DEEPSEEK_ENABLED', False)
+        has_api_key = bool(getattr(Config, 'DEEPSEEK_API_KEY', ''))
+        probe.log(f"[DeepSeek OCR] 配置检查: ENABLED={enabled}, 有API_KEY={has_api_key}")
+        probe.set('deepseek', "DeepSeek OCR", enabled and has_api_key)
+    else:
+        probe.set('deepseek', "DeepSeek OCR", False, "SDK未安装")
+
+    return probe.results, sorted(probe.watched)
+
+
+def load_cached_availability(path=None):
+    """
+    读取缓存的检测结果（配置与依赖文件的修改时间都没有变化时才有效）
+    :param path: 缓存文件路径，None表示使用 get_cache_path()
+    :return: {引擎类型: 是否可用}；缓存不存在或已失效时返回 None
+    """
+    try:
+        with open(path or get_cache_path(), 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cache.get("version") != CACHE_VERSION or cache.get("config") != _config_fingerprint():
+        return None
+    if any(_mtime(p) != mtime for p, mtime in cache.get("watched", {}).items()):
+        return None
+    return cache.get("results")
+
+
+def save_availability(results, watched, path=None):
+    """
+    写入检测结果缓存（写入失败只打印警告）
+    :param results: {引擎类型: 是否可用}
+    :param watched: 检测时依赖的文件/目录
+    :param path: 缓存文件路径，None表示使用 get_cache_path()
+    """
+    path = path or get_cache_path()
+    cache = {
+        "version": CACHE_VERSION,
+        "config": _config_fingerprint(),
+        "watched": {p: _mtime(p) for p in watched},
+        "results": results,
+    }
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"⚠️ 保存引擎可用性缓存失败: {e}")
+
+
+def check_engine_availability(on_refresh=None, path=None):
+    """
+    获取各引擎的可用性（Config.OCR_AVAILABILITY_CACHE 启用时优先使用磁盘缓存）
+    :param on_refresh: 使用缓存时在后台重新检测，结果与缓存不同时调用 f({引擎类型: 是否可用})（在后台线程中）
+    :param path: 缓存文件路径，None表示使用 get_cache_path()
+    :return: {引擎类型: 是否可用}
+    """
+    if not getattr(Config, 'OCR_AVAILABILITY_CACHE', True):
+        return probe_engine_availability()[0]
+
+    cached = load_cached_availability(path)
+    if cached is None:
+        results, watched = probe_engine_availability()
+        save_availability(results, watched, path)
+        return results
+
+    available = [engine for engine, ok in cached.items() if ok]
+    print(f"[引擎检测] 使用缓存结果，可用引擎: {', '.join(available) or '无'}")
+
+    def refresh():
+        try:
+            results, watched = probe_engine_availability(verbose=False)
+        except Exception as e:
+            print(f"⚠️ 后台引擎检测失败: {e}")
+            return
+        save_availability(results, watched, path)
+        if results != cached:
+            print(f"[引擎检测] 可用性已变化，可用引擎: {', '.join(e for e, ok in results.items() if ok) or '无'}")
+            if on_refresh is not None:
+                on_refresh(results)
+
+    threading.Thread(target=refresh, name="OCRAvailabilityRefresh", daemon=True).start()
+    return cached
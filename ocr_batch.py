@@ -0,0 +1,120 @@
+"""
+批量识别流水线
+脚本化批处理的入口（OCREngineManager.iter_batch_recognize / batch_recognize）：
+  - 输入可以是图片、文件路径或 (图片或路径, [区域]) 元组，也可以是生成器（逐个读取，不必一次列出全部文件）
+  - 后台线程提前读取/解码后续图片，与当前块的识别重叠进行
+  - 每块交给引擎的 batch_recognize，由引擎选择最高效的并发方式（进程池、拼图、批量推理、并发API请求）
+  - 结果按输入顺序逐个产出，调用方可以边识别边写出结果
+"""
+
+import queue
+import threading
+from PIL import Image
+from config import Config
+from utils import FileUtils, ImageUtils
+
+_END = object()  # 输入结束标记
+
+
+def normalize_batch_item(item):
+    """
+    统一批量识别的输入项
+    :param item: PIL Image、文件路径，或 (图片或路径, [区域]) 元组
+    :return: (图片或路径, 区域列表)，区域列表为空表示识别整图
+    """
+    if isinstance(item, tuple):
+        source, rects = item
+        return source, list(rects or [])
+    return item, []
+
+
+def prepare_batch_item(source, rects):
+    """
+    准备一个输入项（在后台线程中执行）
+    - 需要裁剪区域的文件、PDF、需要判断页面方向（Config.OCR_PAGE_ORIENTATION）的文件：读取并解码为图片（由 load_image 转正）
+    - 其余整图识别的图片文件：保持路径，由引擎直接读取
+    - 延迟加载的 PIL Image：在此完成解码
+    :return: (图片或路径, 区域列表)
+    """
+    if isinstance(source, str):
+        if rects or FileUtils.is_pdf_file(source) or getattr(Config, 'OCR_PAGE_ORIENTATION', False):
+            source = ImageUtils.load_image(source)
+    if isinstance(source, Image.Image):
+        source.load()
+    return source, rects
+
+
+def empty_batch_result(rects):
+    """识别失败的输入项的结果：有区域时为 {}，整图识别为 None"""
+    return {} if rects else None
+
+
+def iter_batch_results(recognize_chunk, items, chunk_size=8, prefetch=2):
+    """
+    流水线批量识别
+    :param recognize_chunk: 识别一块输入的函数 f([(图片或路径, [区域]), ...]) -> 与输入顺序一致的结果列表
+    :param items: 输入项（见 normalize_batch_item），可以是生成器
+    :param chunk_size: 每块的输入项数
+    :param prefetch: 后台线程最多提前准备的块数
+    :return: 生成器，按输入顺序产出每项的结果（读取或识别失败的项见 empty_batch_result）
+    """
+    chunk_size = max(1, chunk_size)
+    chunks = queue.Queue(maxsize=max(1, prefetch))
+    stopped = threading.Event()
+
+    def put(chunk):
+        # 调用方提前停止迭代时不再阻塞
+        while not stopped.is_set():
+            try:
+                chunks.put(chunk, timeout=0.5)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def load():
+        chunk = []
+        try:
+            for item in items:
+                source, rects = normalize_batch_item(item)
+                try:
+                    chunk.append((prepare_batch_item(source, rects), None))
+                except Exception as e:
+                    chunk.append(((source, rects), e))
+                if len(chunk) >= chunk_size:
+                    if not put(chunk):
+                        return
+                    chunk = []
+            if chunk and not put(chunk):
+                return
+            put(_END)
+        except Exception as e:  # 输入迭代本身出错
+            put(e)
+
+    loader = threading.Thread(target=load, name="OCRBatchLoader", daemon=True)
+    loader.start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is _END:
+                return
+            if isinstance(chunk, Exception):
+                raise chunk
+
+            results = [empty_batch_result(rects) for (_, rects), _ in chunk]
+            ready = []
+            for i, ((source, rects), error) in enumerate(chunk):
+                if error is None:
+                    ready.append(i)
+                else:
+                    print(f"❌ 读取图片失败: {source}: {error}")
+            if ready:
+                try:
+                    outputs = recognize_chunk([chunk[i][0] for i in ready])
+                    for i, output in zip(ready, outputs):
+                        results[i] = output
+                except Exception as e:
+                    print(f"❌ 批量识别失败: {e}")
+            yield from results
+    finally:
+        stopped.set()
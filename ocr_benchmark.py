@@ -0,0 +1,1012 @@
+#!/usr/bin/env python3
+"""
+OCR 性能基准测试工具
+
+用法：
+    python ocr_benchmark.py transport                  # 仅比较编码/传输准备开销
+    python ocr_benchmark.py transport --engine paddle  # 同时测量本地引擎端到端耗时
+    python ocr_benchmark.py stress-pipe                # 流水线管道客户端并发压力测试（模拟引擎）
+    python ocr_benchmark.py supervisor                 # 引擎卡死/崩溃后的自动重启与重试（模拟引擎）
+    python ocr_benchmark.py mosaic --engine paddle     # 逐区域识别 vs 拼图识别
+    python ocr_benchmark.py profiles --engine paddle   # 各性能档位的吞吐量与延迟
+    python ocr_benchmark.py cpu --engines 2            # 查看CPU预算在多个引擎之间的分配
+    python ocr_benchmark.py fast-path --engine paddle  # 单行字段：完整流程 vs 仅识别通道的每字段延迟
+    python ocr_benchmark.py engines onnx paddle        # 引擎之间的启动耗时、延迟与识别结果一致性
+    python ocr_benchmark.py batch --engine onnx        # 批量识别：逐页读取+识别 vs 流水线（后台解码与识别重叠）
+    python ocr_benchmark.py orientation --engine onnx  # 混合方向扫描页：逐行方向分类 vs 整页方向预处理的每页耗时
+    python ocr_benchmark.py blank --forms 1000         # 空白区域预过滤：跳过的引擎调用比例、误跳过数、过滤耗时
+    python ocr_benchmark.py normalize --engine onnx    # 区域截图规范化：编码体积/耗时、引擎延迟与各文字高度的识别准确率
+    python ocr_benchmark.py startup                    # 启动耗时与内存：引擎可用性检测方式；其余引擎串行 / 并行 / 按需（lazy）启动
+    python ocr_benchmark.py router --pages 150         # 自适应路由：批量识别中引擎相继报错/卡住，固定引擎 vs 各路由策略（模拟引擎）
+    python ocr_benchmark.py rec-batch                  # ONNX 批量识别：批大小 1~64 的吞吐量
+    python ocr_benchmark.py remote --servers 3         # 远程服务器集群：负载均衡吞吐量、故障摘除与恢复（模拟服务器）
+
+默认使用合成的 A4 扫描页（300DPI，含 5~20 个文本区域），
+也可通过 --image 指定真实图片（区域在图片上均匀分布）。
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+from statistics import fmean, median
+from PIL import Image, ImageDraw
+
+# 确保导入路径正确
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import OCRRect
+from utils import ImageUtils
+
+
+def make_sample_page(region_count=10, width=2480, height=3508, seed=0):
+    """
+    生成模拟的扫描页及其识别区域
+    :param region_count: 区域数量
+    :param width: 页面宽度（默认A4@300DPI）
+    :param height: 页面高度
+    :param seed: 随机种子（保证多次运行结果可比）
+    :return: (PIL Image, [OCRRect])
+    """
+    rng = random.Random(seed)
+    page = Image.new('RGB', (width, height), 'white')
+    draw = ImageDraw.Draw(page)
+
+    rects = []
+    row_height = height // (region_count + 1)
+    for i in range(region_count):
+        x1 = rng.randint(50, width // 3)
+        y1 = row_height * i + 40
+        x2 = min(width - 50, x1 + rng.randint(300, 1400))
+        y2 = y1 + rng.randint(60, min(400, row_height - 20))
+        # 模拟文字：若干行深色短笔画
+        for line_y in range(y1 + 15, y2 - 20, 45):
+            x = x1 + 10
+            while x < x2 - 40:
+                w = rng.randint(10, 30)
+                draw.rectangle((x, line_y, x + w, line_y + 28), fill=(rng.randint(0, 60),) * 3)
+                x += w + rng.randint(4, 12)
+        rects.append(OCRRect(x1, y1, x2, y2, name=f"区域{i + 1}"))
+    return page, rects
+
+
+def grid_rects(image, region_count):
+    """在真实图片上均匀生成识别区域"""
+    rects = []
+    step = image.height // region_count
+    for i in range(region_count):
+        rects.append(OCRRect(0, i * step, image.width, (i + 1) * step))
+    return rects
+
+
+def timed(func, rounds):
+    """多次运行取中位数耗时（毫秒）"""
+    costs = []
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func()
+        costs.append((time.perf_counter() - start) * 1000)
+    return median(costs), result
+
+
+def _encode_via_temp_file(crop):
+    """旧方式：保存临时PNG（默认压缩级别）后删除"""
+    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_file:
+        temp_path = tmp_file.name
+        crop.save(temp_path)
+    size = os.path.getsize(temp_path)
+    os.remove(temp_path)
+    return size
+
+
+def bench_remote(args):
+    """多台模拟服务器：单台 vs 负载均衡的吞吐量，以及宕机摘除与恢复"""
+    from collections import Counter
+    from ocr_remote_pool import RemoteEndpointPool
+    from tests.fakes import FakeSocketServer
+
+    servers = [FakeSocketServer(delay=args.delay) for _ in range(args.servers)]
+    addresses = [server.address for server in servers]
+    print(f"模拟服务器: {', '.join(addresses)}（每个请求 {args.delay * 1000:.0f}ms，串行处理）")
+
+    def run_all(pool, count):
+        results = pool.map(lambda i: pool.runBase64("dGVzdA=="), range(count))
+        return Counter(r["data"][0]["text"] if r["code"] == 100 else f"code={r['code']}" for r in results)
+
+    print(f"\n{'服务器数':<10}{'耗时(s)':>10}{'吞吐(请求/秒)':>16}  请求分布")
+    for count in sorted({1, args.servers}):
+        pool = RemoteEndpointPool(addresses[:count], health_interval=0)
+        start = time.perf_counter()
+        distribution = run_all(pool, args.requests)
+        cost = time.perf_counter() - start
+        pool.exit()
+        print(f"{count:<10}{cost:>10.2f}{args.requests / cost:>16.0f}  {dict(distribution)}")
+
+    if args.servers < 2:
+        return
+    print("\n故障摘除与恢复:")
+    pool = RemoteEndpointPool(addresses, health_interval=1, backoff=1, max_backoff=4)
+    victim = servers[0]
+    victim.stop()
+    distribution = run_all(pool, args.requests)
+    failed = sum(n for text, n in distribution.items() if text.startswith("code="))
+    print(f"  {victim.address} 宕机后: 失败请求 {failed} 个，分布 {dict(distribution)}")
+
+    servers[0] = FakeSocketServer(port=victim.port, delay=args.delay)
+    deadline = time.monotonic() + 10
+    while pool.size < args.servers and time.monotonic() < deadline:
+        time.sleep(0.2)
+    distribution = run_all(pool, args.requests)
+    print(f"  {victim.address} 恢复后: 分布 {dict(distribution)}")
+    endpoints = pool.stats()["endpoints"]
+    pool.exit()
+    for server in servers:
+        server.stop()
+
+    if failed or len(distribution) != args.servers:
+        print("✗ 服务器宕机期间有请求失败，或恢复后未重新加入")
+        sys.exit(1)
+    print(f"✓ 宕机服务器被摘除（摘除次数 {endpoints[0]['ejections']}），恢复后重新加入")
+
+
+def bench_stress_pipe(args):
+    """多线程并发调用同一个流水线管道客户端，校验每个响应都与其请求对应"""
+    from ocr_pipe_client import PipelinedOCRClient
+    from tests.fakes import write_fake_engine
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        client = PipelinedOCRClient(write_fake_engine(tmp_dir), argument={"delay": args.delay})
+        mismatches = []
+        lock = threading.Lock()
+
+        def hammer(thread_index):
+            for i in range(args.requests):
+                token = f"t{thread_index}-r{i}"
+                res = client.runDict({"image_base64": token})
+                text = res["data"][0]["text"] if res.get("code") == 100 else None
+                if text != token:
+                    with lock:
+                        mismatches.append((token, res))
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=hammer, args=(t,)) for t in range(args.threads)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        cost = time.perf_counter() - start
+        client.exit()
+
+    total = args.threads * args.requests
+    print(f"\n线程数: {args.threads}  请求总数: {total}  耗时: {cost:.2f}s  吞吐: {total / cost:.0f} 请求/秒")
+    if mismatches:
+        print(f"✗ 发现 {len(mismatches)} 个错配/失败响应，例如: {mismatches[0]}")
+        sys.exit(1)
+    print("✓ 所有响应均与请求一一对应")
+
+
+def bench_supervisor(args):
+    """在模拟引擎上制造卡死与崩溃，校验监管器重启引擎后后续请求恢复正常"""
+    from ocr_pipe_client import CreateOcrApi
+    from ocr_engine_supervisor import SupervisedOCRApi
+    from tests.fakes import write_fake_engine
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        exe_path = write_fake_engine(tmp_dir)
+        api = SupervisedOCRApi(lambda: CreateOcrApi(exe_path), request_timeout=args.timeout)
+        failures = []
+
+        def check(token, expect_ok):
+            start = time.perf_counter()
+            res = api.runDict({"image_base64": token})
+            cost = time.perf_counter() - start
+            ok = res.get("code") == 100 and res["data"][0]["text"] == token
+            print(f"  {token:<10} code={res.get('code')}  耗时 {cost:.2f}s")
+            if ok != expect_ok:
+                failures.append((token, res))
+
+        check("normal-1", True)
+        check("__hang__", False)   # 超时 -> 重启 -> 重试仍超时 -> 返回错误
+        check("normal-2", True)
+        check("__crash__", False)  # 崩溃 -> 重启 -> 重试仍崩溃 -> 返回错误
+        check("normal-3", True)
+        restarts = api.restart_count
+        api.exit()
+
+    print(f"\n重启次数: {restarts}")
+    if failures:
+        print(f"✗ 监管器未按预期恢复，例如: {failures[0]}")
+        sys.exit(1)
+    print("✓ 卡死与崩溃后引擎均自动恢复")
+
+
+def bench_mosaic(args):
+    """逐区域识别与拼图识别对比（不指定引擎时只统计拼图排布）"""
+    from ocr_region_packer import MosaicPacker
+
+    engine = _create_local_engine(args.engine) if args.engine else None
+    packer = MosaicPacker(max_side=args.max_side)
+
+    for region_count in args.regions:
+        page, rects = make_sample_page(region_count, width=args.page_width,
+                                       height=int(args.page_width * 1.414))
+        crops = [page.crop(r.get_coords()) for r in rects]
+        packable = [c for c in crops if packer.fits(c)]
+        cost, sheets = timed(lambda: packer.pack(packable), args.rounds)
+        print(f"\n[{region_count} 个区域] 页面 {page.width}x{page.height}  "
+              f"可拼图 {len(packable)} 个 -> {len(sheets)} 张画布，排布耗时 {cost:.1f}ms")
+
+        if engine is None:
+            continue
+        mosaic, engine.mosaic = engine.mosaic, None
+        single_cost, single = timed(lambda: engine.recognize_regions(page, rects), args.rounds)
+        engine.mosaic = mosaic
+        mosaic_cost, packed = timed(lambda: engine.recognize_regions(page, rects), args.rounds)
+        same = sum(single[r] == packed[r] for r in rects)
+        print(f"  逐区域: {single_cost:.1f}ms/页  拼图: {mosaic_cost:.1f}ms/页  文本一致 {same}/{len(rects)}")
+
+
+def bench_profiles(args):
+    """各性能档位的启动参数、单页延迟与并发吞吐量"""
+    from concurrent.futures import ThreadPoolExecutor
+    from ocr_profiles import PROFILE_NAMES, build_engine_arguments
+
+    pages = []
+    if not args.dry_run:
+        pages = [make_sample_page(args.regions, seed=i)[0] for i in range(args.pages)]
+        print(f"测试数据: {args.pages} 页合成扫描页（每页 {args.regions} 个文本区域）")
+
+    for profile in args.profile or PROFILE_NAMES:
+        print(f"\n[{profile}] 启动参数: {build_engine_arguments(args.engine, profile)}")
+        if args.dry_run:
+            continue
+        engine = _create_local_engine(args.engine, profile)
+        try:
+            engine.recognize_image(pages[0])  # 预热
+            latencies = []
+            for page in pages:
+                start = time.perf_counter()
+                engine.recognize_image(page)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+                results = list(executor.map(engine.recognize_image, pages))
+            cost = time.perf_counter() - start
+            lines = sum(len(r) for r in results)
+            latencies.sort()
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            print(f"  延迟: 中位数 {median(latencies):.0f}ms  P95 {p95:.0f}ms")
+            print(f"  吞吐: {len(pages) / cost:.2f} 页/秒（并发 {args.concurrency}）  识别文本行 {lines} 行")
+        finally:
+            engine.ocr.exit()
+
+
+def bench_cpu(args):
+    """模拟注册多个引擎，打印CPU预算分配（不启动引擎）"""
+    from ocr_cpu_budget import CPUBudget
+    from ocr_profiles import get_profile
+
+    budget = CPUBudget(total=args.total)
+    threads = get_profile(args.profile)["threads"]
+    for i in range(args.engines):
+        budget.register_engine(f"引擎{i + 1}[{args.profile}]", desired_threads=threads)
+    for i in range(args.standby):
+        budget.register_engine(f"备用引擎{i + 1}[{args.profile}]", desired_threads=threads, active=False)
+    budget.print_allocation()
+    info = budget.allocation()
+    used = sum(s["processes"] * s["threads"] for s in info["engines"].values() if s["active"])
+    print(f"活跃引擎线程合计 {used} / 可用 {info['engine_cores']} 核")
+
+
+def bench_fast_path(args):
+    """单行区域判定统计，以及单行字段走完整流程与仅识别通道的每字段延迟对比"""
+    page, rects = make_sample_page(args.regions)
+    crops = [page.crop(r.get_coords()) for r in rects]
+    cost, flags = timed(lambda: [ImageUtils.is_single_line(c) for c in crops], args.rounds)
+    lines = [c for c, single in zip(crops, flags) if single]
+    print(f"[{len(crops)} 个区域] 单行 {len(lines)} 个，多行 {len(crops) - len(lines)} 个，"
+          f"判定耗时 {cost / max(1, len(crops)):.2f}ms/区域")
+
+    if args.engine is None or not lines:
+        return
+    engine = _create_local_engine(args.engine)
+    if not engine.rec_only_enabled:
+        print(f"✗ {engine.ENGINE_NAME} 不支持仅识别通道")
+        return
+    try:
+        engine._recognize_lines(lines[:1])  # 启动并预热仅识别通道
+        full_cost, full = timed(lambda: [engine._result_to_text(engine._run_image(c)) for c in lines], args.rounds)
+        fast_cost, fast = timed(lambda: engine._recognize_lines(lines), args.rounds)
+        same = sum(a == b for a, b in zip(full, fast))
+        fallback = sum(text is None for text in fast)
+        per_full, per_fast = full_cost / len(lines), fast_cost / len(lines)
+        print(f"  完整流程: {per_full:.1f}ms/字段  仅识别: {per_fast:.1f}ms/字段  "
+              f"节省 {per_full - per_fast:.1f}ms/字段（{(1 - per_fast / per_full) * 100:.0f}%）")
+        print(f"  文本一致 {same}/{len(lines)}，置信度不足退回完整流程 {fallback} 个")
+    finally:
+        engine.close()
+
+
+def bench_engines(args):
+    """多个本地引擎的启动耗时、整图/区域识别延迟，以及与第一个引擎（基准）的文本相似度"""
+    from difflib import SequenceMatcher
+
+    if args.image:
+        samples = [(img, grid_rects(img, args.regions)) for img in map(ImageUtils.load_image, args.image)]
+    else:
+        samples = [make_sample_page(args.regions, seed=i) for i in range(args.pages)]
+
+    reference = None
+    for engine_type in args.engines:
+        start = time.perf_counter()
+        engine = _create_local_engine(engine_type)
+        startup = (time.perf_counter() - start) * 1000
+        try:
+            engine.recognize_image(samples[0][0])  # 预热
+            page_cost, pages = timed(lambda: [engine.recognize_image(img).text for img, _ in samples], args.rounds)
+            region_cost, regions = timed(
+                lambda: [engine.recognize_regions(img, rects) for img, rects in samples], args.rounds)
+            texts = pages + [d[r] for (_, rects), d in zip(samples, regions) for r in rects]
+        finally:
+            engine.close()
+
+        similarity = ""
+        if reference is None:
+            reference = texts
+        else:
+            ratio = median(SequenceMatcher(None, a, b).ratio() for a, b in zip(reference, texts))
+            similarity = f"  与 {args.engines[0]} 的文本相似度(中位数) {ratio:.3f}"
+        print(f"[{engine_type}] 启动 {startup:.0f}ms  整图 {page_cost / len(samples):.0f}ms/页  "
+              f"区域 {region_cost / len(samples):.0f}ms/页{similarity}")
+
+
+def bench_batch(args):
+    """批量识别：逐页读取再识别 vs 流水线（后台读取解码 + 引擎按块批量识别）"""
+    from ocr_batch import iter_batch_results
+
+    engine = _create_local_engine(args.engine)
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            items = []
+            for i in range(args.pages):
+                page, rects = make_sample_page(args.regions, seed=i)
+                path = os.path.join(tmp_dir, f"page{i}.png")
+                page.save(path)
+                items.append((path, [] if args.whole_page else rects))
+            engine.recognize_image(page)  # 预热
+
+            def sequential():
+                results = []
+                for path, rects in items:
+                    if rects:
+                        results.append(engine.recognize_regions(ImageUtils.load_image(path), rects))
+                    else:
+                        results.append(engine.recognize_image(path))
+                return results
+
+            def pipelined():
+                return list(iter_batch_results(engine.batch_recognize, items, chunk_size=args.chunk_size))
+
+            sequential_cost, expected = timed(sequential, args.rounds)
+            pipelined_cost, results = timed(pipelined, args.rounds)
+    finally:
+        engine.close()
+
+    def texts(result):
+        return result.text if hasattr(result, 'text') else result
+
+    kind = "整图" if args.whole_page else f"每页 {args.regions} 个区域"
+    print(f"\n[{args.engine}] {args.pages} 页（{kind}），块大小 {args.chunk_size}")
+    print(f"逐页读取+识别  {sequential_cost:8.0f}ms  {sequential_cost / args.pages:6.0f}ms/页")
+    print(f"流水线批量识别 {pipelined_cost:8.0f}ms  {pipelined_cost / args.pages:6.0f}ms/页"
+          f"  加速比 {sequential_cost / pipelined_cost:.2f}×")
+    same = sum(texts(a) == texts(b) for a, b in zip(expected, results))
+    print(f"结果一致: {same}/{len(results)} 页")
+
+
+def make_text_lines(count, seed=0):
+    """生成单行字段截图（随机长度的编号/日期/金额）"""
+    from PIL import ImageFont
+    rng = random.Random(seed)
+    font = ImageFont.load_default(size=32) if hasattr(ImageFont, 'FreeTypeFont') else ImageFont.load_default()
+    lines = []
+    for _ in range(count):
+        text = "".join(rng.choice("0123456789-./:ABCDEFXYZ") for _ in range(rng.randint(4, 28)))
+        width = int(font.getlength(text)) + 24
+        line = Image.new('RGB', (width, 48), 'white')
+        ImageDraw.Draw(line).text((12, 6), text, fill='black', font=font)
+        lines.append(line)
+    return lines
+
+
+SAMPLE_WORDS = ("invoice total amount date number payment bank account reference shipping address customer "
+                "order quantity price tax balance due period contract signature 2024 1250.00 No.58 A-103").split()
+
+
+def make_text_page(seed=0, width=1240, height=1754):
+    """
+    生成整页文本（A4@150DPI，英文单词与数字），返回 (PIL Image, 各行文本)
+    """
+    from PIL import ImageFont
+    rng = random.Random(seed)
+    font = ImageFont.load_default(size=26) if hasattr(ImageFont, 'FreeTypeFont') else ImageFont.load_default()
+    page = Image.new('RGB', (width, height), 'white')
+    draw = ImageDraw.Draw(page)
+    lines = []
+    y = 80
+    while y < height - 100:
+        text = " ".join(rng.choice(SAMPLE_WORDS) for _ in range(rng.randint(3, 9)))
+        draw.text((80, y), text, fill='black', font=font)
+        lines.append(text)
+        y += rng.choice([40, 46, 64])
+    return page, lines
+
+
+def bench_orientation(args):
+    """混合方向的扫描页：引擎逐行方向分类 vs 整页方向预处理 + 关闭逐行分类"""
+    from difflib import SequenceMatcher
+    from config import Config
+    from ocr_orientation import detect_page_rotation, correct_page_orientation
+
+    rotations = [0, 90, 180, 270]
+    samples = []
+    for i in range(args.pages):
+        page, lines = make_text_page(seed=i)
+        rotation = rotations[i % len(rotations)]
+        samples.append((page.rotate(rotation, expand=True), rotation, "".join("".join(lines).split())))
+
+    def accuracy(texts):
+        return median(SequenceMatcher(None, "".join(text.split()), truth).ratio()
+                      for text, (_, _, truth) in zip(texts, samples))
+
+    detect_cost, detected = timed(lambda: [detect_page_rotation(image) for image, _, _ in samples], args.rounds)
+    correct = sum((rotation + page_rotation) % 360 == 0
+                  for rotation, (_, page_rotation, _) in zip(detected, samples))
+
+    # (名称, 是否整页预处理, 引擎是否关闭逐行方向分类)
+    modes = [("无预处理，逐行方向分类", False, False),
+             ("整页预处理，逐行方向分类", True, False),
+             ("整页预处理，关闭逐行分类", True, True)]
+    saved = getattr(Config, 'OCR_PAGE_ORIENTATION', False)
+    rows = []
+    try:
+        for name, prepass, skip_cls in modes:
+            Config.OCR_PAGE_ORIENTATION = skip_cls  # 决定引擎启动时是否关闭逐行方向分类
+            engine = _create_local_engine(args.engine)
+            try:
+                engine.recognize_image(samples[0][0])  # 预热
+
+                def run():
+                    texts = []
+                    for image, _, _ in samples:
+                        if prepass:
+                            image = correct_page_orientation(image.copy())
+                        texts.append(engine.recognize_image(image).text)
+                    return texts
+
+                cost, texts = timed(run, args.rounds)
+            finally:
+                engine.close()
+            rows.append((name, cost, accuracy(texts)))
+    finally:
+        Config.OCR_PAGE_ORIENTATION = saved
+
+    print(f"\n[{args.engine}] {args.pages} 页，方向 0°/90°/180°/270° 轮流")
+    print(f"方向判断: {correct}/{len(samples)} 页正确，{detect_cost / len(samples):.1f}ms/页")
+    print(f"{'方式':<20}{'耗时/页(ms)':>14}{'文本相似度(中位数)':>20}")
+    for name, cost, ratio in rows:
+        print(f"{name:<20}{cost / len(samples):>14.0f}{ratio:>20.3f}")
+    # 未转正的页面文本大多识别不出来（耗时不可比），节省的时间以转正后的页面为准
+    print(f"关闭逐行分类每页节省 {(rows[1][1] - rows[2][1]) / len(samples):.0f}ms"
+          f"（{rows[1][1] / rows[2][1]:.2f}×，含方向判断 {detect_cost / len(samples):.0f}ms/页）")
+
+def make_form_page(seed=0, fields=12, fill=0.4, width=1240, height=1754):
+    """
+    生成模拟表单：每个字段带印刷框线，按 fill 的概率填写（含浅色与极短的内容）
+    :return: (PIL Image, [OCRRect], [是否已填写])
+    """
+    from PIL import ImageFont
+    rng = random.Random(seed)
+    font = ImageFont.load_default(size=24) if hasattr(ImageFont, 'FreeTypeFont') else ImageFont.load_default()
+    page = Image.new('RGB', (width, height), (250, 250, 247))
+    draw = ImageDraw.Draw(page)
+    rects, filled = [], []
+    row_height = (height - 100) // fields
+    for i in range(fields):
+        x1 = rng.randint(60, 300)
+        y1 = 60 + row_height * i
+        x2 = min(width - 60, x1 + rng.randint(240, 800))
+        y2 = y1 + rng.randint(50, min(110, row_height - 10))
+        draw.text((x1, y1 - 2), f"Field {i + 1}", fill=(90, 90, 90), font=font)
+        draw.rectangle((x1, y1 + 24, x2, y2 + 24), outline=(0, 0, 0), width=2)
+        rect = OCRRect(x1, y1 + 24, x2, y2 + 24, name=f"字段{i + 1}")
+        has_text = rng.random() < fill
+        if has_text:
+            style = rng.random()
+            text = "X" if style < 0.1 else " ".join(rng.choice(SAMPLE_WORDS) for _ in range(rng.randint(1, 4)))
+            color = (185, 185, 185) if style > 0.85 else (20, 20, 60)  # 少量浅色（铅笔、褪色）内容
+            draw.text((x1 + 14, (rect.y1 + rect.y2) // 2 - 12), text, fill=color, font=font)
+        rects.append(rect)
+        filled.append(has_text)
+    return page, rects, filled
+
+
+def bench_blank(args):
+    """空白区域预过滤：跳过比例、误跳过数、过滤耗时（可选：引擎端到端耗时）"""
+    from ocr_blank_filter import BlankCropFilter
+
+    blank_filter = BlankCropFilter.from_config()
+    forms = [make_form_page(seed=i, fields=args.fields, fill=args.fill) for i in range(args.forms)]
+
+    start = time.perf_counter()
+    masks = [blank_filter.find_blank(page, rects) for page, rects, _ in forms]
+    cost = (time.perf_counter() - start) * 1000
+
+    total = sum(len(rects) for _, rects, _ in forms)
+    empty = sum(not f for _, _, filled in forms for f in filled)
+    skipped = sum(int(mask.sum()) for mask in masks)
+    wrong = sum(bool(b and f) for mask, (_, _, filled) in zip(masks, forms) for b, f in zip(mask, filled))
+
+    print(f"\n{args.forms} 份表单，每份 {args.fields} 个字段（填写概率 {args.fill:.0%}）")
+    print(f"区域总数 {total}，其中空白 {empty}")
+    print(f"跳过 {skipped}（占全部引擎调用的 {skipped / total:.1%}，空白区域的 {skipped / max(1, empty):.1%}）")
+    print(f"误跳过（有内容却被跳过）: {wrong}")
+    print(f"过滤耗时 {cost / args.forms:.2f}ms/份（{cost / total * 1000:.0f}µs/区域）")
+
+    if args.engine:
+        engine = _create_local_engine(args.engine)
+        try:
+            engine.recognize_regions(forms[0][0], forms[0][1])  # 预热
+            all_cost, _ = timed(lambda: [engine.recognize_regions(page, rects) for page, rects, _ in forms], 1)
+            kept = [(page, [r for r, b in zip(rects, mask) if not b]) for (page, rects, _), mask in zip(forms, masks)]
+            kept_cost, _ = timed(lambda: [engine.recognize_regions(page, rects) for page, rects in kept if rects], 1)
+        finally:
+            engine.close()
+        kept_cost += cost
+        print(f"[{args.engine}] 全部识别 {all_cost / args.forms:.0f}ms/份，预过滤后 {kept_cost / args.forms:.0f}ms/份"
+              f"（{all_cost / kept_cost:.2f}×）")
+
+
+def make_field_crops(count, seed=0):
+    """
+    生成不同文字高度的区域截图（单行与多行，黑白、浅灰底与彩色印章），模拟不同DPI的扫描件
+    :return: [(PIL Image, 文本, 文字缩放倍数)]
+    """
+    from PIL import ImageFont
+    rng = random.Random(seed)
+    font = ImageFont.load_default(size=26) if hasattr(ImageFont, 'FreeTypeFont') else ImageFont.load_default()
+    scales = [3.0, 1.5, 1.0, 0.5]  # 约 600DPI、300DPI、150DPI 与过小的文字
+    crops = []
+    for i in range(count):
+        lines = [" ".join(rng.choice(SAMPLE_WORDS) for _ in range(rng.randint(2, 5)))
+                 for _ in range(1 if i % 3 else 3)]
+        width = int(max(font.getlength(line) for line in lines)) + 40
+        paper = (255, 255, 255) if i % 4 else (238, 236, 228)
+        crop = Image.new('RGB', (width, 16 + 40 * len(lines)), paper)
+        draw = ImageDraw.Draw(crop)
+        for j, line in enumerate(lines):
+            draw.text((20, 10 + 40 * j), line, fill=(25, 25, 30), font=font)
+        if i % 7 == 0:  # 彩色印章：保留彩色
+            draw.ellipse((width - 70, 4, width - 10, 56), outline=(200, 30, 30), width=4)
+        scale = scales[i % len(scales)]
+        crop = crop.resize((int(crop.width * scale), int(crop.height * scale)), Image.BICUBIC)
+        crops.append((crop, " ".join(lines), scale))
+    return crops
+
+
+def bench_normalize(args):
+    """区域截图规范化（文字高度缩放 + 灰度）：编码体积/耗时、引擎延迟与识别准确率"""
+    from difflib import SequenceMatcher
+    from config import Config
+    from utils import ImageUtils
+
+    samples = make_field_crops(args.crops)
+    saved = getattr(Config, 'OCR_CROP_NORMALIZE', True)
+
+    def encode_stats(images):
+        cost, payloads = timed(lambda: [ImageUtils.encode_for_engine(image)[0] for image in images], args.rounds)
+        return cost, sum(len(payload) for payload in payloads)
+
+    normalize_cost, normalized = timed(lambda: [ImageUtils.normalize_crop(crop) for crop, _, _ in samples],
+                                       args.rounds)
+    raw_cost, raw_bytes = encode_stats([crop for crop, _, _ in samples])
+    norm_cost, norm_bytes = encode_stats(normalized)
+    gray = sum(image.mode == 'L' for image in normalized)
+    print(f"\n{len(samples)} 个区域截图（文字缩放 3×/1.5×/1×/0.5×，三分之一为多行）")
+    print(f"规范化耗时 {normalize_cost / len(samples):.2f}ms/个（不计入编码耗时），转为灰度 {gray}/{len(samples)}")
+    print(f"{'方式':<12}{'编码耗时(ms)':>14}{'编码体积(KB)':>14}{'像素(万)':>12}")
+    for name, cost, size, images in (("原始截图", raw_cost, raw_bytes, [c for c, _, _ in samples]),
+                                      ("规范化后", norm_cost, norm_bytes, normalized)):
+        pixels = sum(image.width * image.height for image in images) / 10000
+        print(f"{name:<12}{cost:>14.1f}{size / 1024:>14.0f}{pixels:>12.0f}")
+
+    if not args.engine:
+        return
+    pairs = [(crop, [(0, 0, crop.width, crop.height)]) for crop, _, _ in samples]
+
+    def accuracy(results, scale=None):
+        ratios = [SequenceMatcher(None, "".join(next(iter(result.values()), "").split()), "".join(text.split())).ratio()
+                  for result, (_, text, s) in zip(results, samples) if scale is None or s == scale]
+        return fmean(ratios)
+
+    rows = []
+    try:
+        engine = _create_local_engine(args.engine)
+        try:
+            for name, enabled in (("原始截图", False), ("规范化后", True)):
+                Config.OCR_CROP_NORMALIZE = enabled
+                engine.batch_recognize(pairs[:4])  # 预热
+                cost, results = timed(lambda: [engine.batch_recognize([pair])[0] for pair in pairs], args.rounds)
+                rows.append((name, cost, results))
+        finally:
+            engine.close()
+    finally:
+        Config.OCR_CROP_NORMALIZE = saved
+
+    scales = sorted({s for _, _, s in samples}, reverse=True)
+    print(f"\n[{args.engine}] 逐区域识别")
+    print(f"{'方式':<12}{'耗时/区域(ms)':>14}{'相似度(平均)':>16}" + "".join(f"{f'{s:g}×':>8}" for s in scales))
+    for name, cost, results in rows:
+        print(f"{name:<12}{cost / len(pairs):>14.1f}{accuracy(results):>16.3f}"
+              + "".join(f"{accuracy(results, s):>8.3f}" for s in scales))
+    print(f"加速比 {rows[0][1] / rows[1][1]:.2f}×")
+
+
+def bench_rec_batch(args):
+    """ONNX 引擎按宽度分桶的批量识别：不同批大小下的吞吐量"""
+    engine = _create_local_engine("onnx")
+    try:
+        lines = [line.convert('RGB') for line in make_text_lines(args.lines)]
+        engine._recognize_lines(lines[:8])  # 预热
+        baseline = None
+        print(f"{'批大小':<8}{'耗时(ms)':>12}{'吞吐(行/秒)':>14}{'加速比':>10}")
+        for batch_size in args.batch_sizes:
+            engine.rec_batch_size = batch_size
+            cost, _ = timed(lambda: engine._recognize_lines(lines), args.rounds)
+            throughput = len(lines) / cost * 1000
+            baseline = baseline or throughput
+            print(f"{batch_size:<8}{cost:>12.0f}{throughput:>14.1f}{throughput / baseline:>10.2f}")
+    finally:
+        engine.close()
+
+
+class _SimulatedEngine:
+    """模拟引擎：固定延迟；degrade() 之后按 mode 报错或卡住"""
+
+    def __init__(self, name, latency):
+        self.name = name
+        self.latency = latency
+        self.mode = None  # None=正常, 'error'=抛出异常, 'hang'=远超路由超时才返回
+
+    def is_ready(self):
+        return True
+
+    def batch_recognize(self, pairs, **kwargs):
+        if self.mode == 'error':
+            time.sleep(self.latency / 4)
+            raise RuntimeError("模拟引擎进程崩溃")
+        time.sleep(self.latency * len(pairs) * (20 if self.mode == 'hang' else 1))
+        return [{rect: self.name for rect in rects} for _, rects in pairs]
+
+
+def bench_router(args):
+    """自适应路由：批量识别过程中引擎相继故障（报错、卡住），比较固定引擎与各路由策略（模拟引擎）"""
+    from config import Config
+    from ocr_engine_manager import OCREngineManager
+
+    specs = {"onnx": 0.02, "paddle": 0.03, "remote": 0.015}  # 每页耗时（秒）
+    page = Image.new('L', (64, 64), 'white')
+    items = [(page, [(0, 0, 32, 32), (32, 32, 64, 64)]) for _ in range(args.pages)]
+
+    saved = {name: getattr(Config, name, None) for name in (
+        'OCR_ENGINE', 'OCR_ENGINE_INIT_MODE', 'OCR_BLANK_FILTER_ENABLED', 'OCR_ROUTING_ENABLED',
+        'OCR_ROUTING_POLICY', 'OCR_ROUTING_TIMEOUT', 'OCR_BATCH_CHUNK_SIZE')}
+    saved_check, saved_create = OCREngineManager.__dict__['_check_engine_availability'], \
+        OCREngineManager.__dict__['_create_engine']
+    engines = {}
+
+    def create(engine_type, profile=None):
+        engines[engine_type.value] = _SimulatedEngine(engine_type.value, specs[engine_type.value])
+        return engines[engine_type.value]
+
+    modes = [("固定引擎 onnx", False, None)] + [(f"路由 {policy}", True, policy)
+                                               for policy in ("local-first", "fastest", "cheapest")]
+    # 后台线程提前读取页面，引擎故障的时间点比页码略早
+    print(f"{args.pages} 页（每页 2 个区域），约第 {args.pages // 3} 页起 onnx 报错，"
+          f"约第 {args.pages * 2 // 3} 页起 paddle 卡住（超时 {args.timeout:g} 秒）")
+    print(f"{'方式':<20}{'耗时(s)':>10}{'成功页数':>10}{'故障切换':>10}   首选引擎分布")
+    try:
+        OCREngineManager._check_engine_availability = staticmethod(
+            lambda: OCREngineManager._apply_availability({name: True for name in specs}))
+        OCREngineManager._create_engine = staticmethod(create)
+        Config.OCR_ENGINE, Config.OCR_ENGINE_INIT_MODE = 'onnx', 'parallel'
+        Config.OCR_BLANK_FILTER_ENABLED = False
+        Config.OCR_ROUTING_TIMEOUT = args.timeout
+        Config.OCR_BATCH_CHUNK_SIZE = 1
+        for name, routing, policy in modes:
+            Config.OCR_ROUTING_ENABLED, Config.OCR_ROUTING_POLICY = routing, policy or 'local-first'
+            manager = OCREngineManager()
+            manager.init_background_engines()
+
+            def pages():
+                for i, item in enumerate(items):
+                    if i == args.pages // 3:
+                        engines["onnx"].mode = 'error'
+                    if i == args.pages * 2 // 3:
+                        engines["paddle"].mode = 'hang'
+                    yield item
+
+            start = time.perf_counter()
+            results = manager.batch_recognize(pages())
+            cost = time.perf_counter() - start
+            ok = sum(bool(result) for result in results)
+            metrics = manager.get_routing_metrics()
+            decisions = ", ".join(f"{k}={v}" for k, v in sorted(metrics.get("decisions", {}).items()))
+            print(f"{name:<20}{cost:>10.2f}{ok:>10}{metrics.get('failovers', 0):>10}   {decisions or '-'}")
+    finally:
+        OCREngineManager._check_engine_availability = saved_check
+        OCREngineManager._create_engine = saved_create
+        for key, value in saved.items():
+            setattr(Config, key, value)
+
+
+def _peak_rss_mb():
+    """本进程的内存峰值（MB）；不支持时返回 None"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / (1024 if sys.platform == 'darwin' else 1)
+
+
+def _startup_child(mode, cache_file):
+    """startup 子进程：按指定方式创建管理器并启动其余引擎，输出各阶段耗时（JSON）"""
+    from config import Config
+    Config.OCR_AVAILABILITY_CACHE_FILE = cache_file
+    start = time.perf_counter()
+    if mode == "serial":
+        Config.OCR_ENGINE_INIT_WORKERS = 1
+    else:
+        Config.OCR_ENGINE_INIT_MODE = mode
+    from ocr_engine_manager import OCREngineManager
+    manager = OCREngineManager()
+    primary = time.perf_counter() - start
+    ready = {}
+    manager.init_background_engines(
+        on_ready=lambda engine, ok: ready.setdefault(engine, time.perf_counter() - start if ok else None))
+    total = time.perf_counter() - start
+    print(json.dumps({"primary": primary, "total": total, "ready": ready,
+                      "engine": manager.current_engine_type.value if manager.current_engine_type else None,
+                      "rss": _peak_rss_mb()}))
+
+
+def _availability_child(mode, cache_file):
+    """startup 子进程：只执行引擎可用性检测，输出耗时与内存（JSON）"""
+    import importlib
+    from config import Config
+    Config.OCR_AVAILABILITY_CACHE_FILE = cache_file
+    import ocr_engine_manager  # noqa: F401  管理器本身的导入不计入
+    import ocr_availability
+    base_rss = _peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "probe-import":
+        # 原来的做法：真正导入各 SDK 与 ONNX 引擎模块来判断是否可用
+        for module in ("alibabacloud_ocr_api20210707.client", "openai", "onnxruntime", "ocr_engine_onnx"):
+            try:
+                importlib.import_module(module)
+            except ImportError:
+                pass
+        results, _ = ocr_availability.probe_engine_availability(verbose=False)
+    elif mode == "probe-cold":
+        results, _ = ocr_availability.probe_engine_availability(verbose=False)
+    else:
+        results = ocr_availability.load_cached_availability()
+    cost = time.perf_counter() - start
+    rss = _peak_rss_mb()
+    print(json.dumps({"cost": cost, "results": results,
+                      "rss": rss - base_rss if rss is not None else None}))
+
+
+def bench_startup(args):
+    """启动耗时与内存：引擎可用性检测（导入SDK / find_spec / 磁盘缓存），其余引擎串行 / 并行 / 按需启动（各自在独立的子进程中测量）"""
+    import subprocess
+    if args.child in ("probe-import", "probe-cold", "probe-cached"):
+        _availability_child(args.child, args.cache_file)
+        return
+    if args.child:
+        _startup_child(args.child, args.cache_file)
+        return
+
+    def run_child(mode, *extra):
+        # 通过 sys.argv[0] 重新启动，保留包装脚本对 Config 的修改
+        output = subprocess.run([sys.executable, sys.argv[0], "startup", "--child", mode, *extra],
+                                capture_output=True, text=True).stdout
+        return json.loads(output.strip().splitlines()[-1])
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache_file = os.path.join(directory, "engine_availability.json")
+        from ocr_availability import probe_engine_availability, save_availability
+        save_availability(*probe_engine_availability(verbose=False), path=cache_file)
+        print(f"{'可用性检测':<18}{'耗时(ms)':>12}{'新增内存(MB)':>14}")
+        for mode, name in (("probe-import", "导入SDK（原方式）"), ("probe-cold", "find_spec，无缓存"),
+                           ("probe-cached", "磁盘缓存命中")):
+            costs, report = [], None
+            for _ in range(args.rounds):
+                report = run_child(mode, "--cache-file", cache_file)
+                costs.append(report["cost"])
+            rss = f"{report['rss']:.1f}" if report["rss"] is not None else "-"
+            print(f"{name:<18}{median(costs) * 1000:>12.1f}{rss:>14}")
+        print()
+
+        print(f"{'方式':<10}{'首选引擎(ms)':>14}{'全部就绪(ms)':>14}{'已启动引擎':>12}{'内存峰值(MB)':>14}")
+        for mode, name in (("serial", "串行启动"), ("parallel", "并行启动"), ("lazy", "按需启动")):
+            report = run_child(mode, "--cache-file", cache_file)
+            started = bool(report["engine"]) + sum(t is not None for t in report["ready"].values())
+            rss = f"{report['rss']:.0f}" if report["rss"] else "-"
+            print(f"{name:<10}{report['primary'] * 1000:>14.0f}{report['total'] * 1000:>14.0f}"
+                  f"{started:>12}{rss:>14}")
+            for engine, cost in sorted(report["ready"].items(), key=lambda item: item[1] or 0):
+                print(f"    {engine:<10}{'失败' if cost is None else f'{cost * 1000:.0f}ms 就绪'}")
+
+
+def _create_local_engine(engine_type, profile=None):
+    from ocr_engine_manager import OCREngineManager, EngineType
+    return OCREngineManager._create_engine(EngineType(engine_type), profile)
+
+
+def bench_transport(args):
+    """临时PNG文件 与 内存传输（BMP / PNG0 / PNG1 / auto）对比"""
+    engine = _create_local_engine(args.engine) if args.engine else None
+    modes = ['file', 'bmp', 'png0', 'png1', 'auto']
+
+    for region_count in args.regions:
+        if args.image:
+            page = ImageUtils.load_image(args.image)
+            rects = grid_rects(page, region_count)
+        else:
+            page, rects = make_sample_page(region_count)
+        crops = [page.crop(r.get_coords()) for r in rects]
+
+        print(f"\n[{region_count} 个区域] 页面 {page.width}x{page.height}")
+        print(f"{'方式':<8}{'准备耗时/页(ms)':>18}{'载荷(KB)':>12}{'端到端/页(ms)':>18}")
+
+        for mode in modes:
+            if mode == 'file':
+                cost, sizes = timed(lambda: [_encode_via_temp_file(c) for c in crops], args.rounds)
+            else:
+                cost, encoded = timed(
+                    lambda: [ImageUtils.encode_for_engine(c, mode=mode)[0] for c in crops], args.rounds)
+                sizes = [len(data) for data in encoded]
+
+            total = ""
+            if engine is not None:
+                total_cost, _ = timed(lambda: [engine._run_image(c, transport=mode) for c in crops], args.rounds)
+                total = f"{total_cost:.1f}"
+
+            print(f"{mode:<8}{cost:>18.1f}{sum(sizes) / 1024:>12.0f}{total:>18}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR 性能基准测试")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("transport", help="图片传输方式对比（临时文件 vs 内存）")
+    p.add_argument("--engine", choices=["paddle", "rapid"], help="同时测量本地引擎端到端耗时")
+    p.add_argument("--image", help="使用真实图片代替合成页面")
+    p.add_argument("--regions", type=int, nargs="+", default=[5, 10, 20], help="每页区域数")
+    p.add_argument("--rounds", type=int, default=3, help="重复次数（取中位数）")
+    p.set_defaults(func=bench_transport)
+
+    p = sub.add_parser("stress-pipe", help="流水线管道客户端并发压力测试（模拟引擎）")
+    p.add_argument("--threads", type=int, default=16, help="并发线程数")
+    p.add_argument("--requests", type=int, default=200, help="每个线程的请求数")
+    p.add_argument("--delay", type=float, default=0.0, help="模拟引擎每个请求的处理耗时（秒）")
+    p.set_defaults(func=bench_stress_pipe)
+
+    p = sub.add_parser("supervisor", help="引擎卡死/崩溃后的自动重启与重试（模拟引擎）")
+    p.add_argument("--timeout", type=float, default=1.0, help="单个请求的截止时间（秒）")
+    p.set_defaults(func=bench_supervisor)
+
+    p = sub.add_parser("mosaic", help="逐区域识别 vs 拼图识别")
+    p.add_argument("--engine", choices=["paddle", "rapid"], help="同时测量本地引擎端到端耗时")
+    p.add_argument("--regions", type=int, nargs="+", default=[8, 15], help="每页区域数")
+    p.add_argument("--page-width", type=int, default=1240, help="合成页面宽度（默认A4@150DPI）")
+    p.add_argument("--max-side", type=int, default=960, help="画布最大边长")
+    p.add_argument("--rounds", type=int, default=3, help="重复次数（取中位数）")
+    p.set_defaults(func=bench_mosaic)
+
+    p = sub.add_parser("profiles", help="各性能档位的吞吐量与延迟")
+    p.add_argument("--engine", choices=["paddle", "rapid"], default="paddle", help="本地引擎")
+    p.add_argument("--profile", nargs="+", choices=["fast", "balanced", "accurate"], help="只测试指定档位")
+    p.add_argument("--pages", type=int, default=10, help="测试页数")
+    p.add_argument("--regions", type=int, default=10, help="每页文本区域数")
+    p.add_argument("--concurrency", type=int, default=4, help="吞吐测试的并发请求数")
+    p.add_argument("--dry-run", action="store_true", help="只打印各档位的启动参数")
+    p.set_defaults(func=bench_profiles)
+
+    p = sub.add_parser("cpu", help="查看CPU预算分配")
+    p.add_argument("--engines", type=int, default=1, help="同时运行的引擎（进程池）数")
+    p.add_argument("--standby", type=int, default=0, help="已启动但尚未收到请求的备用引擎数（不参与划分）")
+    p.add_argument("--total", type=int, default=0, help="模拟的总核数，0表示自动检测")
+    p.add_argument("--profile", choices=["fast", "balanced", "accurate"], default="balanced", help="性能档位")
+    p.set_defaults(func=bench_cpu)
+
+    p = sub.add_parser("fast-path", help="单行字段：完整流程 vs 仅识别通道")
+    p.add_argument("--engine", choices=["paddle"], help="同时测量本地引擎每字段延迟")
+    p.add_argument("--regions", type=int, default=20, help="区域数")
+    p.add_argument("--rounds", type=int, default=3, help="重复次数（取中位数）")
+    p.set_defaults(func=bench_fast_path)
+
+    p = sub.add_parser("engines", help="本地引擎之间的速度与识别结果对比")
+    p.add_argument("engines", nargs="+", choices=["onnx", "paddle", "rapid"], help="参与对比的引擎（第一个为基准）")
+    p.add_argument("--image", nargs="+", help="使用真实图片代替合成页面")
+    p.add_argument("--pages", type=int, default=3, help="合成页数")
+    p.add_argument("--regions", type=int, default=10, help="每页区域数")
+    p.add_argument("--rounds", type=int, default=3, help="重复次数（取中位数）")
+    p.set_defaults(func=bench_engines)
+
+    p = sub.add_parser("batch", help="批量识别：逐页读取+识别 vs 流水线批量识别")
+    p.add_argument("--engine", choices=["onnx", "paddle", "rapid"], default="onnx", help="本地引擎")
+    p.add_argument("--pages", type=int, default=16, help="页数（保存为PNG文件后按路径识别）")
+    p.add_argument("--regions", type=int, default=10, help="每页区域数")
+    p.add_argument("--whole-page", action="store_true", help="识别整页而不是区域")
+    p.add_argument("--chunk-size", type=int, default=8, help="每次交给引擎的页数")
+    p.add_argument("--rounds", type=int, default=1, help="重复次数（取中位数）")
+    p.set_defaults(func=bench_batch)
+
+    p = sub.add_parser("orientation", help="混合方向扫描页：逐行方向分类 vs 整页方向预处理")
+    p.add_argument("--engine", choices=["onnx", "paddle", "rapid"], default="onnx", help="本地引擎")
+    p.add_argument("--pages", type=int, default=8, help="页数（0°/90°/180°/270° 轮流）")
+    p.add_argument("--rounds", type=int, default=1, help="重复次数（取中位数）")
+    p.set_defaults(func=bench_orientation)
+
+    p = sub.add_parser("blank", help="空白区域预过滤：跳过比例与误跳过（模拟表单）")
+    p.add_argument("--forms", type=int, default=200, help="表单份数")
+    p.add_argument("--fields", type=int, default=12, help="每份表单的字段数")
+    p.add_argument("--fill", type=float, default=0.4, help="字段被填写的概率")
+    p.add_argument("--engine", choices=["onnx", "paddle", "rapid"], help="同时测量引擎端到端耗时")
+    p.set_defaults(func=bench_blank)
+
+    p = sub.add_parser("normalize", help="区域截图规范化：编码体积、引擎延迟与识别准确率")
+    p.add_argument("--crops", type=int, default=48, help="区域截图数量")
+    p.add_argument("--engine", choices=["onnx", "paddle", "rapid"], help="同时测量引擎延迟与识别准确率")
+    p.add_argument("--rounds", type=int, default=1, help="重复次数（取中位数）")
+    p.set_defaults(func=bench_normalize)
+
+    p = sub.add_parser("startup", help="启动耗时与内存：可用性检测方式，其余引擎串行 / 并行 / 按需启动")
+    p.add_argument("--rounds", type=int, default=3, help="可用性检测的重复次数（取中位数）")
+    p.add_argument("--child", choices=["serial", "parallel", "lazy", "probe-import", "probe-cold", "probe-cached"],
+                   help=argparse.SUPPRESS)
+    p.add_argument("--cache-file", help=argparse.SUPPRESS)
+    p.set_defaults(func=bench_startup)
+
+    p = sub.add_parser("router", help="自适应路由：引擎相继故障时的批量识别（模拟引擎）")
+    p.add_argument("--pages", type=int, default=150, help="页数")
+    p.add_argument("--timeout", type=float, default=0.3, help="路由超时（秒）")
+    p.set_defaults(func=bench_router)
+
+    p = sub.add_parser("rec-batch", help="ONNX 批量识别的吞吐量（批大小 1~64）")
+    p.add_argument("--lines", type=int, default=256, help="单行字段截图数量")
+    p.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64], help="批大小")
+    p.add_argument("--rounds", type=int, default=3, help="重复次数（取中位数）")
+    p.set_defaults(func=bench_rec_batch)
+
+    p = sub.add_parser("remote", help="远程服务器集群：负载均衡与故障摘除/恢复（模拟服务器）")
+    p.add_argument("--servers", type=int, default=3, help="模拟服务器数")
+    p.add_argument("--requests", type=int, default=150, help="请求数")
+    p.add_argument("--delay", type=float, default=0.02, help="模拟服务器每个请求的处理耗时（秒）")
+    p.set_defaults(func=bench_remote)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
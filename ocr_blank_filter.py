@@ -0,0 +1,187 @@
+"""
+空白区域预过滤
+模板中的很多区域在具体单据上是空的（选填字段、未签字的签名框），每个都要调用一次引擎。
+识别前先为一页上的所有区域计算廉价的统计量，明显空白的区域直接返回 ""，不再派发给引擎：
+  - 墨迹比例：比页面背景深 Config.OCR_BLANK_INK_CONTRAST 以上的像素占比
+  - 标准差：区域灰度的起伏（整块纯色填充的区域标准差接近0）
+  - 边缘密度：水平/垂直相邻像素灰度差超过 Config.OCR_BLANK_EDGE_CONTRAST 的像素占比（浅色文字墨迹少但边缘多）
+墨迹与边缘的比例和像素数（换算到原图分辨率）都不超过上限才算空白：宽字段里只写了一个字符时比例很低，
+但像素数远多于扫描噪点；无边缘且灰度几乎不变的区域（整块纯色填充）也算空白。
+
+实现：在所有区域外接矩形范围内（过大时先缩小）为墨迹、边缘、灰度和、灰度平方和各建一张积分图，
+每个区域的统计量只需 4 次查表，一页上的全部区域用 NumPy 一次算完。
+统计时每条边向内收缩 Config.OCR_BLANK_INSET（区域短边的比例），避免模板框线被当作内容。
+"""
+
+import threading
+import numpy as np
+from PIL import Image
+from config import Config
+
+
+def _coords(rect):
+    return rect.get_coords() if hasattr(rect, 'get_coords') else rect
+
+
+def _integral(values, dtype):
+    """积分图（首行首列补零，区域和 = S[y2,x2] - S[y1,x2] - S[y2,x1] + S[y1,x1]）"""
+    table = np.zeros((values.shape[0] + 1, values.shape[1] + 1), dtype=dtype)
+    np.cumsum(values, axis=0, dtype=dtype, out=table[1:, 1:])
+    np.cumsum(table[1:, 1:], axis=1, dtype=dtype, out=table[1:, 1:])
+    return table
+
+
+def _box_sums(table, y1, x1, y2, x2):
+    return table[y2, x2] - table[y1, x2] - table[y2, x1] + table[y1, x1]
+
+
+class BlankCropFilter:
+    """按墨迹比例、标准差与边缘密度判断空白区域，并统计跳过的区域数"""
+
+    def __init__(self, max_ink=0.003, max_edge=0.004, max_ink_pixels=30, max_std=3.0, inset=0.1,
+                 ink_contrast=60, edge_contrast=40, max_pixels=1_000_000):
+        """
+        :param max_ink: 空白区域的墨迹比例上限
+        :param max_edge: 空白区域的边缘密度上限
+        :param max_ink_pixels: 空白区域的墨迹像素数上限（原图分辨率，边缘像素数上限为其两倍）
+        :param max_std: 没有边缘且灰度标准差不超过该值的区域视为空白（纯色填充）
+        :param inset: 统计前每条边向内收缩的距离占区域短边的比例（排除框线）
+        :param ink_contrast: 比页面背景深多少灰度级算作墨迹
+        :param edge_contrast: 相邻像素灰度差超过多少算作边缘
+        :param max_pixels: 统计范围超过该像素数时先缩小（控制积分图内存与耗时）
+        """
+        self.max_ink = max_ink
+        self.max_edge = max_edge
+        self.max_ink_pixels = max_ink_pixels
+        self.max_std = max_std
+        self.inset = inset
+        self.ink_contrast = ink_contrast
+        self.edge_contrast = edge_contrast
+        self.max_pixels = max_pixels
+        self._lock = threading.Lock()
+        self._checked = 0
+        self._skipped = 0
+
+    @classmethod
+    def from_config(cls):
+        """按 Config.OCR_BLANK_* 创建"""
+        return cls(
+            max_ink=getattr(Config, 'OCR_BLANK_MAX_INK', 0.003),
+            max_edge=getattr(Config, 'OCR_BLANK_MAX_EDGE', 0.004),
+            max_ink_pixels=getattr(Config, 'OCR_BLANK_MAX_INK_PIXELS', 30),
+            max_std=getattr(Config, 'OCR_BLANK_MAX_STD', 3.0),
+            inset=getattr(Config, 'OCR_BLANK_INSET', 0.1),
+            ink_contrast=getattr(Config, 'OCR_BLANK_INK_CONTRAST', 60),
+            edge_contrast=getattr(Config, 'OCR_BLANK_EDGE_CONTRAST', 40),
+        )
+
+    def crop_statistics(self, image, rects):
+        """
+        计算各区域（收缩后）的统计量
+        :param image: PIL Image
+        :param rects: OCRRect对象或坐标元组 (x1, y1, x2, y2) 列表
+        :return: {"ink", "edge": 比例, "ink_pixels", "edge_pixels": 像素数（原图分辨率）, "std": 灰度标准差}，
+                 每项为 (N,) 数组；面积为0的区域各项均为0
+        """
+        boxes = np.array([_coords(r) for r in rects], dtype=np.float64).reshape(-1, 4)
+        boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, image.width)
+        boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, image.height)
+        # 按短边计算收缩量（宽字段若按宽度比例收缩，会把靠左书写的短内容排除在外）
+        d = np.minimum(boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1]).clip(0) * self.inset
+        boxes += np.stack([d, d, -d, -d], axis=1)
+        empty = np.zeros(len(boxes))
+        valid = (boxes[:, 2] - boxes[:, 0] >= 1) & (boxes[:, 3] - boxes[:, 1] >= 1)
+        if not valid.any():
+            return {key: empty.copy() for key in ("ink", "edge", "ink_pixels", "edge_pixels", "std")}
+
+        # 只处理所有区域的外接矩形，过大时按整数倍缩小
+        left, top = boxes[valid, :2].min(axis=0).astype(int)
+        right, bottom = np.ceil(boxes[valid, 2:].max(axis=0)).astype(int)
+        area = image.crop((left, top, right, bottom)).convert('L')
+        factor = max(1, int(np.ceil(np.sqrt(area.width * area.height / self.max_pixels))))
+        if factor > 1:
+            area = area.reduce(factor)
+        gray = np.asarray(area, dtype=np.int16)
+
+        background = int(np.median(gray[::4, ::4]))
+        ink = (gray < background - self.ink_contrast).astype(np.uint8)
+        edges = np.zeros_like(ink)
+        edges[:, 1:] |= np.abs(np.diff(gray, axis=1)) > self.edge_contrast
+        edges[1:, :] |= np.abs(np.diff(gray, axis=0)) > self.edge_contrast
+
+        # 统计范围不超过 max_pixels，灰度和在 int32 范围内，只有平方和需要 int64
+        ink_sum = _integral(ink, np.int32)
+        edge_sum = _integral(edges, np.int32)
+        gray_sum = _integral(gray, np.int32)
+        square_sum = _integral(gray.astype(np.int64) ** 2, np.int64)
+
+        # 区域坐标换算到缩小后的统计范围
+        h, w = gray.shape
+        scaled = (boxes - [left, top, left, top]) / factor
+        x1 = np.clip(np.floor(scaled[:, 0]), 0, w).astype(int)
+        y1 = np.clip(np.floor(scaled[:, 1]), 0, h).astype(int)
+        x2 = np.clip(np.ceil(scaled[:, 2]), 0, w).astype(int)
+        y2 = np.clip(np.ceil(scaled[:, 3]), 0, h).astype(int)
+        pixels = np.maximum(1, (x2 - x1) * (y2 - y1)).astype(np.float64)
+        valid &= (x2 > x1) & (y2 > y1)
+
+        ink_pixels = _box_sums(ink_sum, y1, x1, y2, x2).astype(np.float64)
+        edge_pixels = _box_sums(edge_sum, y1, x1, y2, x2).astype(np.float64)
+        mean = _box_sums(gray_sum, y1, x1, y2, x2) / pixels
+        variance = _box_sums(square_sum, y1, x1, y2, x2) / pixels - mean ** 2
+        stats = {
+            "ink": ink_pixels / pixels,
+            "edge": edge_pixels / pixels,
+            "ink_pixels": ink_pixels * factor ** 2,
+            "edge_pixels": edge_pixels * factor ** 2,
+            "std": np.sqrt(np.maximum(variance, 0)),
+        }
+        return {key: np.where(valid, value, 0) for key, value in stats.items()}
+
+    def find_blank(self, image, rects):
+        """
+        判断各区域是否空白（并计入统计）
+        :param image: PIL Image
+        :param rects: OCRRect对象或坐标元组列表
+        :return: (N,) bool 数组，True 表示空白、无需识别
+        """
+        if not rects:
+            return np.zeros(0, dtype=bool)
+        try:
+            stats = self.crop_statistics(image, rects)
+        except Exception as e:
+            print(f"⚠️ 空白区域判断失败，全部交给引擎识别: {e}")
+            return np.zeros(len(rects), dtype=bool)
+        no_edges = (stats["edge"] <= self.max_edge) & (stats["edge_pixels"] <= 2 * self.max_ink_pixels)
+        no_ink = (stats["ink"] <= self.max_ink) & (stats["ink_pixels"] <= self.max_ink_pixels)
+        blank = no_edges & (no_ink | (stats["std"] <= self.max_std))
+        with self._lock:
+            self._checked += len(rects)
+            self._skipped += int(blank.sum())
+        return blank
+
+    def split(self, image, rects):
+        """
+        把区域分为需要识别的与空白的
+        :return: (需要识别的区域列表, 空白区域列表)
+        """
+        if not isinstance(image, Image.Image):
+            return list(rects), []
+        blank = self.find_blank(image, rects)
+        return ([r for r, b in zip(rects, blank) if not b],
+                [r for r, b in zip(rects, blank) if b])
+
+    def stats(self):
+        """
+        :return: {"checked": 判断过的区域数, "skipped": 跳过的空白区域数, "skip_ratio": 跳过比例}
+        """
+        with self._lock:
+            return {
+                "checked": self._checked,
+                "skipped": self._skipped,
+                "skip_ratio": self._skipped / self._checked if self._checked else 0.0,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._checked = self._skipped = 0
@@ -77,6 +77,17 @@ class OCRCacheManager:
         ]
         self._lib.ocr_engine_save_result.restype = ctypes.c_int
         
+        # int ocr_engine_save_result_ex(..., const char** rect_langs)
+        # 旧版本编译的库没有该函数：区域的识别语言不写入缓存（重新编译库后生效）
+        self._save_langs = hasattr(self._lib, 'ocr_engine_save_result_ex')
+        if self._save_langs:
+            self._lib.ocr_engine_save_result_ex.argtypes = self._lib.ocr_engine_save_result.argtypes + [
+                ctypes.POINTER(ctypes.c_char_p)
+            ]
+            self._lib.ocr_engine_save_result_ex.restype = ctypes.c_int
+        else:
+            print("⚠️ 缓存引擎库版本较旧，区域识别语言不会保存到缓存（请重新编译 models/cpp_engine）")
+        
         # char* ocr_engine_load_all(void* engine)
         self._lib.ocr_engine_load_all.argtypes = [ctypes.c_void_p]
         self._lib.ocr_engine_load_all.restype = ctypes.POINTER(ctypes.c_char)
@@ -126,6 +137,7 @@ class OCRCacheManager:
             # 没有区域，只保存文件状态
             coords = (ctypes.c_double * 0)()
             texts = (ctypes.c_char_p * 0)()
+            langs = (ctypes.c_char_p * 0)()
         else:
             # 准备坐标数组
             coords = (ctypes.c_double * (rect_count * 4))()
@@ -140,16 +152,19 @@ class OCRCacheManager:
             for i, rect in enumerate(rects):
                 text = rect.text if rect.text else ""
                 texts[i] = text.encode('utf-8')
+            
+            # 准备识别语言数组（None表示默认语言）
+            langs = (ctypes.c_char_p * rect_count)()
+            for i, rect in enumerate(rects):
+                lang = getattr(rect, 'lang', None)
+                langs[i] = lang.encode('utf-8') if lang else None
         
         # 调用C++引擎
-        result = self._lib.ocr_engine_save_result(
-            self.engine,
-            file_path.encode('utf-8'),
-            status.encode('utf-8'),
-            rect_count,
-            coords,
-            texts
-        )
+        args = [self.engine, file_path.encode('utf-8'), status.encode('utf-8'), rect_count, coords, texts]
+        if self._save_langs:
+            result = self._lib.ocr_engine_save_result_ex(*args, langs)
+        else:
+            result = self._lib.ocr_engine_save_result(*args)
         
         return result == 0
     
@@ -185,6 +200,7 @@ class OCRCacheManager:
                         rect_data["y2"]
                     )
                     rect.text = rect_data.get("text", "")
+                    rect.lang = rect_data.get("lang") or None
                     rects.append(rect)
                 
                 results[file_path] = {
@@ -0,0 +1,190 @@
+"""
+CPU 线程预算
+每个引擎子进程都按自己的线程数运行，多个引擎（或多个语言/档位的进程池）同时工作时，
+很容易超额占用 CPU，吞吐反而下降。
+本模块统一划分可用核数：
+  - 可用核数同时考虑 CPU 亲和性（sched_getaffinity）与 cgroup 配额（容器 / systemd 限制）
+  - 可用核数在活跃的引擎之间平均分配；引擎启动后先处于待命状态，首次收到请求时才转为活跃，
+    已启动但从未使用的备用引擎不会缩小正在工作的引擎的份额
+  - 每个引擎的份额换算为"每进程线程数 × 进程数"，线程数作为启动参数传给引擎
+  - 引擎注册/转为活跃/注销时重新分配，并通过回调通知各引擎调整（新进程使用新参数）
+"""
+
+import os
+import math
+import weakref
+import threading
+from config import Config
+
+
+def _read_first_line(path):
+    try:
+        with open(path, 'r') as f:
+            return f.readline().strip()
+    except OSError:
+        return None
+
+
+def _cgroup_cpu_limit():
+    """
+    读取 cgroup CPU 配额（v2 的 cpu.max 或 v1 的 cfs_quota_us / cfs_period_us）
+    :return: 配额对应的核数（向上取整），无限制时返回 None
+    """
+    line = _read_first_line('/sys/fs/cgroup/cpu.max')
+    if line:
+        quota, _, period = line.partition(' ')
+        if quota != 'max' and period:
+            return max(1, math.ceil(int(quota) / int(period)))
+        return None
+
+    quota = _read_first_line('/sys/fs/cgroup/cpu/cpu.cfs_quota_us')
+    period = _read_first_line('/sys/fs/cgroup/cpu/cpu.cfs_period_us')
+    if quota and period and int(quota) > 0:
+        return max(1, math.ceil(int(quota) / int(period)))
+    return None
+
+
+def detect_available_cpus():
+    """
+    检测当前进程实际可用的核数
+    :return: (核数, 来源说明)
+    """
+    count, source = os.cpu_count() or 1, "cpu_count"
+    if hasattr(os, 'sched_getaffinity'):
+        try:
+            affinity = len(os.sched_getaffinity(0))
+            if affinity < count:
+                count, source = affinity, "affinity"
+        except OSError:
+            pass
+    quota = _cgroup_cpu_limit()
+    if quota is not None and quota < count:
+        count, source = quota, "cgroup"
+    return count, source
+
+
+class CPUBudget:
+    """可用核数在引擎进程之间的分配"""
+
+    def __init__(self, total=None):
+        """
+        :param total: 总核数，None/0 表示自动检测（不超过 Config.OCR_CPU_LIMIT）
+        """
+        detected, source = detect_available_cpus()
+        limit = getattr(Config, 'OCR_CPU_LIMIT', 0)
+        if total:
+            self.total, self.source = total, "manual"
+        elif limit:
+            self.total, self.source = min(limit, detected), "config"
+        else:
+            self.total, self.source = detected, source
+        self.engine_cores = self.total
+
+        self._lock = threading.Lock()
+        self._engines = {}  # {名称: {"threads": 期望线程数, "max_processes": 进程数上限, "active": 是否活跃, "callback": 回调}}
+        self._shares = {}
+
+    def _engine_share(self, desired_threads, max_processes, count):
+        """单个引擎的份额：每进程线程数不超过份额，进程数填满份额"""
+        cores = max(1, self.engine_cores // max(1, count))
+        threads = max(1, min(desired_threads, cores))
+        processes = max(1, cores // threads)
+        if max_processes:
+            processes = min(processes, max_processes)
+        return {"cores": cores, "threads": threads, "processes": processes}
+
+    def _rebalance(self):
+        """
+        重新计算所有引擎的份额，返回需要通知的 [(回调, 份额)]
+        核数只在活跃的引擎之间划分；待命的引擎按"转为活跃后"的份额启动进程（空闲进程不占用CPU）
+        """
+        changed = []
+        count = sum(engine["active"] for engine in self._engines.values())
+        for name, engine in self._engines.items():
+            share = self._engine_share(engine["threads"], engine["max_processes"],
+                                       count if engine["active"] else count + 1)
+            if self._shares.get(name) != share:
+                self._shares[name] = share
+                callback = engine["callback"]() if engine["callback"] is not None else None
+                if callback is not None:
+                    changed.append((callback, share))
+        return changed
+
+    def register_engine(self, name, desired_threads, max_processes=0, callback=None, active=True):
+        """
+        注册一个引擎（进程池），活跃的引擎注册后其他引擎的份额会相应缩小
+        :param name: 唯一名称
+        :param desired_threads: 每个进程期望的线程数（来自性能档位）
+        :param max_processes: 进程数上限，0表示由预算决定
+        :param callback: 份额变化时的回调 callback(share)（绑定方法只保存弱引用，不阻止引擎被回收）
+        :param active: 是否立即参与划分；False 表示待命，首次收到请求时调用 activate_engine
+        :return: 份额 {"cores": 核数, "threads": 每进程线程数, "processes": 进程数}
+        """
+        ref = None
+        if callback is not None:
+            ref = weakref.WeakMethod(callback) if hasattr(callback, '__self__') else (lambda: callback)
+        with self._lock:
+            self._engines[name] = {"threads": desired_threads, "max_processes": max_processes,
+                                   "active": active, "callback": ref}
+            changed = self._rebalance()
+            share = self._shares[name]
+        for cb, new_share in changed:
+            if cb != callback:
+                cb(new_share)
+        return share
+
+    def activate_engine(self, name):
+        """待命的引擎首次收到请求：开始参与划分，其他活跃引擎的份额相应缩小"""
+        with self._lock:
+            engine = self._engines.get(name)
+            if engine is None or engine["active"]:
+                return
+            engine["active"] = True
+            changed = self._rebalance()
+        for cb, share in changed:
+            cb(share)
+
+    def unregister_engine(self, name):
+        """注销引擎，释放的核数分给其余引擎"""
+        with self._lock:
+            if self._engines.pop(name, None) is None:
+                return
+            self._shares.pop(name, None)
+            changed = self._rebalance()
+        for cb, share in changed:
+            cb(share)
+
+    def allocation(self):
+        """
+        当前分配情况
+        :return: {"total", "source", "engine_cores", "engines": {名称: 份额（附 "active"）}}
+        """
+        with self._lock:
+            return {
+                "total": self.total,
+                "source": self.source,
+                "engine_cores": self.engine_cores,
+                "engines": {name: dict(share, active=self._engines[name]["active"])
+                            for name, share in self._shares.items()},
+            }
+
+    def print_allocation(self):
+        """打印当前分配情况"""
+        info = self.allocation()
+        print(f"CPU 预算: 共 {info['total']} 核（来源: {info['source']}），在活跃的引擎之间划分")
+        for name, share in info["engines"].items():
+            state = "" if share["active"] else "（待命，尚未收到请求）"
+            print(f"  · {name}: {share['processes']} 个进程 × {share['threads']} 线程{state}")
+
+
+_budget = None
+_budget_lock = threading.Lock()
+
+
+def get_cpu_budget() -> CPUBudget:
+    """获取全局 CPU 预算（单例）"""
+    global _budget
+    with _budget_lock:
+        if _budget is None:
+            _budget = CPUBudget()
+        return _budget
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+OCR 守护进程
+每次启动程序都要重新启动本地引擎（Wine、模型加载、"OCR init completed." 握手），
+同时打开的多个窗口也各自启动一组引擎进程。守护进程在后台常驻，持有已预热的引擎进程池，
+通过本机回环地址（127.0.0.1）提供与 PaddleOCR-json 套接字模式相同的 JSON 行协议：
+  - 请求附带路由字段 engine / profile / lang（及 rec_only），守护进程按需创建对应的引擎并复用
+  - 空指令 {} 为状态查询，{"command": "warmup", ...} 预先启动引擎，{"command": "shutdown"} 关闭守护进程
+  - 超过 Config.OCR_DAEMON_IDLE_TIMEOUT 秒没有识别请求时自动退出，释放内存
+  - 同一端口只能有一个守护进程，同时启动的多个实例中只有一个能监听成功，其余直接退出
+
+用法：
+    python ocr_daemon.py serve      # 在前台运行（通常由 OCREngineManager 自动在后台启动）
+    python ocr_daemon.py status     # 查看守护进程状态
+    python ocr_daemon.py stop       # 关闭守护进程
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+import socketserver
+
+# 确保导入路径正确
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config, is_frozen, get_executable_dir
+
+DAEMON_HOST = "127.0.0.1"
+DAEMON_STATUS_CODE = 200  # 状态查询与控制指令的响应码（识别请求仍为 100/101 等引擎原始响应码）
+DAEMON_ENGINES = ('paddle', 'rapid')  # 可由守护进程托管的本地引擎
+
+
+def get_daemon_port(port=None):
+    return port or getattr(Config, 'OCR_DAEMON_PORT', 52110)
+
+
+def get_engine_class(engine_key):
+    """
+    守护进程托管的引擎类
+    :param engine_key: 'paddle' / 'rapid'
+    :return: LocalOCREngine 子类
+    """
+    if engine_key == 'paddle':
+        from ocr_engine_paddle import PaddleOCREngine
+        return PaddleOCREngine
+    if engine_key == 'rapid':
+        from ocr_engine_rapid import RapidOCREngine
+        return RapidOCREngine
+    raise ValueError(f"守护进程不支持的引擎: {engine_key}（可选: {', '.join(DAEMON_ENGINES)}）")
+
+
+def send_request(request, port=None, timeout=2.0):
+    """
+    向守护进程发送一条指令（单独的短连接）
+    :param request: 指令字典
+    :param port: 端口，None表示 Config.OCR_DAEMON_PORT
+    :param timeout: 连接与读取的超时秒数
+    :return: 响应字典
+    """
+    with socket.create_connection((DAEMON_HOST, get_daemon_port(port)), timeout=timeout) as sock:
+        sock.sendall((json.dumps(request, ensure_ascii=True) + "\n").encode("utf-8"))
+        data = b""
+        while not data.endswith(b"\n"):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    return json.loads(data.decode("utf-8"))
+
+
+def daemon_status(port=None):
+    """
+    查询守护进程状态
+    :return: 状态字典；守护进程未运行（或端口被其他程序占用）时返回 None
+    """
+    try:
+        result = send_request({}, port)
+    except (OSError, ValueError):
+        return None
+    data = result.get("data")
+    if result.get("code") == DAEMON_STATUS_CODE and isinstance(data, dict) and data.get("daemon"):
+        return data
+    return None
+
+
+def _daemon_command(port):
+    """启动守护进程的命令行（PyInstaller / Nuitka 打包环境由主程序的 --ocr-daemon 参数进入守护进程）"""
+    if is_frozen() or "__compiled__" in globals():
+        return [sys.executable, "--ocr-daemon", "serve", "--port", str(port)]
+    return [sys.executable, os.path.abspath(__file__), "serve", "--port", str(port)]
+
+
+_start_lock = threading.Lock()
+
+
+def ensure_daemon(port=None, wait=None):
+    """
+    确保守护进程正在运行：已运行时直接返回，否则在后台启动并等待其就绪
+    :param port: 端口，None表示 Config.OCR_DAEMON_PORT
+    :param wait: 等待就绪的秒数，None表示 Config.OCR_DAEMON_START_TIMEOUT
+    :return: 是否可用
+    """
+    port = get_daemon_port(port)
+    if daemon_status(port):
+        return True
+    with _start_lock:
+        if daemon_status(port):
+            return True
+
+        log_path = os.path.join(tempfile.gettempdir(), f"ocr_daemon_{port}.log")
+        print(f"正在启动OCR守护进程（端口 {port}，日志 {log_path}）...")
+        kwargs = {}
+        if sys.platform.startswith('win'):
+            kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs["start_new_session"] = True  # 不随启动它的程序退出
+        with open(log_path, 'ab') as log:
+            subprocess.Popen(
+                _daemon_command(port),
+                stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                cwd=get_executable_dir(), env=dict(os.environ, PYTHONIOENCODING="utf-8"),
+                close_fds=True, **kwargs,
+            )
+
+        deadline = time.monotonic() + (wait if wait is not None else getattr(Config, 'OCR_DAEMON_START_TIMEOUT', 10))
+        while time.monotonic() < deadline:
+            if daemon_status(port):
+                print("✓ OCR守护进程已启动")
+                return True
+            time.sleep(0.1)
+        print(f"❌ OCR守护进程启动超时，详见日志 {log_path}")
+        return False
+
+
+class OCRDaemon:
+    """守护进程服务端：按 (引擎, 档位, 语言) 持有已预热的本地引擎"""
+
+    def __init__(self, port=None, idle_timeout=None):
+        """
+        监听本机端口（端口已被占用时抛出 OSError）
+        :param port: 端口，None表示 Config.OCR_DAEMON_PORT
+        :param idle_timeout: 空闲退出秒数，None表示 Config.OCR_DAEMON_IDLE_TIMEOUT，0表示不退出
+        """
+        self.port = get_daemon_port(port)
+        self.idle_timeout = idle_timeout if idle_timeout is not None else getattr(Config, 'OCR_DAEMON_IDLE_TIMEOUT', 600)
+        self._engines = {}           # {(引擎, 档位, 语言): 引擎实例}
+        self._creating = {}          # {(引擎, 档位, 语言): threading.Lock}
+        self._lock = threading.Lock()
+        self._active = 0             # 正在处理的识别请求数
+        self._requests = 0
+        self._started = time.monotonic()
+        self._last_request = self._started
+        self._stopping = threading.Event()
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    for line in self.rfile:
+                        if daemon._stopping.is_set():
+                            break  # 关闭后断开连接，客户端重新启动守护进程后重试
+                        response = daemon.handle_line(line)
+                        self.wfile.write((json.dumps(response, ensure_ascii=True) + "\n").encode("utf-8"))
+                        self.wfile.flush()
+                except OSError:  # 客户端断开
+                    pass
+
+        class Server(socketserver.ThreadingTCPServer):
+            daemon_threads = True
+            allow_reuse_address = not sys.platform.startswith('win')  # Windows 下会允许两个进程监听同一端口
+
+        self._server = Server((DAEMON_HOST, self.port), Handler)
+
+    # ---- 引擎 ----
+    def _get_engine(self, engine_key, profile, lang):
+        """取得（必要时创建）指定的引擎，同一引擎只创建一次"""
+        from ocr_language_registry import normalize_lang
+
+        profile = profile or getattr(Config, 'OCR_PROFILE', 'balanced')
+        key = (engine_key, profile, normalize_lang(lang))
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is not None:
+                return engine
+            create_lock = self._creating.setdefault(key, threading.Lock())
+        with create_lock:
+            with self._lock:
+                engine = self._engines.get(key)
+            if engine is None:
+                engine = get_engine_class(engine_key)(profile=profile, lang=key[2])
+                with self._lock:
+                    self._engines[key] = engine
+        return engine
+
+    # ---- 请求处理 ----
+    def status(self):
+        with self._lock:
+            return {
+                "daemon": True,
+                "pid": os.getpid(),
+                "port": self.port,
+                "engines": ["/".join(key) for key in self._engines],
+                "requests": self._requests,
+                "active": self._active,
+                "uptime": round(time.monotonic() - self._started, 1),
+                "idle": round(time.monotonic() - self._last_request, 1),
+                "idle_timeout": self.idle_timeout,
+            }
+
+    def handle_line(self, line):
+        """处理一行 JSON 指令，返回响应字典"""
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return {"code": 905, "data": f"指令不是合法的JSON: {e}"}
+
+        command = request.pop("command", None)
+        if command == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"code": DAEMON_STATUS_CODE, "data": "守护进程正在关闭"}
+        if command is None and not request or command == "status":
+            return {"code": DAEMON_STATUS_CODE, "data": self.status()}
+
+        engine_key = request.pop("engine", "paddle")
+        profile = request.pop("profile", None)
+        lang = request.pop("lang", None)
+        rec_only = request.pop("rec_only", False)
+
+        with self._lock:
+            self._active += 1
+            self._requests += 1
+            self._last_request = time.monotonic()
+        try:
+            try:
+                engine = self._get_engine(engine_key, profile, lang)
+            except Exception as e:
+                return {"code": 901, "data": f"守护进程无法启动引擎 {engine_key}: {e}"}
+            if command == "warmup":
+                return {"code": DAEMON_STATUS_CODE, "data": self.status()}
+            if rec_only:
+                return engine._get_rec_pool().runDict(request)
+            if "image_path" in request:
+                return engine._run_file(request["image_path"])  # 由引擎处理 Wine 与非ASCII路径
+            return engine.ocr.runDict(request)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._last_request = time.monotonic()
+
+    # ---- 生命周期 ----
+    def _idle_loop(self):
+        """空闲超时后退出"""
+        interval = max(1.0, min(30.0, self.idle_timeout / 4))
+        while not self._stopping.wait(interval):
+            with self._lock:
+                idle = self._active == 0 and time.monotonic() - self._last_request >= self.idle_timeout
+            if idle:
+                print(f"空闲超过 {self.idle_timeout} 秒，守护进程退出")
+                self.shutdown()
+                return
+
+    def serve_forever(self):
+        """在当前线程提供服务，直到 shutdown 或空闲超时"""
+        print(f"✓ OCR守护进程已启动: {DAEMON_HOST}:{self.port}（PID {os.getpid()}，空闲 {self.idle_timeout} 秒后退出）")
+        if self.idle_timeout:
+            threading.Thread(target=self._idle_loop, name="OCRDaemonIdle", daemon=True).start()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            self.close_engines()
+
+    def shutdown(self):
+        """停止服务（从其他线程调用）"""
+        if self._stopping.is_set():
+            return
+        self._stopping.set()
+        self._server.shutdown()
+
+    def close_engines(self):
+        with self._lock:
+            engines, self._engines = list(self._engines.values()), {}
+        for engine in engines:
+            try:
+                engine.close()
+            except Exception as e:
+                print(f"[Error] 关闭引擎失败: {e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="OCR 守护进程")
+    sub = parser.add_subparsers(dest="command")
+    for name, help_text in (("serve", "在前台运行守护进程"), ("status", "查看守护进程状态"), ("stop", "关闭守护进程")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("--port", type=int, default=0, help="端口，0表示使用 Config.OCR_DAEMON_PORT")
+        if name == "serve":
+            p.add_argument("--idle-timeout", type=int, default=None, help="空闲退出秒数，0表示不退出")
+    args = parser.parse_args(argv)
+    command = args.command or "serve"
+    port = get_daemon_port(getattr(args, "port", 0))
+
+    if command == "status":
+        status = daemon_status(port)
+        if status is None:
+            print(f"OCR守护进程未运行（端口 {port}）")
+            sys.exit(1)
+        print(json.dumps(status, ensure_ascii=False, indent=2))
+    elif command == "stop":
+        if daemon_status(port) is None:
+            print(f"OCR守护进程未运行（端口 {port}）")
+            return
+        send_request({"command": "shutdown"}, port)
+        print("✓ 已通知OCR守护进程退出")
+    else:
+        try:
+            daemon = OCRDaemon(port, getattr(args, "idle_timeout", None))
+        except OSError as e:
+            # 端口已被占用：通常是另一个实例已经启动了守护进程
+            print(f"端口 {port} 不可用，守护进程不启动: {e}")
+            sys.exit(1)
+        daemon.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
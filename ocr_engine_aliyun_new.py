@@ -8,11 +8,14 @@ import os
 import sys
 import base64
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 # 延迟导入numpy，减小打包体积
 # import numpy as np  # 改为按需导入
 from typing import List, Dict, Optional
 from config import Config
+from utils import ImageUtils
+from ocr_result import OCRError
 
 # 检查新版SDK依赖
 try:
@@ -276,7 +279,7 @@ class AliyunOCRNewEngine:
         :param image: PIL Image对象
         :param rect: OCRRect对象或坐标元组 (x1, y1, x2, y2)
         :param recognition_type: 识别类型
-        :return: 识别的文本字符串
+        :return: 识别的文本字符串；识别失败时为 OCRError
         """
         if not self.is_ready():
             raise RuntimeError("阿里云OCR引擎未就绪")
@@ -287,15 +290,17 @@ class AliyunOCRNewEngine:
         else:
             coords = rect
         
-        # 裁剪区域
-        cropped = image.crop(coords)
+        # 裁剪区域（规范化文字高度与灰度，减少上传体积）
+        cropped = ImageUtils.normalize_crop(image.crop(coords))
         
         # 识别裁剪后的图片
         result = self.recognize_image(cropped, recognition_type)
         
-        if result and result.get('content'):
+        if result is None:
+            return OCRError("阿里云OCR识别失败")
+        if result.get('content'):
             return result['content']
-        elif result and result.get('items'):
+        elif result.get('items'):
             # 拼接所有文本
             return ' '.join([item['text'] for item in result['items']])
         else:
@@ -303,7 +308,7 @@ class AliyunOCRNewEngine:
     
     def recognize_regions(self, image, rects, recognition_type='general') -> Dict:
         """
-        批量识别多个区域
+        批量识别多个区域（各区域的请求并发发送）
         :param image: PIL Image对象
         :param rects: OCRRect对象列表
         :param recognition_type: 识别类型
@@ -312,16 +317,52 @@ class AliyunOCRNewEngine:
         if not self.is_ready():
             raise RuntimeError("阿里云OCR引擎未就绪")
         
-        results = {}
+        return self.batch_recognize([(image, rects)], recognition_type)[0]
+    
+    def batch_recognize(self, image_rect_pairs, recognition_type='general', **kwargs) -> List:
+        """
+        批量处理多个图片
+        所有页面的整图与区域识别请求放在同一个线程池中并发发送（并发数 Config.ALIYUN_MAX_CONCURRENCY），
+        API往返时间彼此重叠
+        :param image_rect_pairs: [(image, [rects]), ...] 列表，image 可以是文件路径或URL，rects为空表示识别整图
+        :param recognition_type: 识别类型
+        :param kwargs: 额外参数（整图识别时传给 recognize_image）
+        :return: 识别结果列表（与输入顺序一致）：有区域时为 {rect: text}，否则为识别结果字典（失败为 None）
+        """
+        if not self.is_ready():
+            raise RuntimeError("阿里云OCR引擎未就绪")
         
-        for rect in rects:
-            text = self.recognize_region(image, rect, recognition_type)
-            results[rect] = text
-            
-            # 更新rect的text属性
-            if hasattr(rect, 'text'):
-                rect.text = text
+        tasks = []  # (页码, 区域或None, 图片)
+        for page_index, (image, rects) in enumerate(image_rect_pairs):
+            if rects:
+                if isinstance(image, str):
+                    image = ImageUtils.load_image(image)
+                tasks.extend((page_index, rect, image) for rect in rects)
+            else:
+                tasks.append((page_index, None, image))
+        
+        def run(task):
+            _, rect, image = task
+            if rect is None:
+                return self.recognize_image(image, recognition_type, **kwargs)
+            return self.recognize_region(image, rect, recognition_type)
         
+        concurrency = max(1, getattr(Config, 'ALIYUN_MAX_CONCURRENCY', 4))
+        if len(tasks) <= 1 or concurrency == 1:
+            outputs = [run(task) for task in tasks]
+        else:
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(tasks))) as executor:
+                outputs = list(executor.map(run, tasks))
+        
+        results = [{} if rects else None for _, rects in image_rect_pairs]
+        for (page_index, rect, _), output in zip(tasks, outputs):
+            if rect is None:
+                results[page_index] = output
+            else:
+                results[page_index][rect] = output
+                # 更新rect的text属性
+                if hasattr(rect, 'text'):
+                    rect.text = output
         return results
     
     def get_supported_types(self) -> Dict[str, str]:
@@ -0,0 +1,112 @@
+"""
+通过 OCR 守护进程使用本地引擎
+引擎进程由守护进程（ocr_daemon.py）持有并保持预热，本进程只通过本机回环连接发送请求，
+第二个程序实例或命令行工具可以直接使用已经启动好的引擎。
+区域拼图、单行识别、多语言路由等逻辑仍在本进程完成（沿用 LocalOCREngine），
+每个请求附带路由字段，由守护进程交给对应的引擎。
+"""
+
+from config import Config
+from ocr_engine_local import LocalOCREngine
+from ocr_remote_pool import RemoteEndpointPool, ENDPOINT_FAILURE_CODES
+from ocr_language_registry import LANGUAGE_NAMES, normalize_lang
+from ocr_daemon import DAEMON_HOST, DAEMON_STATUS_CODE, ensure_daemon, get_daemon_port, get_engine_class, send_request
+
+
+class DaemonClientPool(RemoteEndpointPool):
+    """守护进程连接：请求附带引擎路由字段；守护进程已退出（空闲超时）时重新启动后重试"""
+
+    def __init__(self, port, route, **kwargs):
+        """
+        :param port: 守护进程端口
+        :param route: 附加到每个请求的路由字段 {"engine", "profile", "lang"[, "rec_only"]}
+        :param kwargs: 其余参数同 RemoteEndpointPool（通常 health_interval=0，按需重启代替后台探测）
+        """
+        self.port = port
+        self.route = route
+        super().__init__([f"{DAEMON_HOST}:{port}"], **kwargs)
+
+    def runDict(self, writeDict: dict):
+        request = dict(writeDict, **self.route)
+        result = super().runDict(request)
+        if result["code"] in ENDPOINT_FAILURE_CODES and ensure_daemon(self.port):
+            endpoint = self._endpoints[0]
+            if endpoint.api is not None:
+                endpoint.api.closeIdleConnections()  # 旧守护进程的连接已失效
+            if self._probe(endpoint):
+                result = super().runDict(request)
+        return result
+
+
+class DaemonOCREngine(LocalOCREngine):
+    """由 OCR 守护进程托管的本地引擎（PaddleOCR-json / RapidOCR-json）"""
+
+    def __init__(self, engine_key='paddle', profile=None, lang=None, port=None):
+        """
+        连接（必要时启动）守护进程，并让守护进程预热所需的引擎
+        :param engine_key: 'paddle' / 'rapid'
+        :param profile: 性能档位，None表示使用 Config.OCR_PROFILE
+        :param lang: 识别语言，None表示使用 Config.OCR_LANG
+        :param port: 守护进程端口，None表示使用 Config.OCR_DAEMON_PORT
+        """
+        engine_class = get_engine_class(engine_key)
+        self.engine_key = engine_key
+        self.ENGINE_NAME = f"{engine_class.ENGINE_NAME}（守护进程）"
+        self.ENGINE_KEY = engine_class.ENGINE_KEY
+        self.EXE_RELATIVE_PATH = engine_class.EXE_RELATIVE_PATH
+        self.RECOGNITION_ONLY_ARGUMENTS = engine_class.RECOGNITION_ONLY_ARGUMENTS
+        self.lang = normalize_lang(lang)
+        self.profile = profile or getattr(Config, 'OCR_PROFILE', 'balanced')
+        self.uses_wine = False  # 文件路径交给守护进程中的引擎处理
+        self.exe_path = None
+        self.arguments = {}
+        self.port = get_daemon_port(port)
+        self._route = {"engine": engine_key, "profile": self.profile, "lang": self.lang}
+
+        print(f"正在初始化 {self.ENGINE_NAME} 引擎...")
+        if not ensure_daemon(self.port):
+            raise Exception(f"{self.ENGINE_NAME} 引擎初始化失败: 守护进程未能启动")
+        try:
+            # 引擎已在守护进程中运行时立即返回，否则等待其启动完成
+            result = send_request(dict(self._route, command="warmup"), self.port,
+                                  timeout=getattr(Config, 'OCR_REQUEST_TIMEOUT', 60) or None)
+            if result.get("code") != DAEMON_STATUS_CODE:
+                raise Exception(result.get("data"))
+            self.ocr = self._create_pool(self._route)
+        except Exception as e:
+            raise Exception(f"{self.ENGINE_NAME} 引擎初始化失败: {e}")
+
+        print(f"✓ {self.ENGINE_NAME} 引擎初始化成功")
+        print(f"  - 守护进程: {DAEMON_HOST}:{self.port}（PID {result['data']['pid']}，"
+              f"已启动引擎 {', '.join(result['data']['engines'])}）")
+        print(f"  - 性能档位: {self.profile}")
+        print(f"  - 识别语言: {LANGUAGE_NAMES[self.lang]}")
+
+        self._init_region_batching()
+
+    def _create_pool(self, route):
+        return DaemonClientPool(
+            self.port, route,
+            connect_timeout=getattr(Config, 'OCR_REMOTE_CONNECT_TIMEOUT', 3),
+            request_timeout=getattr(Config, 'OCR_REQUEST_TIMEOUT', 60),
+            health_interval=0,
+            pipeline_depth=getattr(Config, 'OCR_PIPELINE_DEPTH', 2),
+        )
+
+    def _language_factory(self):
+        engine_class, engine_key, profile, port = type(self), self.engine_key, self.profile, self.port
+        return lambda lang: engine_class(engine_key, profile, lang, port)
+
+    def supported_languages(self):
+        """
+        可用的识别语言（由守护进程中的引擎决定）
+        :return: {语言代码: 显示名称}
+        """
+        return get_engine_class(self.engine_key).supported_languages()
+
+    def _get_rec_pool(self):
+        """仅识别通道：同样由守护进程中的引擎提供"""
+        with self._rec_pool_lock:
+            if self._rec_pool is None:
+                self._rec_pool = self._create_pool(dict(self._route, rec_only=True))
+            return self._rec_pool
@@ -10,6 +10,9 @@ from io import BytesIO
 from typing import List, Dict, Optional, Tuple
 from PIL import Image
 from config import Config, OCRRect
+from utils import ImageUtils
+from ocr_result import OCRResult, OCRError
+from ocr_batch import prepare_batch_item
 
 # 检查OpenAI SDK依赖
 try:
@@ -101,14 +104,20 @@ class DeepSeekOCREngine:
     def _image_to_base64(self, image) -> str:
         """
         将图片转换为Base64编码的Data URL
-        :param image: PIL Image、文件路径或numpy数组
+        :param image: PIL Image、文件路径、字节数据或numpy数组
         :return: Base64 Data URL字符串
         """
-        # 处理不同类型的输入
+        # 文件路径：JPEG/PNG 原始字节直接上传，避免解码后重新编码
         if isinstance(image, str):
-            # 文件路径
-            image = Image.open(image)
-        elif isinstance(image, bytes):
+            with open(image, 'rb') as f:
+                raw = f.read()
+            mime = {'JPEG': 'image/jpeg', 'PNG': 'image/png'}.get(ImageUtils.sniff_image_format(raw))
+            if mime:
+                return f"data:{mime};base64,{base64.b64encode(raw).decode('utf-8')}"
+            image = raw
+        
+        # 处理不同类型的输入
+        if isinstance(image, bytes):
             # 字节数据
             image = Image.open(BytesIO(image))
         elif hasattr(image, 'shape'):  # numpy数组
@@ -134,16 +143,16 @@ class DeepSeekOCREngine:
         # 返回Data URL
         return f"data:image/jpeg;base64,{base64_str}"
     
-    def recognize_image(self, image, **kwargs) -> List[Dict]:
+    def recognize_image(self, image, **kwargs) -> OCRResult:
         """
         识别整张图片
         :param image: PIL Image、numpy数组或文件路径
         :param kwargs: 额外参数（prompt: 自定义OCR提示词）
-        :return: 识别结果列表
+        :return: OCRResult（DeepSeek不返回位置信息，文本行无坐标；请求失败时带 error）
         """
         if not self.is_ready():
             print("❌ DeepSeek OCR引擎未就绪")
-            return []
+            return OCRResult.failed("DeepSeek OCR引擎未就绪")
         
         try:
             # 转换图片为Base64
@@ -181,20 +190,16 @@ class DeepSeekOCREngine:
                 # 清理结果，提取纯文本
                 clean_text = self._clean_ocr_result(content)
                 
-                # 返回标准化格式
-                return [{
-                    'text': clean_text,
-                    'confidence': 0.95,  # DeepSeek不返回置信度，给一个默认值
-                    'box': None  # 全图识别没有位置信息
-                }]
+                # 返回统一结果（DeepSeek不返回置信度，给一个默认值；全图识别没有位置信息）
+                return OCRResult.from_text(clean_text, score=0.95)
             else:
-                return []
+                return OCRResult.failed("API 返回结果为空")
                 
         except Exception as e:
             print(f"❌ DeepSeek OCR识别失败: {e}")
             import traceback
             traceback.print_exc()
-            return []
+            return OCRResult.failed(e)
     
     def recognize_region(self, image, rect, **kwargs) -> str:
         """
@@ -202,11 +207,11 @@ class DeepSeekOCREngine:
         :param image: PIL Image对象
         :param rect: OCRRect对象或坐标元组 (x1, y1, x2, y2)
         :param kwargs: 额外参数
-        :return: 识别的文本字符串
+        :return: 识别的文本字符串；识别失败时为 OCRError
         """
         if not self.is_ready():
             print("❌ DeepSeek OCR引擎未就绪")
-            return ""
+            return OCRError("DeepSeek OCR引擎未就绪")
         
         try:
             # 确保image是PIL Image
@@ -226,22 +231,22 @@ class DeepSeekOCREngine:
             else:
                 raise ValueError(f"不支持的矩形格式: {type(rect)}")
             
-            # 裁剪图片区域
-            cropped = image.crop((x1, y1, x2, y2))
+            # 裁剪图片区域（规范化文字高度与灰度，减少上传体积）
+            cropped = ImageUtils.normalize_crop(image.crop((x1, y1, x2, y2)))
             
             # 识别裁剪后的图片
             results = self.recognize_image(cropped, **kwargs)
+            if results.error is not None:
+                return OCRError(results.error)
             
             # 提取文本
-            if results and len(results) > 0:
-                return results[0].get('text', '').strip()
-            return ""
+            return results.text.strip()
             
         except Exception as e:
             print(f"❌ DeepSeek OCR区域识别失败: {e}")
             import traceback
             traceback.print_exc()
-            return ""
+            return OCRError(e)
     
     def recognize_regions(self, image, rects: List[OCRRect], **kwargs) -> Dict[OCRRect, str]:
         """
@@ -265,7 +270,7 @@ class DeepSeekOCREngine:
     def batch_recognize(self, image_rect_pairs: List[Tuple], **kwargs):
         """
         批量处理多个图片
-        :param image_rect_pairs: [(image, [rects]), ...] 列表
+        :param image_rect_pairs: [(image, [rects]), ...] 列表，image 可以是文件路径
         :param kwargs: 额外参数
         :return: 识别结果列表
         """
@@ -275,6 +280,7 @@ class DeepSeekOCREngine:
         
         results = []
         for image, rects in image_rect_pairs:
+            image, rects = prepare_batch_item(image, list(rects))
             if rects:
                 # 有区域，识别各区域
                 region_results = self.recognize_regions(image, rects, **kwargs)
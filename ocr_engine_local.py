@@ -0,0 +1,608 @@
+"""
+本地 C++ OCR 引擎公共封装
+PaddleOCR-json 与 RapidOCR-json 使用相同的 JSON 管道协议，
+初始化（含 Linux 下的 Wine 包装）、图片传输与区域识别逻辑在此统一实现，
+具体引擎只需声明可执行文件位置与展示信息。
+"""
+
+import os
+import sys
+import subprocess
+import tempfile
+import functools
+import threading
+from config import Config, get_resource_path
+from ocr_engine_pool import OCREnginePool
+from ocr_region_packer import MosaicBatcher, MosaicPacker
+from ocr_profiles import build_engine_arguments, get_profile
+from ocr_cpu_budget import get_cpu_budget
+from utils import FileUtils, ImageUtils
+from ocr_batch import prepare_batch_item
+from ocr_result import OCRResult, OCRError
+from ocr_language_registry import LanguageEngineRegistry, LANGUAGE_NAMES, normalize_lang
+
+
+class LocalOCREngine:
+    """本地 C++ OCR 引擎基类"""
+
+    ENGINE_NAME = ""          # 引擎名称，如 "PaddleOCR-json"
+    ENGINE_KEY = ""           # 启动参数类型 'paddle' / 'rapid'（见 ocr_profiles）
+    EXE_RELATIVE_PATH = ()    # 可执行文件相对项目根目录的路径片段
+    FEATURES = ""             # 初始化成功后显示的特性说明
+    RECOGNITION_ONLY_ARGUMENTS = None  # 仅识别（关闭检测与方向分类）的附加启动参数，None表示引擎不支持
+
+    def __init__(self, profile=None, lang=None):
+        """
+        初始化本地 OCR 引擎
+        :param profile: 性能档位 fast / balanced / accurate，None表示使用 Config.OCR_PROFILE
+        :param lang: 识别语言（见 ocr_language_registry.LANGUAGE_NAMES），None表示使用 Config.OCR_LANG
+        """
+        # 确定可执行文件路径（支持PyInstaller打包）
+        exe_path = get_resource_path(os.path.join(*self.EXE_RELATIVE_PATH))
+        exe_name = os.path.basename(exe_path)
+
+        if not os.path.exists(exe_path):
+            raise Exception(f"{exe_name} 不存在: {exe_path}")
+
+        print(f"正在初始化 {self.ENGINE_NAME} 引擎...")
+        print(f"  - 可执行文件: {exe_path}")
+
+        # 识别语言、模型集 -> 模型参数（模型文件需随引擎提供）
+        self.lang = normalize_lang(lang)
+        exe_dir = os.path.dirname(exe_path)
+        model_arguments = self.language_arguments(self.lang, exe_dir)
+        model_arguments.update(self.model_set_arguments(model_arguments, exe_dir))
+
+        # 检测系统平台，如果是 Linux 则使用 wine
+        self.uses_wine = False
+        if sys.platform.startswith('linux'):
+            # 检查 wine 是否安装
+            try:
+                wine_check = subprocess.run(['which', 'wine'], capture_output=True, text=True)
+                if wine_check.returncode != 0:
+                    raise Exception("在 Linux 系统上运行 Windows exe 需要安装 wine")
+                print("  - 运行环境: Linux + Wine")
+                # 创建 wine 包装脚本
+                self._create_wine_wrapper(exe_path)
+                exe_path = exe_path + ".sh"  # 使用包装脚本
+                self.uses_wine = True
+            except FileNotFoundError:
+                raise Exception("在 Linux 系统上运行 Windows exe 需要安装 wine")
+
+        self.exe_path = exe_path
+
+        # 性能档位 -> 引擎启动参数；每进程线程数与进程数由全局 CPU 预算分配
+        # （先登记为待命，首次收到请求时才参与划分，未使用的备用引擎不缩小其他引擎的份额）
+        self.profile = profile or getattr(Config, 'OCR_PROFILE', 'balanced')
+        self._budget_name = f"{self.ENGINE_NAME}[{self.profile}]@{id(self):x}"
+        share = get_cpu_budget().register_engine(
+            self._budget_name,
+            desired_threads=get_profile(self.profile)["threads"],
+            max_processes=getattr(Config, 'OCR_POOL_MAX_SIZE', 0),
+            callback=self._apply_cpu_share,
+            active=False,
+        )
+        self.arguments = build_engine_arguments(self.ENGINE_KEY, self.profile, threads=share["threads"])
+        self.arguments.update(model_arguments)
+        self._model_arguments = model_arguments
+
+        # 初始化 OCR 引擎进程池（管道模式，最快；按需扩容到预算分配的进程数）
+        try:
+            self.ocr = OCREnginePool(
+                exe_path,
+                argument=self.arguments,
+                ipc_mode="pipe",
+                max_size=share["processes"],
+                min_size=getattr(Config, 'OCR_POOL_MIN_SIZE', 1),
+                idle_timeout=getattr(Config, 'OCR_POOL_IDLE_TIMEOUT', 60),
+                pipeline_depth=getattr(Config, 'OCR_PIPELINE_DEPTH', 2),
+                request_timeout=getattr(Config, 'OCR_REQUEST_TIMEOUT', 60),
+                on_first_request=functools.partial(get_cpu_budget().activate_engine, self._budget_name),
+            )
+            print(f"✓ {self.ENGINE_NAME} 引擎初始化成功")
+            print(f"  - 模式: 高性能 C++ 引擎（管道模式，进程池 {self.ocr.min_size}~{self.ocr.max_size} 个进程）")
+            print(f"  - 性能档位: {self.profile}（每进程 {share['threads']} 线程）")
+            print(f"  - 识别语言: {LANGUAGE_NAMES[self.lang]}")
+            print(f"  - 特性: {self.FEATURES}")
+        except Exception as e:
+            get_cpu_budget().unregister_engine(self._budget_name)
+            raise Exception(f"{self.ENGINE_NAME} 引擎初始化失败: {e}")
+
+        self._init_region_batching()
+
+    def _init_region_batching(self):
+        """初始化区域识别的拼图批处理、单行识别通道与多语言引擎注册表（需先创建 self.ocr）"""
+        # 区域拼图识别：多个小区域拼成一张画布，一次引擎调用完成
+        self.mosaic = None
+        if getattr(Config, 'OCR_MOSAIC_ENABLED', True):
+            packer = MosaicPacker(
+                # 画布不超过档位的检测边长限制，避免被引擎整体缩小
+                max_side=min(getattr(Config, 'OCR_MOSAIC_MAX_SIDE', 960), get_profile(self.profile)["limit_side_len"]),
+                gap=getattr(Config, 'OCR_MOSAIC_GAP', 24),
+                text_height=getattr(Config, 'OCR_CROP_MAX_TEXT_HEIGHT', 56),
+            )
+            self.mosaic = MosaicBatcher(
+                lambda images: self.ocr.map(self._run_image, images),
+                packer,
+                window=getattr(Config, 'OCR_MOSAIC_WINDOW_MS', 15) / 1000,
+            )
+
+        # 单行区域快速通道：关闭检测与方向分类的独立进程池，首次遇到单行区域时启动
+        self._rec_pool = None
+        self._rec_pool_lock = threading.Lock()
+        self._rec_only_verified = False
+        self.rec_only_enabled = (self.RECOGNITION_ONLY_ARGUMENTS is not None
+                                 and getattr(Config, 'OCR_REC_ONLY_ENABLED', True))
+
+        # 其他语言的引擎按需启动
+        self._languages = LanguageEngineRegistry(
+            self._language_factory(),
+            max_engines=getattr(Config, 'OCR_LANG_MAX_ENGINES', 2),
+        )
+
+    def _language_factory(self):
+        """创建其他语言引擎的工厂 factory(lang)（不引用 self，避免循环引用）"""
+        return functools.partial(type(self), profile=self.profile)
+
+    @classmethod
+    def language_arguments(cls, lang, exe_dir):
+        """
+        生成语言对应的模型启动参数（由具体引擎实现）
+        :param lang: 语言代码
+        :param exe_dir: 引擎可执行文件所在目录
+        :return: 启动参数字典，默认语言返回空字典
+        """
+        if lang != 'ch':
+            raise Exception(f"{cls.ENGINE_NAME} 不支持识别语言: {lang}")
+        return {}
+
+    @classmethod
+    def model_set_arguments(cls, arguments, exe_dir):
+        """
+        按 Config.OCR_MODEL_SET 选择模型精度版本的启动参数（由支持的引擎实现）
+        :param arguments: 已确定的模型参数（如语言对应的识别模型）
+        :param exe_dir: 引擎可执行文件所在目录
+        :return: 需要覆盖的模型参数，默认不覆盖
+        """
+        return {}
+
+    def _rect_lang(self, rect, lang=None):
+        """区域的识别语言：参数优先，其次为区域自身的设置，都没有时为本引擎的语言"""
+        return normalize_lang(lang or getattr(rect, 'lang', None) or self.lang)
+
+    @classmethod
+    def supported_languages(cls):
+        """
+        本引擎可用的识别语言（模型文件齐全的语言）
+        :return: {语言代码: 显示名称}
+        """
+        exe_dir = os.path.dirname(get_resource_path(os.path.join(*cls.EXE_RELATIVE_PATH)))
+        languages = {}
+        for lang, name in LANGUAGE_NAMES.items():
+            try:
+                cls.language_arguments(lang, exe_dir)
+                languages[lang] = name
+            except Exception:
+                pass
+        return languages
+
+    def _apply_cpu_share(self, share):
+        """CPU 预算变化时调整进程池（新启动的进程使用新的线程数）"""
+        self.arguments = build_engine_arguments(self.ENGINE_KEY, self.profile, threads=share["threads"])
+        self.arguments.update(getattr(self, '_model_arguments', {}))
+        if hasattr(self, 'ocr') and self.ocr:
+            self.ocr.reconfigure(max_size=share["processes"], argument=self.arguments)
+            print(f"{self.ENGINE_NAME} CPU 份额调整: {share['processes']} 个进程 × {share['threads']} 线程")
+
+    def _create_wine_wrapper(self, exe_path):
+        """创建 wine 包装脚本"""
+        wrapper_path = exe_path + ".sh"
+        exe_dir = os.path.dirname(exe_path)
+        exe_name = os.path.basename(exe_path)
+
+        wrapper_content = f"""#!/bin/bash
+cd "{exe_dir}"
+exec wine "{exe_name}" "$@"
+"""
+
+        with open(wrapper_path, 'w') as f:
+            f.write(wrapper_content)
+
+        # 添加执行权限
+        os.chmod(wrapper_path, 0o755)
+        print(f"  - 创建 Wine 包装脚本: {wrapper_path}")
+
+    def _run_image(self, image, transport=None):
+        """
+        将图片发送给引擎识别
+        默认通过 runBytes 内存传输（按 OCR_IMAGE_TRANSPORT 选择编码），
+        transport='file' 时退回旧的临时PNG文件方式
+        :param image: PIL Image对象
+        :param transport: 传输方式，None表示使用配置
+        :return: 引擎原始返回 {"code": 识别码, "data": 内容列表或错误信息字符串}
+        """
+        if transport is None:
+            transport = getattr(Config, 'OCR_IMAGE_TRANSPORT', 'auto')
+
+        if transport != 'file':
+            image_bytes, _ = ImageUtils.encode_for_engine(image, mode=transport)
+            return self.ocr.runBytes(image_bytes)
+
+        # 保存临时图片文件
+        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_file:
+            temp_path = tmp_file.name
+            image.save(temp_path)
+        try:
+            return self.ocr.run(temp_path)
+        finally:
+            # 清理临时文件
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _run_file(self, file_path):
+        """
+        直接识别磁盘上的图片文件（不经过 Python 解码/编码）
+        - 引擎可直接读取的格式：把路径交给引擎（Wine 下或路径含非ASCII字符时改为发送原始文件字节）
+        - 其他格式（PDF、GIF等）：解码后按内存传输方式发送
+        :param file_path: 图片文件路径
+        :return: 引擎原始返回
+        """
+        if not FileUtils.is_engine_native_file(file_path):
+            return self._run_image(ImageUtils.load_image(file_path))
+
+        file_path = os.path.abspath(file_path)
+        if self.uses_wine or not file_path.isascii():
+            with open(file_path, 'rb') as f:
+                return self.ocr.runBytes(f.read())
+        return self.ocr.run(file_path)
+
+    @staticmethod
+    def _result_to_text(result):
+        """
+        将引擎原始返回解析为文本
+        :param result: 引擎原始返回
+        :return: 识别文本（多行以换行连接）；识别失败时为 OCRError
+        """
+        if result["code"] == 100:  # 识别成功
+            texts = []
+            for line in result["data"]:
+                text = line.get("text", "").strip()
+                if text:
+                    texts.append(text)
+            return "\n".join(texts) if texts else ""
+        elif result["code"] == 101:  # 无文字
+            return ""
+        else:  # 识别失败
+            print(f"OCR识别失败: code={result['code']}, data={result['data']}")
+            return OCRError(f"code={result['code']}, data={result['data']}")
+
+    def ocr_image(self, image, rect=None):
+        """
+        对图片进行OCR识别
+        :param image: PIL Image对象
+        :param rect: 识别区域 (x1, y1, x2, y2)，None表示识别全图
+        :return: 识别文本
+        """
+        try:
+            # 如果指定了区域，先裁剪图片（单行区域走仅识别通道，其余启用拼图时与同时到达的其他区域合并识别）
+            if rect:
+                x1, y1, x2, y2 = rect
+                image = image.crop((x1, y1, x2, y2))
+                return self._recognize_crop_images([image])[0]
+
+            return self._result_to_text(self._run_image(image))
+
+        except Exception as e:
+            print(f"OCR识别异常: {e}")
+            return OCRError(e)
+
+    def recognize_image(self, image, lang=None, **kwargs):
+        """
+        识别整张图片
+        :param image: PIL Image对象或图片文件路径（文件路径直接交给引擎，无需解码）
+        :param lang: 识别语言，None表示本引擎的语言
+        :return: OCRResult（保留每个文本行的文本、四点坐标与置信度；识别失败时带 error）
+        """
+        if not self.is_ready():
+            return OCRResult.failed(f"{self.ENGINE_NAME} 引擎未就绪")
+
+        lang = self._rect_lang(None, lang)
+        if lang != self.lang:
+            try:
+                with self._languages.use(lang) as engine:
+                    return engine.recognize_image(image, **kwargs)
+            except Exception as e:
+                print(f"OCR识别异常（{LANGUAGE_NAMES[lang]}）: {e}")
+                return OCRResult.failed(e)
+
+        if isinstance(image, str):
+            result = self._run_file(image)
+        else:
+            result = self._run_image(image)
+
+        if result["code"] not in (100, 101):
+            print(f"OCR识别失败: code={result['code']}, data={result['data']}")
+        return OCRResult.from_engine(result)
+
+    def is_ready(self):
+        """检查引擎是否就绪"""
+        return hasattr(self, 'ocr') and self.ocr is not None
+
+    def recognize_region(self, image, rect, lang=None, **kwargs):
+        """
+        识别图片中的指定区域
+        :param image: PIL Image对象
+        :param rect: OCRRect对象或坐标元组 (x1, y1, x2, y2)
+        :param lang: 识别语言，None表示使用区域的 lang 属性或本引擎的语言
+        :return: 识别的文本字符串
+        """
+        if not self.is_ready():
+            return OCRError(f"{self.ENGINE_NAME} 引擎未就绪")
+
+        return self._recognize_pairs([(image, rect)], lang)[0]
+
+    def recognize_regions(self, image, rects, lang=None, **kwargs):
+        """
+        批量识别多个区域（按语言分组；启用拼图时每种语言合并为一次引擎调用，否则分散到进程池并发识别）
+        :param image: PIL Image对象
+        :param rects: OCRRect对象列表
+        :param lang: 识别语言，None表示使用各区域的 lang 属性或本引擎的语言
+        :return: 识别结果字典 {rect: text}
+        """
+        if not self.is_ready():
+            return {}
+
+        texts = self._recognize_pairs([(image, rect) for rect in rects], lang)
+
+        results = {}
+        for rect, text in zip(rects, texts):
+            results[rect] = text
+
+            # 更新rect的text属性
+            if hasattr(rect, 'text'):
+                rect.text = text
+
+        return results
+
+    def batch_recognize(self, image_rect_pairs, lang=None, **kwargs):
+        """
+        批量处理多个图片（所有页面的区域一起按语言分组识别，整图页面分散到进程池）
+        :param image_rect_pairs: [(image, [rects]), ...] 列表，image 可以是文件路径，rects为空表示识别整图
+        :param lang: 识别语言，None表示使用各区域的 lang 属性或本引擎的语言
+        :return: 识别结果列表（与输入顺序一致）：有区域时为 {rect: text}，否则为整图识别结果 OCRResult
+        """
+        if not self.is_ready():
+            return []
+
+        image_rect_pairs = [prepare_batch_item(image, list(rects)) for image, rects in image_rect_pairs]
+        regions = [(page_index, image, rect)
+                   for page_index, (image, rects) in enumerate(image_rect_pairs) for rect in rects]
+        pages = [page_index for page_index, (_, rects) in enumerate(image_rect_pairs) if not rects]
+
+        texts = self._recognize_pairs([(image, rect) for _, image, rect in regions], lang)
+        page_results = self.ocr.map(
+            lambda page_index: self.recognize_image(image_rect_pairs[page_index][0], lang=lang, **kwargs), pages
+        )
+
+        results = [{} if rects else OCRResult() for _, rects in image_rect_pairs]
+        for (page_index, _, rect), text in zip(regions, texts):
+            results[page_index][rect] = text
+            if hasattr(rect, 'text'):
+                rect.text = text
+        for page_index, result in zip(pages, page_results):
+            results[page_index] = result
+        return results
+
+    def _recognize_pairs(self, image_rect_pairs, lang=None):
+        """
+        识别多个区域（可来自不同页面），按识别语言分组后交给对应语言的引擎
+        :param image_rect_pairs: [(image, rect), ...]，rect为OCRRect对象或坐标元组
+        :param lang: 识别语言，None表示使用各区域的 lang 属性或本引擎的语言
+        :return: 与输入顺序一致的识别文本列表（识别失败的区域为 OCRError）
+        """
+        groups = {}
+        for i, (_, rect) in enumerate(image_rect_pairs):
+            groups.setdefault(self._rect_lang(rect, lang), []).append(i)
+
+        texts = [""] * len(image_rect_pairs)
+        for group_lang, indices in groups.items():
+            pairs = [image_rect_pairs[i] for i in indices]
+            if group_lang == self.lang:
+                group_texts = self._recognize_local(pairs)
+            else:
+                try:
+                    with self._languages.use(group_lang) as engine:
+                        group_texts = engine._recognize_local(pairs)
+                except Exception as e:
+                    print(f"OCR识别异常（{LANGUAGE_NAMES[group_lang]}）: {e}")
+                    group_texts = [OCRError(e)] * len(indices)
+            for i, text in zip(indices, group_texts):
+                texts[i] = text
+        return texts
+
+    def _recognize_local(self, image_rect_pairs):
+        """用本引擎识别多个区域（可来自不同页面）"""
+        try:
+            crops = [image.crop(rect.get_coords() if hasattr(rect, 'get_coords') else rect)
+                     for image, rect in image_rect_pairs]
+        except Exception as e:
+            print(f"OCR识别异常: {e}")
+            return [OCRError(e)] * len(image_rect_pairs)
+        return self._recognize_crop_images(crops)
+
+    def _recognize_crop_images(self, crops):
+        """
+        识别多个区域截图
+        先规范化截图（文字高度、灰度，见 ImageUtils.normalize_crop），
+        单行截图走仅识别通道（跳过检测与方向分类），其余截图启用拼图时合并识别，否则分散到进程池
+        :param crops: PIL Image列表
+        :return: 与输入顺序一致的识别文本列表
+        """
+        crops = [ImageUtils.normalize_crop(crop) for crop in crops]
+        texts = [""] * len(crops)
+        pending = list(range(len(crops)))
+
+        if self.rec_only_enabled:
+            lines = [i for i in pending if ImageUtils.is_single_line(crops[i])]
+            if lines:
+                recognized = self._recognize_lines([ImageUtils.trim_to_ink(crops[i]) for i in lines])
+                for i, text in zip(lines, recognized):
+                    if text is not None:
+                        texts[i] = text
+                # 仅识别失败或置信度过低的截图退回完整流程
+                done = {i for i, text in zip(lines, recognized) if text is not None}
+                pending = [i for i in pending if i not in done]
+
+        if not pending:
+            return texts
+        try:
+            if self.mosaic is not None:
+                results = self.mosaic.recognize_many([crops[i] for i in pending])
+            else:
+                results = self.ocr.map(self._run_image, [crops[i] for i in pending])
+            for i, result in zip(pending, results):
+                texts[i] = self._result_to_text(result)
+        except Exception as e:
+            print(f"OCR识别异常: {e}")
+            for i in pending:
+                texts[i] = OCRError(e)
+        return texts
+
+    def _get_rec_pool(self):
+        """
+        获取仅识别通道的进程池（首次调用时启动）
+        与完整流程的进程池同时工作，因此在 CPU 预算中单独登记一份，而不是与主进程池共用同一份额
+        """
+        with self._rec_pool_lock:
+            if self._rec_pool is None:
+                self._rec_budget_name = f"{self._budget_name}/单行识别"
+                share = get_cpu_budget().register_engine(
+                    self._rec_budget_name,
+                    desired_threads=get_profile(self.profile)["threads"],
+                    max_processes=getattr(Config, 'OCR_POOL_MAX_SIZE', 0),
+                    callback=self._apply_rec_cpu_share,
+                )
+                try:
+                    self._rec_pool = OCREnginePool(
+                        self.exe_path,
+                        argument=self._rec_only_arguments(share["threads"]),
+                        ipc_mode="pipe",
+                        max_size=share["processes"],
+                        min_size=1,
+                        idle_timeout=getattr(Config, 'OCR_POOL_IDLE_TIMEOUT', 60),
+                        pipeline_depth=getattr(Config, 'OCR_PIPELINE_DEPTH', 2),
+                        request_timeout=getattr(Config, 'OCR_REQUEST_TIMEOUT', 60),
+                    )
+                except Exception:
+                    get_cpu_budget().unregister_engine(self._rec_budget_name)
+                    raise
+                print(f"✓ {self.ENGINE_NAME} 单行识别通道已启动（关闭检测与方向分类，"
+                      f"{share['processes']} 个进程 × {share['threads']} 线程）")
+            return self._rec_pool
+
+    def _rec_only_arguments(self, threads):
+        """仅识别通道的启动参数：与主进程池相同的档位与模型参数，外加关闭检测与方向分类"""
+        arguments = build_engine_arguments(self.ENGINE_KEY, self.profile, threads=threads)
+        arguments.update(getattr(self, '_model_arguments', {}))
+        arguments.update(self.RECOGNITION_ONLY_ARGUMENTS)
+        return arguments
+
+    def _apply_rec_cpu_share(self, share):
+        """CPU 预算变化时调整仅识别通道的进程池"""
+        if getattr(self, '_rec_pool', None):
+            self._rec_pool.reconfigure(max_size=share["processes"],
+                                       argument=self._rec_only_arguments(share["threads"]))
+
+    def _disable_rec_only(self):
+        """关闭仅识别通道：之后单行截图改走完整流程，已启动的进程池退出并释放 CPU 份额"""
+        self.rec_only_enabled = False
+        with self._rec_pool_lock:
+            pool, self._rec_pool = self._rec_pool, None
+        if pool is not None:
+            try:
+                pool.exit()
+            except Exception as e:
+                print(f"[Error] 关闭单行识别通道失败: {e}")
+        if hasattr(self, '_rec_budget_name'):
+            get_cpu_budget().unregister_engine(self._rec_budget_name)
+
+    def _verify_rec_only(self, result, size):
+        """
+        检查仅识别通道确实关闭了检测：单行截图应只返回一个文本行，且没有检测框坐标（全为0或等于整张截图）；
+        否则说明引擎仍在运行检测（例如启动参数未生效），关闭该通道，之后改走完整流程
+        :param result: 仅识别通道对一张截图的返回
+        :param size: 截图尺寸 (宽, 高)
+        :return: 检查是否通过
+        """
+        if result["code"] != 100:
+            return True  # 没有文本行，无法判断，等下一次
+        width, height = size
+        whole = {(0, 0), (width, 0), (width, height), (0, height)}
+        lines = result["data"]
+        points = [tuple(p) for p in (lines[0].get("box") or [])] if len(lines) == 1 else None
+        if points is not None and (all(p == (0, 0) for p in points) or set(points) <= whole):
+            self._rec_only_verified = True
+            return True
+        print(f"⚠️ {self.ENGINE_NAME} 单行识别通道仍在运行检测（返回 {len(lines)} 个文本行及检测框），改用完整流程")
+        self._disable_rec_only()
+        return False
+
+    def _recognize_lines(self, crops):
+        """
+        通过仅识别通道识别单行截图
+        :param crops: 单行区域截图列表
+        :return: 与输入顺序一致的列表，元素为识别文本；失败或置信度低于 OCR_REC_ONLY_MIN_SCORE 时为 None
+        """
+        try:
+            pool = self._get_rec_pool()
+        except Exception as e:
+            print(f"⚠️ 单行识别通道启动失败，改用完整流程: {e}")
+            self._disable_rec_only()
+            return [None] * len(crops)
+
+        min_score = getattr(Config, 'OCR_REC_ONLY_MIN_SCORE', 0.5)
+
+        def run(crop):
+            image_bytes, _ = ImageUtils.encode_for_engine(crop)
+            result = pool.runBytes(image_bytes)
+            if result["code"] == 101:
+                return ""
+            if result["code"] != 100:
+                return None
+            if not self._rec_only_verified and not self._verify_rec_only(result, crop.size):
+                return None
+            lines = [line for line in result["data"] if line.get("text", "").strip()]
+            if lines and min(line.get("score", 1.0) for line in lines) < min_score:
+                return None
+            return " ".join(line["text"].strip() for line in lines)
+
+        try:
+            return pool.map(run, crops)
+        except Exception as e:
+            print(f"OCR识别异常: {e}")
+            return [None] * len(crops)
+
+    def close(self):
+        """关闭引擎进程池与已启动的其他语言引擎，并释放 CPU 份额"""
+        if hasattr(self, '_languages'):
+            self._languages.close_all()
+        if getattr(self, '_rec_pool', None):
+            try:
+                self._rec_pool.exit()
+            except:
+                pass
+            self._rec_pool = None
+        if hasattr(self, '_rec_budget_name'):
+            get_cpu_budget().unregister_engine(self._rec_budget_name)
+        if hasattr(self, '_budget_name'):
+            get_cpu_budget().unregister_engine(self._budget_name)
+        if hasattr(self, 'ocr') and self.ocr:
+            try:
+                self.ocr.exit()
+            except:
+                pass
+            self.ocr = None
+
+    def __del__(self):
+        """析构函数，关闭OCR引擎"""
+        self.close()
@@ -1,14 +1,16 @@
 """
 统一的OCR引擎管理系统
-支持无缝切换：PaddleOCR（优化版）、阿里云OCR、RapidOCR
+支持无缝切换：PaddleOCR（优化版）、阿里云OCR、RapidOCR、原生ONNX引擎、远程PaddleOCR服务器集群
 
 使用方式：
     manager = OCREngineManager()
-    manager.set_engine('paddle')  # 或 'aliyun', 'rapid'
+    manager.set_engine('paddle')  # 或 'aliyun', 'rapid', 'onnx', 'remote'
     result = manager.recognize_image(image)
 """
 
-import os
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional, List, Dict, Tuple
 from enum import Enum
 from PIL import Image
@@ -17,7 +19,10 @@ from PIL import Image
 
 # 延迟导入各引擎（提高启动速度）
 # from ocr_engine_aliyun_new import AliyunOCRNewEngine  # 改为按需导入
-from config import Config, OCRRect, get_resource_path
+from config import Config, OCRRect
+from utils import FileUtils, ImageUtils
+from ocr_result import OCRResult, is_failure
+from ocr_batch import iter_batch_results
 
 
 class EngineType(Enum):
@@ -26,6 +31,8 @@ class EngineType(Enum):
     PADDLE = "paddle"      # PaddleOCR
     RAPID = "rapid"        # RapidOCR
     DEEPSEEK = "deepseek"  # DeepSeek OCR
+    ONNX = "onnx"          # 原生 ONNX Runtime（进程内）
+    REMOTE = "remote"      # 远程 PaddleOCR-json 服务器集群
 
 
 class EngineInfo:
@@ -80,6 +87,22 @@ class OCREngineManager:
             True,   # 在线服务
             False  # 根据实际安装情况
         ),
+        EngineType.ONNX: EngineInfo(
+            "ONNX Runtime（进程内原生版）",
+            "进程内运行PP-OCR的ONNX模型，无需子进程与wine，Linux下启动最快",
+            "极快",
+            "高",
+            False,  # 本地运行
+            False  # 根据实际安装情况
+        ),
+        EngineType.REMOTE: EngineInfo(
+            "PaddleOCR（远程服务器集群）",
+            "多台PaddleOCR-json套接字服务器负载均衡，故障服务器自动摘除与恢复",
+            "极快",
+            "极高",
+            True,   # 依赖网络
+            False  # 需要配置服务器地址后才可用
+        ),
     }
     
     def __init__(self, engine_type: str = None):
@@ -90,6 +113,11 @@ class OCREngineManager:
         self.current_engine = None
         self.current_engine_type = None
         self._engine_instances = {}  # 缓存引擎实例
+        self._engine_futures = {}  # 引擎启动任务 {EngineType: Future}，结果为引擎实例（失败时为 None）
+        self._init_lock = threading.Lock()
+        self._init_executor = None  # 并行启动引擎的线程池（首次需要时创建）
+        self._router = None  # 自适应引擎路由（首次使用时创建）
+        self._blank_filter = None  # 空白区域预过滤（首次使用时创建）
         
         # 检查各引擎的可用性
         self._check_engine_availability()
@@ -106,8 +134,12 @@ class OCREngineManager:
                 # 设计原则：
                 #   1. 本地引擎优先（无需网络、无需密钥、响应快）
                 #   2. 在线服务其次（需要配置、依赖网络）
-                # 优先级：paddle（极高精度） > rapid（高速度） > aliyun（在线） > deepseek（在线）
-                for et in ['paddle', 'rapid', 'aliyun', 'deepseek']:
+                # 优先级：paddle（极高精度） > rapid（高速度） > onnx（进程内） > remote（自建服务器） > aliyun（在线） > deepseek（在线）
+                #         Linux 下 exe 引擎需经 wine 运行，onnx 优先
+                local_order = ['paddle', 'rapid', 'onnx']
+                if sys.platform.startswith('linux'):
+                    local_order = ['onnx', 'paddle', 'rapid']
+                for et in local_order + ['remote', 'aliyun', 'deepseek']:
                     if self.is_engine_available(et):
                         engine_type = et
                         break
@@ -117,103 +149,107 @@ class OCREngineManager:
             print(f"正在初始化默认引擎: {engine_type}...")
             self.set_engine(engine_type)
             
-    def init_background_engines(self):
+    def init_background_engines(self, on_ready=None, wait=True) -> Dict[str, Future]:
         """
-        后台静默初始化其他引擎（按顺序：Paddle -> Rapid -> Aliyun -> DeepSeek）
-        优先初始化本地引擎（启动快），然后初始化在线服务
+        后台初始化其他可用引擎（Config.OCR_ENGINE_INIT_MODE）
+          - parallel：所有引擎同时启动（最多 OCR_ENGINE_INIT_WORKERS 个），互不等待，每个引擎启动完成后立即可用
+          - lazy：不启动任何引擎，首次 set_engine 时才启动（未使用的引擎不占内存）
         注意：set_engine已经初始化了当前引擎，这里只需要初始化剩下的
+        :param on_ready: 每个引擎启动结束时的回调 f(引擎类型, 是否成功)（在启动线程中调用）
+        :param wait: 是否等待全部启动结束
+        :return: {引擎类型: Future}，Future 的结果为引擎实例（失败时为 None）
         """
-        init_order = [EngineType.PADDLE, EngineType.RAPID, EngineType.ALIYUN, EngineType.DEEPSEEK]
-        
+        if getattr(Config, 'OCR_ENGINE_INIT_MODE', 'parallel') == 'lazy':
+            return {}
+
+        # 本地引擎排在前面（先提交先启动），然后是在线服务
+        init_order = [EngineType.PADDLE, EngineType.RAPID, EngineType.ONNX, EngineType.REMOTE,
+                      EngineType.ALIYUN, EngineType.DEEPSEEK]
+        futures = {}
         for et in init_order:
-            # 跳过已经初始化的当前引擎
-            if self.current_engine_type == et:
-                continue
-                
-            # 检查可用性
-            if not self.ENGINE_INFO[et].available:
+            if self.current_engine_type == et or not self.ENGINE_INFO[et].available:
                 continue
-                
-            # 检查是否已初始化
-            if et in self._engine_instances:
-                continue
-                
-            try:
+            if et not in self._engine_instances:
                 print(f"正在后台初始化引擎: {et.value}...")
-                instance = self._create_engine(et)
-                if instance:
-                    self._engine_instances[et] = instance
-                    print(f"✓ {self.ENGINE_INFO[et].name} 初始化完成")
-            except Exception as e:
-                print(f"❌ {self.ENGINE_INFO[et].name} 初始化失败: {e}")
-    
-    @staticmethod
-    def _check_engine_availability():
-        """检查各引擎的可用性"""
-        # 检查阿里云OCR（检查SDK、密钥配置和启用开关）
-        try:
-            from alibabacloud_ocr_api20210707.client import Client as OcrClient
-            
-            # 调试输出：显示当前配置状态
-            enabled = getattr(Config, 'ALIYUN_ENABLED', False)
-            has_key_id = bool(getattr(Config, 'ALIYUN_ACCESS_KEY_ID', ''))
-            has_key_secret = bool(getattr(Config, 'ALIYUN_ACCESS_KEY_SECRET', ''))
-            
-            print(f"[阿里云OCR] 配置检查: ENABLED={enabled}, 有KEY_ID={has_key_id}, 有KEY_SECRET={has_key_secret}")
-            
-            # 必须同时满足：1. ENABLED=True, 2. 有密钥, 3. SDK可导入
-            if enabled and has_key_id and has_key_secret:
-                OCREngineManager.ENGINE_INFO[EngineType.ALIYUN].available = True
-                print(f"[阿里云OCR] ✓ 可用")
-            else:
-                print(f"[阿里云OCR] ✗ 不可用（未满足条件）")
-        except ImportError:
-            print(f"[阿里云OCR] ✗ 不可用（SDK未安装）")
-        
-        # 检查 PaddleOCR（C++ 引擎）
-        enabled = getattr(Config, 'PADDLE_ENABLED', True)
-        paddle_exe = get_resource_path(os.path.join("models", "PaddleOCR-json", "PaddleOCR-json_v1.4.1", "PaddleOCR-json.exe"))
-        has_exe = os.path.exists(paddle_exe)
-        
-        print(f"[PaddleOCR] 配置检查: ENABLED={enabled}, 可执行文件存在={has_exe}")
-        
-        if enabled and has_exe:
-            OCREngineManager.ENGINE_INFO[EngineType.PADDLE].available = True
-            print(f"[PaddleOCR] ✓ 可用")
-        else:
-            print(f"[PaddleOCR] ✗ 不可用（未满足条件）")
-        
-        # 检查 RapidOCR（C++ 引擎）
-        enabled = getattr(Config, 'RAPID_ENABLED', True)
-        rapid_exe = get_resource_path(os.path.join("models", "RapidOCR-json", "RapidOCR-json_v0.2.0", "RapidOCR-json.exe"))
-        has_exe = os.path.exists(rapid_exe)
-        
-        print(f"[RapidOCR] 配置检查: ENABLED={enabled}, 可执行文件存在={has_exe}")
-        
-        if enabled and has_exe:
-            OCREngineManager.ENGINE_INFO[EngineType.RAPID].available = True
-            print(f"[RapidOCR] ✓ 可用")
-        else:
-            print(f"[RapidOCR] ✗ 不可用（未满足条件）")
-        
-        # 检查DeepSeek OCR（检查SDK、API Key配置和启用开关）
+            futures[et.value] = self.start_engine(et.value, on_ready)
+
+        if wait:
+            for future in futures.values():
+                future.exception()
+        return futures
+
+    def start_engine(self, engine_type: str, on_ready=None) -> Future:
+        """
+        在后台启动引擎（已启动或正在启动时返回同一个任务，不会重复创建）
+        :param engine_type: 引擎类型
+        :param on_ready: 启动结束时的回调 f(引擎类型, 是否成功)
+        :return: Future，结果为引擎实例（失败时为 None）
+        """
+        engine = EngineType(engine_type)
+        with self._init_lock:
+            future = self._engine_futures.get(engine)
+            if future is None:
+                if self._init_executor is None:
+                    self._init_executor = ThreadPoolExecutor(
+                        max_workers=max(1, getattr(Config, 'OCR_ENGINE_INIT_WORKERS', 4)),
+                        thread_name_prefix="OCREngineInit")
+                future = self._init_executor.submit(self._start_engine, engine)
+                self._engine_futures[engine] = future
+        if on_ready is not None:
+            future.add_done_callback(lambda f: on_ready(engine.value, f.result() is not None))
+        return future
+
+    def _start_engine(self, engine: EngineType):
+        """启动线程中创建引擎实例；失败时清除任务，之后可以重试"""
+        instance = None
         try:
-            from openai import OpenAI
-            
-            # 调试输出：显示当前配置状态
-            enabled = getattr(Config, 'DEEPSEEK_ENABLED', False)
-            has_api_key = bool(getattr(Config, 'DEEPSEEK_API_KEY', ''))
-            
-            print(f"[DeepSeek OCR] 配置检查: ENABLED={enabled}, 有API_KEY={has_api_key}")
-            
-            # 必须同时满足：1. ENABLED=True, 2. 有API Key, 3. SDK可导入
-            if enabled and has_api_key:
-                OCREngineManager.ENGINE_INFO[EngineType.DEEPSEEK].available = True
-                print(f"[DeepSeek OCR] ✓ 可用")
+            instance = self._create_engine(engine)
+        except Exception as e:
+            print(f"❌ {self.ENGINE_INFO[engine].name} 初始化失败: {e}")
+        with self._init_lock:
+            if instance:
+                self._engine_instances[engine] = instance
             else:
-                print(f"[DeepSeek OCR] ✗ 不可用（未满足条件）")
-        except ImportError:
-            print(f"[DeepSeek OCR] ✗ 不可用（SDK未安装）")
+                self._engine_futures.pop(engine, None)
+        if instance:
+            print(f"✓ {self.ENGINE_INFO[engine].name} 初始化完成")
+        return instance
+
+    def get_engine_states(self) -> Dict[str, str]:
+        """
+        各可用引擎的启动状态
+        :return: {引擎类型: 'ready' / 'starting' / 'idle'}（idle=未启动或启动失败）
+        """
+        states = {}
+        with self._init_lock:
+            for engine, info in self.ENGINE_INFO.items():
+                if not info.available:
+                    continue
+                if engine in self._engine_instances:
+                    states[engine.value] = 'ready'
+                elif engine in self._engine_futures:
+                    states[engine.value] = 'starting'
+                else:
+                    states[engine.value] = 'idle'
+        return states
+
+    @staticmethod
+    def _check_engine_availability():
+        """
+        检查各引擎的可用性（只查找SDK不导入，结果缓存到磁盘并在后台刷新，见 ocr_availability.py）
+        """
+        from ocr_availability import check_engine_availability
+        OCREngineManager._apply_availability(
+            check_engine_availability(on_refresh=OCREngineManager._apply_availability))
+
+    @staticmethod
+    def _apply_availability(results):
+        """
+        更新引擎信息表中的可用性
+        :param results: {引擎类型: 是否可用}
+        """
+        for engine_type, info in OCREngineManager.ENGINE_INFO.items():
+            info.available = bool(results.get(engine_type.value, False))
     
     def is_engine_available(self, engine_type: str) -> bool:
         """
@@ -260,18 +296,14 @@ class OCREngineManager:
             print(f"❌ 引擎 {engine.value} 不可用")
             return False
         
-        # 从缓存中获取或创建引擎实例
-        if engine not in self._engine_instances:
-            try:
-                instance = self._create_engine(engine)
-                if not instance:
-                    return False
-                self._engine_instances[engine] = instance
-            except Exception as e:
-                print(f"❌ 初始化引擎失败: {e}")
+        # 从缓存中获取，或启动引擎（正在后台启动时等待其完成，不重复创建）
+        instance = self._engine_instances.get(engine)
+        if instance is None:
+            instance = self.start_engine(engine_type).result()
+            if not instance:
                 return False
         
-        self.current_engine = self._engine_instances[engine]
+        self.current_engine = instance
         self.current_engine_type = engine
         
         info = self.ENGINE_INFO[engine]
@@ -283,10 +315,11 @@ class OCREngineManager:
         return True
     
     @staticmethod
-    def _create_engine(engine_type: EngineType):
+    def _create_engine(engine_type: EngineType, profile: str = None):
         """
         创建引擎实例（延迟导入，提高性能）
         :param engine_type: 引擎类型
+        :param profile: 本地引擎性能档位 fast / balanced / accurate，None表示使用 Config.OCR_PROFILE
         :return: 引擎实例
         """
         if engine_type == EngineType.ALIYUN:
@@ -295,26 +328,58 @@ class OCREngineManager:
             return AliyunOCRNewEngine()
         
         elif engine_type == EngineType.PADDLE:
+            engine = OCREngineManager._create_daemon_engine('paddle', profile)
+            if engine:
+                return engine
             from ocr_engine_paddle import PaddleOCREngine
-            # 使用高性能 PaddleOCR-json 引擎（C++版本）
-            # 配置参数已内置于引擎中，无需传递
-            return PaddleOCREngine()
+            # 使用高性能 PaddleOCR-json 引擎（C++版本），启动参数由性能档位决定
+            return PaddleOCREngine(profile=profile)
         
         elif engine_type == EngineType.RAPID:
+            engine = OCREngineManager._create_daemon_engine('rapid', profile)
+            if engine:
+                return engine
             from ocr_engine_rapid import RapidOCREngine
-            return RapidOCREngine()
+            return RapidOCREngine(profile=profile)
         
         elif engine_type == EngineType.DEEPSEEK:
             from ocr_engine_deepseek import DeepSeekOCREngine
             return DeepSeekOCREngine()
         
+        elif engine_type == EngineType.ONNX:
+            from ocr_engine_onnx import OnnxOCREngine
+            return OnnxOCREngine(profile=profile)
+        
+        elif engine_type == EngineType.REMOTE:
+            from ocr_engine_remote import RemoteOCREngine
+            return RemoteOCREngine(profile=profile)
+        
         return None
     
+    @staticmethod
+    def _create_daemon_engine(engine_key: str, profile: str = None):
+        """
+        启用 OCR_DAEMON_ENABLED 时通过守护进程使用本地引擎（守护进程未运行时自动启动）
+        :param engine_key: 'paddle' / 'rapid'
+        :param profile: 性能档位
+        :return: 引擎实例；未启用或守护进程不可用时返回 None（改为在本进程内启动引擎）
+        """
+        if not getattr(Config, 'OCR_DAEMON_ENABLED', False):
+            return None
+        try:
+            from ocr_engine_daemon import DaemonOCREngine
+            return DaemonOCREngine(engine_key, profile=profile)
+        except Exception as e:
+            print(f"⚠️ OCR守护进程不可用，改为在本进程内启动引擎: {e}")
+            return None
+    
     def is_ready(self) -> bool:
         """
-        检查当前引擎是否就绪
+        检查当前引擎是否就绪（启用路由时只要有一个参与路由的引擎就绪即可）
         :return: 是否就绪
         """
+        if self.get_router() is not None and self._routable_engines():
+            return True
         if not self.current_engine:
             return False
         return self.current_engine.is_ready()
@@ -322,16 +387,22 @@ class OCREngineManager:
     def recognize_image(self, image, **kwargs):
         """
         识别整张图片
-        :param image: PIL Image或numpy数组
+        :param image: PIL Image、numpy数组或图片文件路径
+                      （文件路径直接交给引擎读取/上传，不在Python中解码；PDF除外）
         :param kwargs: 引擎特定参数
-        :return: 识别结果（格式统一化）
+        :return: OCRResult（各引擎结果统一化，保留文本行坐标与置信度）；引擎未就绪或识别异常时为 None
         """
         if not self.is_ready():
             print("❌ 当前引擎未就绪")
             return None
         
         try:
-            result = self.current_engine.recognize_image(image, **kwargs)
+            # PDF需要先渲染为图片，需要判断页面方向时也要先读取；其他图片文件保持路径形式传给引擎
+            if isinstance(image, str) and (FileUtils.is_pdf_file(image)
+                                           or getattr(Config, 'OCR_PAGE_ORIENTATION', False)):
+                image = ImageUtils.load_image(image)
+            
+            result = self._dispatch('recognize_image', (image,), kwargs, failed=is_failure)
             return self._normalize_result(result)
         except Exception as e:
             print(f"❌ 识别失败: {e}")
@@ -350,14 +421,31 @@ class OCREngineManager:
             return ""
         
         try:
-            return self.current_engine.recognize_region(image, rect, **kwargs)
+            blank_filter = self.get_blank_filter()
+            if blank_filter is not None and blank_filter.split(image, [rect])[1]:
+                return ""
+            return self._dispatch('recognize_region', (image, rect), kwargs, failed=is_failure)
         except Exception as e:
             print(f"❌ 区域识别失败: {e}")
             return ""
     
+    def recognize_page(self, image, **kwargs):
+        """
+        整页识别一次，返回可按区域取文本的索引
+        :param image: PIL Image或图片文件路径
+        :param kwargs: 引擎特定参数
+        :return: PageOCRIndex；引擎未就绪、识别失败或结果不含文本行坐标时返回 None
+        """
+        result = self.recognize_image(image, **kwargs)
+        if result is None:
+            return None
+        return result.to_page_index()
+    
     def recognize_regions(self, image, rects: List[OCRRect], **kwargs) -> Dict[OCRRect, str]:
         """
         批量识别多个区域
+        OCR_REGION_MODE='page' 时整页识别一次再按位置分配文本（引擎不返回坐标时退回逐区域识别）；
+        逐区域识别时明显空白的区域直接返回 ""，不交给引擎
         :param image: PIL Image
         :param rects: OCRRect对象列表
         :param kwargs: 引擎特定参数
@@ -368,38 +456,192 @@ class OCREngineManager:
             return {}
         
         try:
-            return self.current_engine.recognize_regions(image, rects, **kwargs)
+            if getattr(Config, 'OCR_REGION_MODE', 'crop') == 'page' and rects:
+                index = self.recognize_page(image, **kwargs)
+                if index is not None:
+                    texts = index.join(rects, getattr(Config, 'OCR_PAGE_MIN_OVERLAP', 0.5))
+                    for rect, text in zip(rects, texts):
+                        rect.text = text
+                    return dict(zip(rects, texts))
+            kept, blank = self._split_blank(image, rects)
+            results = self._dispatch('recognize_regions', (image, kept), kwargs,
+                                     failed=lambda r: not r or is_failure(r)) if kept else {}
+            return self._merge_blank(rects, results, blank)
         except Exception as e:
             print(f"❌ 批量识别失败: {e}")
             return {}
     
-    def batch_recognize(self, image_rect_pairs: List[Tuple], **kwargs):
+    def batch_recognize(self, items, **kwargs):
         """
-        批量处理多个图片
-        :param image_rect_pairs: [(image, [rects]), ...] 列表
-        :param kwargs: 引擎特定参数
-        :return: 识别结果列表
+        批量处理多个图片（见 iter_batch_recognize）
+        :param items: [(image, [rects]), ...] 列表；image 可以是文件路径，也可以直接给出图片或路径（识别整图）
+        :param kwargs: chunk_size 及引擎特定参数
+        :return: 识别结果列表（与输入顺序一致）：有区域的页面为 {rect: text}，整图识别的页面为 OCRResult（失败为 None）
         """
         if not self.is_ready():
             print("❌ 当前引擎未就绪")
             return []
         
         try:
-            return self.current_engine.batch_recognize(image_rect_pairs, **kwargs)
+            return list(self.iter_batch_recognize(items, **kwargs))
         except Exception as e:
             print(f"❌ 批量处理失败: {e}")
             return []
     
+    def iter_batch_recognize(self, items, chunk_size=None, **kwargs):
+        """
+        流式批量识别：后台线程提前读取/解码后续图片，当前引擎按块批量识别（进程池、拼图、批量推理或并发API请求），
+        结果按输入顺序逐个产出
+        :param items: 输入项列表或生成器：图片、文件路径，或 (图片或路径, [rects]) 元组
+        :param chunk_size: 每次交给引擎的输入项数，None表示使用 Config.OCR_BATCH_CHUNK_SIZE
+        :param kwargs: 引擎特定参数
+        :return: 生成器，每项为 {rect: text}（有区域）或 OCRResult（整图识别，失败为 None）
+        """
+        if not self.is_ready():
+            print("❌ 当前引擎未就绪")
+            return
+        
+        def recognize_chunk(pairs):
+            # 空白区域不交给引擎；所有区域都空白的页面整页跳过（区域为空会被当作整图识别）
+            splits = [self._split_blank(image, rects) if rects else ([], []) for image, rects in pairs]
+            dispatch = [i for i, ((_, rects), (kept, _)) in enumerate(zip(pairs, splits)) if kept or not rects]
+            outputs = self._dispatch('batch_recognize', ([(pairs[i][0], splits[i][0]) for i in dispatch],), kwargs,
+                                     failed=lambda r: len(r) != len(dispatch) or is_failure(r)) if dispatch else []
+            results = [{} for _ in pairs]
+            for i, result in zip(dispatch, outputs):
+                results[i] = result
+            # 整图识别的页面统一为 OCRResult，区域识别的页面保持 {rect: text}
+            return [self._merge_blank(rects, result, blank) if rects else self._normalize_result(result)
+                    for (_, rects), (_, blank), result in zip(pairs, splits, results)]
+        
+        yield from iter_batch_results(
+            recognize_chunk, items,
+            chunk_size=chunk_size or getattr(Config, 'OCR_BATCH_CHUNK_SIZE', 8),
+            prefetch=getattr(Config, 'OCR_BATCH_PREFETCH', 2),
+        )
+    
+    def get_blank_filter(self):
+        """
+        空白区域预过滤器（Config.OCR_BLANK_FILTER_ENABLED）
+        :return: BlankCropFilter；未启用时返回 None
+        """
+        if not getattr(Config, 'OCR_BLANK_FILTER_ENABLED', True):
+            return None
+        if self._blank_filter is None:
+            from ocr_blank_filter import BlankCropFilter  # 按需导入（依赖numpy）
+            self._blank_filter = BlankCropFilter.from_config()
+        return self._blank_filter
+    
+    def get_blank_filter_stats(self) -> Dict:
+        """
+        空白区域预过滤的统计
+        :return: {"checked": 判断过的区域数, "skipped": 跳过的区域数, "skip_ratio": 跳过比例}；未启用时为空字典
+        """
+        blank_filter = self.get_blank_filter()
+        return blank_filter.stats() if blank_filter is not None else {}
+    
+    def _split_blank(self, image, rects):
+        """
+        分出明显空白、无需识别的区域
+        :return: (需要识别的区域列表, 空白区域列表)
+        """
+        blank_filter = self.get_blank_filter()
+        if blank_filter is None:
+            return list(rects), []
+        return blank_filter.split(image, rects)
+    
+    @staticmethod
+    def _merge_blank(rects, results, blank):
+        """
+        把空白区域（文本为 ""）并入识别结果
+        :param rects: 全部区域（决定结果顺序）
+        :param results: 引擎的识别结果 {rect: text}
+        :param blank: 空白区域列表
+        :return: {rect: text}
+        """
+        for rect in blank:
+            if hasattr(rect, 'text'):
+                rect.text = ""
+        blank = set(blank)
+        return {rect: results[rect] if rect in results else "" for rect in rects if rect in results or rect in blank}
+    
+    def supports_language(self) -> bool:
+        """当前引擎是否支持按语言路由（本地引擎）"""
+        return hasattr(self.current_engine, 'supported_languages')
+    
+    def get_supported_languages(self) -> Dict[str, str]:
+        """
+        当前引擎可用的识别语言
+        :return: {语言代码: 显示名称}；不支持按语言路由的引擎返回空字典
+        """
+        if not self.supports_language():
+            return {}
+        return self.current_engine.supported_languages()
+    
+    def _engine_kwargs(self, kwargs, engine=None):
+        """去掉引擎（默认为当前引擎）不支持的 lang 参数（在线引擎按自身设置识别）"""
+        engine = engine or self.current_engine
+        if 'lang' in kwargs and not hasattr(engine, 'supported_languages'):
+            kwargs = {k: v for k, v in kwargs.items() if k != 'lang'}
+        return kwargs
+    
+    def _dispatch(self, method, args, kwargs, failed=None):
+        """
+        调用引擎方法：启用路由时交给路由器选择引擎（失败自动切换），否则交给当前引擎
+        :param method: 引擎方法名
+        :param args: 位置参数
+        :param kwargs: 引擎特定参数
+        :param failed: 判断结果是否表示失败的函数（见 EngineRouter.call；引擎内部捕获的错误见 ocr_result.is_failure）
+        :return: 引擎方法的返回值
+        """
+        router = self.get_router()
+        if router is None:
+            return getattr(self.current_engine, method)(*args, **self._engine_kwargs(kwargs))
+        return router.call(lambda engine: getattr(engine, method)(*args, **self._engine_kwargs(kwargs, engine)),
+                           failed)
+    
+    def get_router(self):
+        """
+        自适应引擎路由（Config.OCR_ROUTING_ENABLED）
+        :return: EngineRouter；未启用时返回 None
+        """
+        if not getattr(Config, 'OCR_ROUTING_ENABLED', False):
+            return None
+        with self._init_lock:
+            if self._router is None:
+                from ocr_router import EngineRouter
+                self._router = EngineRouter.from_config(self._routable_engines)
+            return self._router
+    
+    def _routable_engines(self):
+        """
+        参与路由的引擎：已启动且就绪的引擎（lazy 模式下只有用过的引擎），可由 Config.OCR_ROUTING_ENGINES 限定
+        :return: [(引擎类型, 引擎实例, 是否在线服务)]
+        """
+        allowed = getattr(Config, 'OCR_ROUTING_ENGINES', [])
+        with self._init_lock:
+            instances = list(self._engine_instances.items())
+        return [(et.value, instance, self.ENGINE_INFO[et].is_online) for et, instance in instances
+                if (not allowed or et.value in allowed) and instance.is_ready()]
+    
+    def get_routing_metrics(self) -> Dict:
+        """
+        路由决策与各引擎状态（EWMA延迟、错误率、在途请求数、冷却时间），见 EngineRouter.metrics
+        :return: 指标字典；未启用路由时为空字典
+        """
+        router = self.get_router()
+        return router.metrics() if router is not None else {}
+    
     @staticmethod
     def _normalize_result(result):
         """
         统一化识别结果格式
-        注：各引擎返回格式差异大，此处保持原格式，由调用者处理
-        :param result: 原始识别结果
-        :return: 统一化结果
+        :param result: 原始识别结果（OCRResult、引擎原始返回、字典列表或文本）
+        :return: OCRResult；原始结果为 None 时返回 None
         """
-        # 保持原格式，供上层处理
-        return result
+        if result is None:
+            return None
+        return OCRResult.from_any(result)
     
     def get_current_engine_info(self) -> Optional[Dict]:
         """
@@ -440,8 +682,32 @@ class OCREngineManager:
             print(f"\n当前引擎: {self.ENGINE_INFO[self.current_engine_type].name}")
             print(f"引擎就绪: {'✓ 是' if self.is_ready() else '✗ 否'}")
         
+        metrics = self.get_routing_metrics()
+        if metrics:
+            print(f"\n自适应路由（策略 {metrics['policy']}）: 故障切换 {metrics['failovers']} 次，"
+                  f"全部失败 {metrics['exhausted']} 次")
+            for engine, stats in metrics["engines"].items():
+                latency = f"{stats['latency_ms']:.0f}ms" if stats['latency_ms'] is not None else "-"
+                cooling = f"，冷却 {stats['cooling_down']:.0f} 秒" if stats['cooling_down'] else ""
+                if stats.get('abandoned'):
+                    cooling += f"，超时未结束 {stats['abandoned']}"
+                print(f"  {engine}: 首选 {metrics['decisions'].get(engine, 0)} 次，延迟 {latency}，"
+                      f"错误率 {stats['error_rate']:.0%}，在途 {stats['in_flight']}{cooling}")
+        
+        print()
+        from ocr_cpu_budget import get_cpu_budget
+        get_cpu_budget().print_allocation()
         print("="*60)
     
+    @staticmethod
+    def get_cpu_allocation() -> Dict:
+        """
+        获取CPU预算分配情况（各本地引擎进程池的进程数与线程数）
+        :return: 分配信息字典，见 CPUBudget.allocation
+        """
+        from ocr_cpu_budget import get_cpu_budget
+        return get_cpu_budget().allocation()
+    
     def print_available_engines(self):
         """打印所有可用引擎"""
         available = self.get_available_engines()
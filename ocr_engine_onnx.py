@@ -0,0 +1,463 @@
+"""
+原生 ONNX Runtime OCR 引擎
+在当前进程内直接运行 PP-OCR 的 ONNX 模型（检测 / 方向分类 / 识别），不需要 Windows exe 与 wine，
+也没有子进程启动与管道传输开销。前后处理全部用 NumPy 实现（不依赖 OpenCV）：
+  - 检测：按档位的边长限制缩放（边长取32的倍数）→ DB 概率图 → 二值化 → 连通域 → 外接矩形扩张（unclip）
+  - 方向分类：48×192 输入，判断文本行是否倒置
+  - 识别：高度缩放到48，按补齐后的宽度分桶，同一桶内的文本行拼成一个批量张量推理 → CTC 贪心解码
+    （一次 recognize_regions / batch_recognize 的所有区域、所有页面的文本行一起分桶）
+模型文件与 RapidOCR-json 共用（models/RapidOCR-json/.../models），识别模型需放入同一目录；
+Config.OCR_MODEL_SET='int8' 时优先使用 ocr_quantize.py 生成的量化模型（见 ocr_model_sets）。
+"""
+
+import os
+import math
+import threading
+import numpy as np
+from PIL import Image
+from config import Config
+from ocr_profiles import get_profile
+from ocr_cpu_budget import get_cpu_budget
+from ocr_result import OCRResult, OCRError
+from utils import ImageUtils
+from ocr_batch import prepare_batch_item
+from ocr_model_sets import get_model_paths
+
+# 检测模型的归一化参数（BGR 顺序输入）
+DET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+DET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+REC_HEIGHT = 48
+CLS_SHAPE = (48, 192)
+
+
+def _to_bgr_array(image):
+    """PIL Image -> BGR float32 数组（模型按 OpenCV 的 BGR 顺序训练）"""
+    return np.asarray(image.convert('RGB'), dtype=np.float32)[..., ::-1]
+
+
+def _label_runs(bitmap):
+    """
+    二值图的 8 连通域（按行程编码合并，避免逐像素遍历）
+    :param bitmap: (H, W) 布尔数组
+    :return: (rows, starts, ends, labels)：每个行程所在行、起止列（end 不含）与所属连通域编号
+    """
+    padded = np.zeros((bitmap.shape[0], bitmap.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = bitmap
+    diff = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(diff == 1)
+    _, ends = np.nonzero(diff == -1)
+    count = len(rows)
+    if not count:
+        return rows, starts, ends, np.zeros(0, dtype=np.int64)
+
+    parent = list(range(count))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # 相邻两行的行程两两比较（双指针），列区间相交或对角相邻即连通
+    row_bounds = np.searchsorted(rows, np.arange(bitmap.shape[0] + 1))
+    starts_list, ends_list = starts.tolist(), ends.tolist()
+    for r in range(1, bitmap.shape[0]):
+        a, a_end = int(row_bounds[r - 1]), int(row_bounds[r])
+        b, b_end = a_end, int(row_bounds[r + 1])
+        while a < a_end and b < b_end:
+            if starts_list[a] <= ends_list[b] and starts_list[b] <= ends_list[a]:
+                ra, rb = find(a), find(b)
+                if ra != rb:
+                    parent[rb] = ra
+            if ends_list[a] < ends_list[b]:
+                a += 1
+            else:
+                b += 1
+
+    roots = np.array([find(i) for i in range(count)])
+    _, labels = np.unique(roots, return_inverse=True)
+    return rows, starts, ends, labels
+
+
+class OnnxOCREngine:
+    """进程内 ONNX Runtime OCR 引擎（PP-OCRv3 检测 + 方向分类 + 识别）"""
+
+    ENGINE_NAME = "ONNX Runtime"
+
+    def __init__(self, profile=None, model_set=None):
+        """
+        初始化引擎（加载 ONNX 模型）
+        :param profile: 性能档位 fast / balanced / accurate，None表示使用 Config.OCR_PROFILE
+        :param model_set: 模型集 fp32 / int8，None表示使用 Config.OCR_MODEL_SET
+        """
+        try:
+            import onnxruntime
+        except ImportError:
+            raise Exception("未安装 onnxruntime（pip install onnxruntime）")
+        self._ort = onnxruntime
+
+        self.model_set = model_set or getattr(Config, 'OCR_MODEL_SET', 'fp32')
+        self.paths = get_model_paths(self.model_set)
+        missing = [key for key in ("det", "rec", "keys") if self.paths[key] is None]
+        if missing:
+            raise Exception(f"缺少 ONNX 模型文件: {', '.join(missing)}")
+
+        print(f"正在初始化 {self.ENGINE_NAME} 引擎...")
+        self.profile = profile or getattr(Config, 'OCR_PROFILE', 'balanced')
+        self.params = get_profile(self.profile)
+        self.characters = self._load_characters(self.paths["keys"])
+        self.rec_batch_size = getattr(Config, 'ONNX_REC_BATCH_SIZE', 32) or self.params["rec_batch_num"]
+        self.rec_buckets = sorted(getattr(Config, 'ONNX_REC_BUCKETS', (128, 192, 256, 320, 384, 480, 640, 800, 960, 1280)))
+
+        # 进程内推理：只占一个"进程"份额，线程数由全局 CPU 预算分配（首次推理时才参与划分）
+        self._budget_name = f"{self.ENGINE_NAME}[{self.profile}]@{id(self):x}"
+        share = get_cpu_budget().register_engine(
+            self._budget_name,
+            desired_threads=self.params["threads"],
+            max_processes=1,
+            callback=self._apply_cpu_share,
+            active=False,
+        )
+        self._cpu_active = False
+        self._session_lock = threading.Lock()
+        try:
+            self._load_sessions(share["threads"])
+        except Exception as e:
+            get_cpu_budget().unregister_engine(self._budget_name)
+            raise Exception(f"{self.ENGINE_NAME} 引擎初始化失败: {e}")
+
+        print(f"✓ {self.ENGINE_NAME} 引擎初始化成功")
+        print("  - 模式: 进程内推理（无子进程、无需 wine）")
+        print(f"  - 性能档位: {self.profile}（{share['threads']} 线程）")
+        print(f"  - 方向分类: {'开启' if self.cls_session is not None else '关闭'}")
+        print("  - 模型: " + ", ".join(os.path.basename(self.paths[k]) for k in ("det", "cls", "rec") if self.paths[k]))
+        print(f"  - 批量识别: 每批最多 {self.rec_batch_size} 行，宽度分桶 {self.rec_buckets}")
+
+    # ---- 模型加载 ----
+    @staticmethod
+    def _load_characters(keys_path):
+        """识别字典：下标0为CTC空白符，末尾追加空格"""
+        with open(keys_path, 'r', encoding='utf-8') as f:
+            chars = [line.rstrip('\r\n') for line in f]
+        return ['blank'] + chars + [' ']
+
+    def _create_session(self, path, threads):
+        options = self._ort.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = self._ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        return self._ort.InferenceSession(path, sess_options=options, providers=['CPUExecutionProvider'])
+
+    def _load_sessions(self, threads):
+        """按线程数创建推理会话（会话的线程数在创建时固定）"""
+        with self._session_lock:
+            self.threads = threads
+            self.det_session = self._create_session(self.paths["det"], threads)
+            self.rec_session = self._create_session(self.paths["rec"], threads)
+            self.cls_session = None
+            if self.params["angle_cls"] and self.paths["cls"]:
+                self.cls_session = self._create_session(self.paths["cls"], threads)
+
+    def _apply_cpu_share(self, share):
+        """CPU 预算变化时按新的线程数重建会话"""
+        if share["threads"] != getattr(self, 'threads', None):
+            self._load_sessions(share["threads"])
+            print(f"{self.ENGINE_NAME} CPU 份额调整: {share['threads']} 线程")
+
+    def _run_session(self, session, array):
+        if not self._cpu_active:
+            self._cpu_active = True
+            get_cpu_budget().activate_engine(self._budget_name)
+        return session.run(None, {session.get_inputs()[0].name: array})[0]
+
+    # ---- 检测 ----
+    def _det_input(self, image):
+        """
+        检测模型输入：按档位的边长限制缩放（边长取32的倍数）并归一化
+        :param image: PIL Image（RGB）
+        :return: ((1, 3, H, W) 张量, 缩放后宽度, 缩放后高度)
+        """
+        width, height = image.size
+        limit = self.params["limit_side_len"]
+        ratio = min(1.0, limit / max(width, height))
+        resize_w = max(32, int(round(width * ratio / 32)) * 32)
+        resize_h = max(32, int(round(height * ratio / 32)) * 32)
+
+        data = _to_bgr_array(image.resize((resize_w, resize_h), Image.BILINEAR))
+        data = ((data / 255.0 - DET_MEAN) / DET_STD).transpose(2, 0, 1)[None].astype(np.float32)
+        return data, resize_w, resize_h
+
+    def _detect(self, image):
+        """
+        文本检测
+        :param image: PIL Image（RGB）
+        :return: [(x1, y1, x2, y2), ...] 按阅读顺序排列的文本框
+        """
+        width, height = image.size
+        data, resize_w, resize_h = self._det_input(image)
+        prob = self._run_session(self.det_session, data)[0, 0]
+
+        boxes = self._db_postprocess(prob, resize_w / width, resize_h / height, width, height)
+        return sorted(boxes, key=lambda b: (b[1] // 10, b[0]))
+
+    def _db_postprocess(self, prob, ratio_w, ratio_h, width, height, min_size=3):
+        """DB 后处理：二值化 → 连通域 → 外接矩形（过滤低分框）→ 按 unclip_ratio 扩张 → 映射回原图坐标"""
+        rows, starts, ends, labels = _label_runs(prob > self.params["det_db_thresh"])
+        if not len(labels):
+            return []
+
+        count = labels.max() + 1
+        # 连通域内概率之和：每行的前缀和相减得到行程之和
+        cumsum = np.concatenate([np.zeros((prob.shape[0], 1), dtype=np.float32), np.cumsum(prob, axis=1)], axis=1)
+        run_sums = cumsum[rows, ends] - cumsum[rows, starts]
+        areas = np.bincount(labels, weights=ends - starts, minlength=count)
+        scores = np.bincount(labels, weights=run_sums, minlength=count) / np.maximum(areas, 1)
+
+        x1 = np.full(count, prob.shape[1]); np.minimum.at(x1, labels, starts)
+        x2 = np.zeros(count, dtype=np.int64); np.maximum.at(x2, labels, ends)
+        y1 = np.full(count, prob.shape[0]); np.minimum.at(y1, labels, rows)
+        y2 = np.zeros(count, dtype=np.int64); np.maximum.at(y2, labels, rows + 1)
+
+        unclip_ratio = self.params["det_db_unclip_ratio"]
+        box_thresh = self.params["det_db_box_thresh"]
+        boxes = []
+        for i in range(count):
+            w, h = x2[i] - x1[i], y2[i] - y1[i]
+            if min(w, h) < min_size or scores[i] < box_thresh:
+                continue
+            # 矩形按多边形 unclip 的公式扩张：distance = 面积 × ratio / 周长
+            d = w * h * unclip_ratio / (2 * (w + h))
+            if min(w, h) + 2 * d < min_size + 2:
+                continue
+            boxes.append((
+                max(0, int((x1[i] - d) / ratio_w)),
+                max(0, int((y1[i] - d) / ratio_h)),
+                min(width, int(math.ceil((x2[i] + d) / ratio_w))),
+                min(height, int(math.ceil((y2[i] + d) / ratio_h))),
+            ))
+        return boxes
+
+    # ---- 方向分类 ----
+    @staticmethod
+    def _cls_input(crops):
+        """方向分类模型输入：(N, 3, 48, 192) 张量（等比缩放到高度48，右侧补零）"""
+        cls_h, cls_w = CLS_SHAPE
+        batch = np.zeros((len(crops), 3, cls_h, cls_w), dtype=np.float32)
+        for i, crop in enumerate(crops):
+            w = max(1, min(cls_w, int(math.ceil(cls_h * crop.width / max(1, crop.height)))))
+            data = _to_bgr_array(crop.resize((w, cls_h), Image.BILINEAR))
+            batch[i, :, :, :w] = ((data / 255.0 - 0.5) / 0.5).transpose(2, 0, 1)
+        return batch
+
+    def _classify(self, crops):
+        """把倒置（180°）的文本行转正"""
+        if self.cls_session is None or not crops:
+            return crops
+        probs = self._run_session(self.cls_session, self._cls_input(crops))
+        return [crop.rotate(180) if prob.argmax() == 1 and prob.max() > 0.9 else crop
+                for crop, prob in zip(crops, probs)]
+
+    # ---- 识别 ----
+    def _bucket_width(self, width):
+        """文本行补齐后的宽度：不小于该宽度的最小分桶边界，超出最大边界时按最大边界的整数倍补齐"""
+        for boundary in self.rec_buckets:
+            if width <= boundary:
+                return boundary
+        step = self.rec_buckets[-1]
+        return int(math.ceil(width / step)) * step
+
+    def _rec_batches(self, crops):
+        """
+        识别模型输入：按补齐后的宽度分桶，每个桶按 rec_batch_size 切分为批量张量
+        :param crops: PIL Image 列表（RGB）
+        :return: 生成 (文本行下标列表, (N, 3, 48, W) 张量)
+        """
+        widths = [max(1, int(math.ceil(REC_HEIGHT * crop.width / max(1, crop.height)))) for crop in crops]
+        buckets = {}
+        for i in sorted(range(len(crops)), key=widths.__getitem__):
+            buckets.setdefault(self._bucket_width(widths[i]), []).append(i)
+
+        for batch_w, indices in buckets.items():
+            for begin in range(0, len(indices), self.rec_batch_size):
+                chunk = indices[begin:begin + self.rec_batch_size]
+                batch = np.zeros((len(chunk), 3, REC_HEIGHT, batch_w), dtype=np.float32)
+                for k, i in enumerate(chunk):
+                    data = _to_bgr_array(crops[i].resize((widths[i], REC_HEIGHT), Image.BILINEAR))
+                    batch[k, :, :, :widths[i]] = ((data / 255.0 - 0.5) / 0.5).transpose(2, 0, 1)
+                yield chunk, batch
+
+    def _recognize_lines(self, crops):
+        """
+        批量识别文本行截图（同一批只调用一次推理）
+        :param crops: PIL Image 列表（RGB）
+        :return: [(文本, 置信度)]，与输入顺序一致
+        """
+        results = [("", 0.0)] * len(crops)
+        for chunk, batch in self._rec_batches(crops):
+            preds = self._run_session(self.rec_session, batch)
+            for k, i in enumerate(chunk):
+                results[i] = self._ctc_decode(preds[k])
+        return results
+
+    def _ctc_decode(self, pred):
+        """CTC 贪心解码：去掉重复与空白符，置信度为保留字符概率的平均值"""
+        indices = pred.argmax(axis=1)
+        probs = pred.max(axis=1)
+        keep = indices != 0
+        keep[1:] &= indices[1:] != indices[:-1]
+        chars = [self.characters[i] for i in indices[keep] if i < len(self.characters)]
+        if not chars:
+            return "", 0.0
+        return "".join(chars), float(probs[keep].mean())
+
+    def _detect_lines(self, image):
+        """
+        检测文本行并裁剪（竖排转横排、倒置转正）
+        :param image: PIL Image（RGB）
+        :return: (文本框列表, 文本行截图列表)
+        """
+        boxes = self._detect(image)
+        crops = []
+        for x1, y1, x2, y2 in boxes:
+            crop = image.crop((x1, y1, x2, y2))
+            if crop.height >= crop.width * 1.5:  # 竖排文本行转为横排
+                crop = crop.transpose(Image.Transpose.ROTATE_90)
+            crops.append(crop)
+        return boxes, self._classify(crops)
+
+    @staticmethod
+    def _build_result(boxes, recognized):
+        """组装 OCRResult（丢弃空文本与低置信度的文本行）"""
+        result = OCRResult()
+        drop_score = getattr(Config, 'ONNX_DROP_SCORE', 0.5)
+        for (x1, y1, x2, y2), (text, score) in zip(boxes, recognized):
+            if text.strip() and score >= drop_score:
+                result.append(text.strip(), [[x1, y1], [x2, y1], [x2, y2], [x1, y2]], score)
+        return result
+
+    def _ocr(self, image):
+        """
+        完整流程：检测 → 方向分类 → 识别
+        :param image: PIL Image
+        :return: OCRResult
+        """
+        boxes, crops = self._detect_lines(image.convert('RGB'))
+        return self._build_result(boxes, self._recognize_lines(crops))
+
+    def _recognize_crops(self, crops):
+        """
+        识别多个区域截图：单行截图直接作为文本行，多行截图先检测文本行，
+        所有文本行（跨区域、跨页面）汇总后一起分桶批量识别
+        :param crops: PIL Image 列表
+        :return: 与输入顺序一致的识别文本列表
+        """
+        crops = [ImageUtils.normalize_crop(crop).convert('RGB') for crop in crops]
+        lines, owners = [], []  # 待识别的文本行，及其所属 (区域下标, 文本框或None)
+        for i, crop in enumerate(crops):
+            if ImageUtils.is_single_line(crop):
+                lines.append(ImageUtils.trim_to_ink(crop))
+                owners.append((i, None))
+            else:
+                boxes, line_crops = self._detect_lines(crop)
+                lines.extend(line_crops)
+                owners.extend((i, box) for box in boxes)
+
+        recognized = self._recognize_lines(lines)
+        single = {i: recognized[k] for k, (i, box) in enumerate(owners) if box is None}
+        detected = {}
+        for (i, box), rec in zip(owners, recognized):
+            if box is not None:
+                detected.setdefault(i, ([], []))
+                detected[i][0].append(box)
+                detected[i][1].append(rec)
+
+        texts = [""] * len(crops)
+        for i in range(len(crops)):
+            if i in single:
+                texts[i] = single[i][0].strip()
+            elif i in detected:
+                texts[i] = self._build_result(*detected[i]).text
+        return texts
+
+    # ---- 统一接口 ----
+    def is_ready(self):
+        """检查引擎是否就绪"""
+        return getattr(self, 'rec_session', None) is not None
+
+    def recognize_image(self, image, **kwargs):
+        """
+        识别整张图片
+        :param image: PIL Image对象或图片文件路径
+        :return: OCRResult（保留每个文本行的文本、四点坐标与置信度；识别失败时带 error）
+        """
+        if not self.is_ready():
+            return OCRResult.failed(f"{self.ENGINE_NAME} 引擎未就绪")
+        try:
+            if isinstance(image, str):
+                image = ImageUtils.load_image(image)
+            return self._ocr(image)
+        except Exception as e:
+            print(f"OCR识别异常: {e}")
+            return OCRResult.failed(e)
+
+    def recognize_region(self, image, rect, **kwargs):
+        """
+        识别图片中的指定区域
+        :param image: PIL Image对象
+        :param rect: OCRRect对象或坐标元组 (x1, y1, x2, y2)
+        :return: 识别的文本字符串
+        """
+        if not self.is_ready():
+            return OCRError(f"{self.ENGINE_NAME} 引擎未就绪")
+        return self.batch_recognize([(image, [rect])])[0].get(rect, "")
+
+    def recognize_regions(self, image, rects, **kwargs):
+        """
+        批量识别多个区域（单行区域合并为批量推理）
+        :param image: PIL Image对象
+        :param rects: OCRRect对象列表
+        :return: 识别结果字典 {rect: text}
+        """
+        if not self.is_ready():
+            return {}
+        return self.batch_recognize([(image, rects)])[0]
+
+    def batch_recognize(self, image_rect_pairs, **kwargs):
+        """
+        批量处理多个图片（所有页面的区域一起识别）
+        :param image_rect_pairs: [(image, [rects]), ...] 列表，image 可以是文件路径，rects为空表示识别整图
+        :return: 识别结果列表（与输入顺序一致）：有区域时为 {rect: text}，否则为整图识别结果 OCRResult
+        """
+        if not self.is_ready():
+            return []
+
+        image_rect_pairs = [prepare_batch_item(image, list(rects)) for image, rects in image_rect_pairs]
+        regions = [(page_index, rect)
+                   for page_index, (_, rects) in enumerate(image_rect_pairs) for rect in rects]
+        try:
+            crops = [image_rect_pairs[page_index][0].crop(rect.get_coords() if hasattr(rect, 'get_coords') else rect)
+                     for page_index, rect in regions]
+            texts = self._recognize_crops(crops)
+        except Exception as e:
+            print(f"OCR识别异常: {e}")
+            texts = [OCRError(e)] * len(regions)
+
+        results = [{} if rects else None for _, rects in image_rect_pairs]
+        for (page_index, rect), text in zip(regions, texts):
+            results[page_index][rect] = text
+            if hasattr(rect, 'text'):
+                rect.text = text
+        for page_index, (image, rects) in enumerate(image_rect_pairs):
+            if not rects:
+                results[page_index] = self.recognize_image(image)
+        return results
+
+    def close(self):
+        """释放推理会话与 CPU 份额"""
+        if hasattr(self, '_budget_name'):
+            get_cpu_budget().unregister_engine(self._budget_name)
+        self.det_session = self.rec_session = self.cls_session = None
+
+    def __del__(self):
+        """析构函数，释放推理会话"""
+        self.close()
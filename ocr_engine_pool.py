@@ -0,0 +1,289 @@
+"""
+本地 OCR 引擎进程池
+在 CreateOcrApi 之上维护多个 PaddleOCR-json / RapidOCR-json 子进程：
+  - 按需扩容到 max_size 个进程（默认等于CPU核数），请求派发给当前最空闲的进程
+  - 管道模式的进程使用流水线客户端，每个进程可同时有多个请求在途（pipeline_depth）
+  - 新进程启动后先用一张空白小图预热，避免首个真实请求承担模型加载开销
+  - 空闲超时的进程会被回收（保留 min_size 个常驻），释放内存
+  - 每个进程都由 SupervisedOCRApi 监管：请求超时或进程崩溃时自动重启并重试一次
+
+对外接口与 PPOCR_pipe 一致（run / runBytes / runBase64 / runDict / exit），
+引擎封装可以无差别地替换单个进程。
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from base64 import b64encode
+from io import BytesIO
+from PIL import Image
+from ocr_pipe_client import CreateOcrApi
+from ocr_engine_supervisor import SupervisedOCRApi
+
+
+def _make_warmup_base64():
+    """生成预热用的空白小图（base64编码的PNG）"""
+    buffer = BytesIO()
+    Image.new('RGB', (64, 32), 'white').save(buffer, format='PNG', compress_level=1)
+    return b64encode(buffer.getvalue()).decode('utf-8')
+
+
+class _PoolWorker:
+    """进程池中的单个引擎进程"""
+
+    def __init__(self, api):
+        self.api = api
+        self.pipelined = getattr(api, 'pipelined', hasattr(api, 'submitDict'))  # 流水线客户端自身线程安全
+        self.lock = threading.Lock()  # 非流水线客户端（如套接字模式）的一次读写必须串行
+        self.in_flight = 0            # 已派发未完成的请求数（由进程池的锁保护）
+        self.last_used = time.monotonic()
+
+
+class OCREnginePool:
+    """本地引擎进程池（与 PPOCR_pipe 接口兼容）"""
+
+    def __init__(self, exe_path, models_path=None, argument=None, ipc_mode="pipe",
+                 max_size=0, min_size=1, idle_timeout=60, warmup=True, pipeline_depth=2,
+                 request_timeout=60, on_first_request=None):
+        """
+        初始化进程池（立即启动 min_size 个进程，其余按需启动）
+        :param exe_path: 引擎可执行文件路径
+        :param models_path: 识别库路径（None表示与可执行文件同目录）
+        :param argument: 引擎启动参数字典
+        :param ipc_mode: 进程通信模式 'pipe' / 'socket'
+        :param max_size: 最大进程数，0表示使用CPU核数
+        :param min_size: 常驻进程数（空闲回收的下限）
+        :param idle_timeout: 空闲多少秒后回收多余进程，0表示不回收
+        :param warmup: 新进程启动后是否预热
+        :param pipeline_depth: 每个进程同时在途的请求数上限（决定 map 的并发度）
+        :param request_timeout: 单个请求的截止时间（秒），超时视为进程卡死并重启，0表示不限
+        :param on_first_request: 收到第一个识别请求（不含预热）时调用一次的函数，如让引擎在 CPU 预算中转为活跃
+        """
+        self._exe_path = exe_path
+        self._models_path = models_path
+        self._argument = argument
+        self._ipc_mode = ipc_mode
+        self.max_size = max(1, max_size or os.cpu_count() or 1)
+        self.min_size = max(1, min(min_size, self.max_size))
+        self.idle_timeout = idle_timeout
+        self.warmup = warmup
+        self.pipeline_depth = max(1, pipeline_depth)
+        self.request_timeout = request_timeout
+
+        self._workers = []
+        self._spawning = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self._executor = None
+        self._on_first_request = on_first_request
+
+        for _ in range(self.min_size):
+            self._workers.append(self._spawn_worker())
+
+        # 空闲回收线程
+        self._stop_event = threading.Event()
+        self._reaper = None
+        if self.idle_timeout and self.max_size > self.min_size:
+            self._reaper = threading.Thread(target=self._reap_loop, name="OCREnginePoolReaper", daemon=True)
+            self._reaper.start()
+
+    # ---- 进程管理 ----
+    def _create_api(self):
+        """以相同参数创建一个引擎API对象（首次启动与重启共用）"""
+        socket_options = {}
+        if self._ipc_mode == "socket" and self.request_timeout:
+            socket_options["readTimeout"] = self.request_timeout
+        return CreateOcrApi(self._exe_path, self._models_path,
+                            dict(self._argument) if self._argument else None,
+                            ipcMode=self._ipc_mode, **socket_options)
+
+    def _spawn_worker(self):
+        """启动一个受监管的引擎进程并预热"""
+        api = SupervisedOCRApi(
+            self._create_api,
+            request_timeout=self.request_timeout,
+            warmup_base64=_make_warmup_base64() if self.warmup else None,
+        )
+        return _PoolWorker(api)
+
+    def _acquire(self):
+        """选出最空闲的进程（必要时扩容），并登记一个在途请求"""
+        spawn = False
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("引擎进程池已关闭")
+            worker = min(self._workers, key=lambda w: (w.in_flight, w.last_used)) if self._workers else None
+            if (worker is None or worker.in_flight > 0) and len(self._workers) + self._spawning < self.max_size:
+                self._spawning += 1
+                spawn = True
+            elif worker is None:
+                raise RuntimeError("没有可用的引擎进程")
+            else:
+                worker.in_flight += 1
+
+        if not spawn:
+            return worker
+
+        try:
+            new_worker = self._spawn_worker()
+        except Exception as e:
+            with self._lock:
+                self._spawning -= 1
+                if not self._workers:
+                    raise
+                print(f"⚠️ 引擎进程扩容失败，继续使用现有 {len(self._workers)} 个进程: {e}")
+                worker = min(self._workers, key=lambda w: (w.in_flight, w.last_used))
+                worker.in_flight += 1
+            return worker
+
+        with self._lock:
+            self._spawning -= 1
+            if not self._closed:
+                new_worker.in_flight += 1
+                self._workers.append(new_worker)
+                return new_worker
+        new_worker.api.exit()
+        raise RuntimeError("引擎进程池已关闭")
+
+    def _release(self, worker):
+        with self._lock:
+            worker.in_flight -= 1
+            worker.last_used = time.monotonic()
+
+    def _reap_loop(self):
+        """定期回收空闲超时的多余进程"""
+        interval = max(1.0, self.idle_timeout / 4)
+        while not self._stop_event.wait(interval):
+            self.reap_idle()
+
+    def reap_idle(self):
+        """回收空闲超过 idle_timeout 的进程（保留 min_size 个）"""
+        now = time.monotonic()
+        reaped = []
+        with self._lock:
+            # 最久未使用的先回收
+            for worker in sorted(self._workers, key=lambda w: w.last_used):
+                if len(self._workers) <= self.min_size:
+                    break
+                if worker.in_flight == 0 and now - worker.last_used >= self.idle_timeout:
+                    self._workers.remove(worker)
+                    reaped.append(worker)
+        for worker in reaped:
+            worker.api.exit()
+        if reaped:
+            print(f"引擎进程池回收 {len(reaped)} 个空闲进程，当前 {self.size} 个")
+
+    def reconfigure(self, max_size=None, argument=None):
+        """
+        调整进程数上限与启动参数（之后启动/重启的进程使用新参数，超出上限的空闲进程立即回收）
+        :param max_size: 新的最大进程数，None表示不变
+        :param argument: 新的启动参数字典，None表示不变
+        """
+        reaped = []
+        executor = None
+        with self._lock:
+            if argument is not None:
+                self._argument = argument
+            if max_size is not None and max(1, max_size) != self.max_size:
+                # map 的并发度随进程数变化：下次 map 时按新的上限重建线程池（已提交的任务照常完成）
+                executor, self._executor = self._executor, None
+            if max_size is not None:
+                self.max_size = max(1, max_size)
+                self.min_size = min(self.min_size, self.max_size)
+                for worker in sorted(self._workers, key=lambda w: w.last_used):
+                    if len(self._workers) <= self.max_size:
+                        break
+                    if worker.in_flight == 0:
+                        self._workers.remove(worker)
+                        reaped.append(worker)
+        for worker in reaped:
+            worker.api.exit()
+        if executor:
+            executor.shutdown(wait=False)
+
+    @property
+    def size(self):
+        """当前进程数"""
+        return len(self._workers)
+
+    def stats(self):
+        """
+        进程池状态
+        :return: {"size", "max_size", "min_size", "in_flight": [各进程在途请求数], "restarts": 累计重启次数}
+        """
+        with self._lock:
+            return {
+                "size": len(self._workers),
+                "max_size": self.max_size,
+                "min_size": self.min_size,
+                "in_flight": [w.in_flight for w in self._workers],
+                "restarts": sum(getattr(w.api, 'restart_count', 0) for w in self._workers),
+            }
+
+    # ---- 识别接口（与 PPOCR_pipe 一致） ----
+    def runDict(self, writeDict: dict):
+        """将指令派发给最空闲的引擎进程"""
+        if self._on_first_request is not None:
+            with self._lock:
+                callback, self._on_first_request = self._on_first_request, None
+            if callback is not None:
+                callback()
+        try:
+            worker = self._acquire()
+        except Exception as e:
+            return {"code": 901, "data": f"引擎进程池不可用：{e}"}
+        try:
+            if worker.pipelined:
+                return worker.api.runDict(writeDict)
+            with worker.lock:
+                return worker.api.runDict(writeDict)
+        finally:
+            self._release(worker)
+
+    def run(self, imgPath: str):
+        return self.runDict({"image_path": imgPath})
+
+    def runBase64(self, imageBase64: str):
+        return self.runDict({"image_base64": imageBase64})
+
+    def runBytes(self, imageBytes):
+        return self.runBase64(b64encode(imageBytes).decode("utf-8"))
+
+    def map(self, func, items):
+        """
+        并发执行 func(item)，请求分散到池中各进程，结果按输入顺序返回
+        :param func: 单个任务函数（内部调用本池的 run* 方法）
+        :param items: 任务参数列表
+        :return: 结果列表
+        """
+        items = list(items)
+        if len(items) <= 1 or self.max_size * self.pipeline_depth == 1:
+            return [func(item) for item in items]
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_size * self.pipeline_depth,
+                                                    thread_name_prefix="OCREnginePool")
+            executor = self._executor
+        return list(executor.map(func, items))
+
+    def exit(self):
+        """关闭所有引擎进程"""
+        if not hasattr(self, '_lock'):  # 初始化未完成
+            return
+        with self._lock:
+            self._closed = True
+            workers, self._workers = self._workers, []
+            executor, self._executor = self._executor, None
+        if hasattr(self, '_stop_event'):
+            self._stop_event.set()
+        for worker in workers:
+            try:
+                worker.api.exit()
+            except Exception as e:
+                print(f"[Error] 关闭引擎进程失败: {e}")
+        if executor:
+            executor.shutdown(wait=False)
+
+    def __del__(self):
+        self.exit()
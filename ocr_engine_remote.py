@@ -0,0 +1,100 @@
+"""
+远程 PaddleOCR-json 服务器集群引擎
+多台运行套接字模式的 PaddleOCR-json 服务器（PaddleOCR-json.exe -port=1224 -addr=any）
+通过 RemoteEndpointPool 负载均衡，对 OCREngineManager 而言与本地引擎无异：
+区域拼图、批量识别、结果解析等逻辑全部沿用 LocalOCREngine，只是请求发往远程服务器。
+"""
+
+from config import Config
+from ocr_engine_local import LocalOCREngine
+from ocr_remote_pool import RemoteEndpointPool
+from ocr_language_registry import LANGUAGE_NAMES, normalize_lang
+from utils import FileUtils, ImageUtils
+
+
+class RemoteOCREngine(LocalOCREngine):
+    """远程 PaddleOCR-json 服务器集群引擎"""
+
+    ENGINE_NAME = "PaddleOCR-json（远程集群）"
+    ENGINE_KEY = "paddle"
+    FEATURES = "多台服务器负载均衡、故障自动摘除与恢复"
+
+    def __init__(self, profile=None, lang=None, endpoints=None):
+        """
+        连接远程服务器集群
+        :param profile: 性能档位（仅用于拼图画布尺寸；服务器的启动参数由服务器自身决定）
+        :param lang: 服务器所用识别模型的语言，None表示使用 Config.OCR_LANG
+        :param endpoints: 服务器地址列表，None表示使用 Config.OCR_REMOTE_ENDPOINTS
+        """
+        endpoints = list(endpoints if endpoints is not None else getattr(Config, 'OCR_REMOTE_ENDPOINTS', []))
+        print(f"正在初始化 {self.ENGINE_NAME} 引擎...")
+        print(f"  - 服务器: {', '.join(endpoints) or '（未配置）'}")
+
+        self.lang = normalize_lang(lang)
+        self.profile = profile or getattr(Config, 'OCR_PROFILE', 'balanced')
+        self.uses_wine = False
+        self.exe_path = None
+        self.arguments = {}
+
+        try:
+            self.ocr = RemoteEndpointPool(
+                endpoints,
+                connect_timeout=getattr(Config, 'OCR_REMOTE_CONNECT_TIMEOUT', 3),
+                request_timeout=getattr(Config, 'OCR_REQUEST_TIMEOUT', 60),
+                health_interval=getattr(Config, 'OCR_REMOTE_HEALTH_INTERVAL', 10),
+                backoff=getattr(Config, 'OCR_REMOTE_BACKOFF', 5),
+                max_backoff=getattr(Config, 'OCR_REMOTE_MAX_BACKOFF', 300),
+                pipeline_depth=getattr(Config, 'OCR_PIPELINE_DEPTH', 2),
+            )
+        except Exception as e:
+            raise Exception(f"{self.ENGINE_NAME} 引擎初始化失败: {e}")
+
+        print(f"✓ {self.ENGINE_NAME} 引擎初始化成功")
+        print(f"  - 可用服务器: {self.ocr.size}/{self.ocr.max_size}")
+        print(f"  - 识别语言: {LANGUAGE_NAMES[self.lang]}")
+        print(f"  - 特性: {self.FEATURES}")
+
+        self._init_region_batching()
+
+    def _rect_lang(self, rect, lang=None):
+        """服务器启动时已确定识别模型，所有区域都按服务器的语言识别"""
+        return self.lang
+
+    def supported_languages(self):
+        """
+        可用的识别语言（仅服务器所用的语言）
+        :return: {语言代码: 显示名称}
+        """
+        return {self.lang: LANGUAGE_NAMES[self.lang]}
+
+    def _run_image(self, image, transport=None):
+        """
+        将图片发送给服务器识别（服务器无法读取本机的临时文件，transport='file' 时也发送图片内容）
+        :param image: PIL Image对象
+        :param transport: 传输方式（编码），None表示使用配置
+        :return: 引擎原始返回
+        """
+        if transport is None:
+            transport = getattr(Config, 'OCR_IMAGE_TRANSPORT', 'auto')
+        if transport == 'file':
+            transport = 'auto'
+        image_bytes, _ = ImageUtils.encode_for_engine(image, mode=transport)
+        return self.ocr.runBytes(image_bytes)
+
+    def _run_file(self, file_path):
+        """
+        识别磁盘上的图片文件（服务器无法读取本机路径，始终发送文件内容）
+        :param file_path: 图片文件路径
+        :return: 引擎原始返回
+        """
+        if not FileUtils.is_engine_native_file(file_path):
+            return self._run_image(ImageUtils.load_image(file_path))
+        with open(file_path, 'rb') as f:
+            return self.ocr.runBytes(f.read())
+
+    def stats(self):
+        """
+        各服务器的状态与请求分布
+        :return: 见 RemoteEndpointPool.stats
+        """
+        return self.ocr.stats() if self.is_ready() else {}
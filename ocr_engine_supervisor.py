@@ -0,0 +1,150 @@
+"""
+OCR 引擎进程监管
+包装 PPOCR_pipe / PPOCR_socket（及流水线客户端），解决引擎卡死或崩溃后整个批量任务停滞的问题：
+  - 每个请求都有截止时间（流水线客户端通过 Future 超时，套接字模式通过读超时）
+  - 请求超时、子进程崩溃或连接中断时，杀掉旧进程并用相同参数重新启动
+  - 识别请求是幂等的，失败的请求会在新进程上重试一次；仍失败则返回错误结果，不会抛出异常
+
+对外接口与 PPOCR_pipe 一致（run / runBytes / runBase64 / runDict / exit），
+可直接替换进程池中的单个引擎进程。
+"""
+
+import threading
+from base64 import b64encode
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+# 需要重启引擎的错误码：901=引擎实例不存在，902=子进程崩溃/连接被拒绝，903=超时/读取输出失败
+RESTART_CODES = (901, 902, 903)
+
+
+class SupervisedOCRApi:
+    """带截止时间与自动重启的引擎进程包装"""
+
+    def __init__(self, factory, request_timeout=60, max_retries=1, warmup_base64=None):
+        """
+        启动引擎进程
+        :param factory: 无参函数，每次调用以相同参数创建一个新的引擎API对象
+        :param request_timeout: 单个请求的截止时间（秒），0或None表示不限
+        :param max_retries: 重启后在新进程上重试的次数
+        :param warmup_base64: 新进程启动后用于预热的图片（base64），None表示不预热
+        """
+        self._factory = factory
+        self.request_timeout = request_timeout or None
+        self.max_retries = max(0, max_retries)
+        self._warmup_base64 = warmup_base64
+
+        self._lock = threading.Lock()          # 保护 _api / _generation
+        self._restart_lock = threading.Lock()  # 同一时间只进行一次重启
+        self._generation = 0                   # 每重启一次加一，避免多个线程重复重启同一个进程
+        self._closed = False
+        self.restart_count = 0
+
+        self._api = self._spawn()
+
+    def _spawn(self):
+        """创建并预热一个新的引擎进程"""
+        api = self._factory()
+        if self._warmup_base64:
+            api.runBase64(self._warmup_base64)
+        return api
+
+    @property
+    def pipelined(self):
+        """底层客户端是否为线程安全的流水线客户端（可同时有多个请求在途）"""
+        return hasattr(self._api, 'submitDict')
+
+    def _current(self):
+        """取得当前进程（进程不可用时先尝试重启）"""
+        with self._lock:
+            api, generation = self._api, self._generation
+        if api is None and not self._closed:
+            self._restart(generation, "引擎进程不可用")
+            with self._lock:
+                api, generation = self._api, self._generation
+        return api, generation
+
+    def _call(self, api, writeDict):
+        """在指定进程上执行一次请求（流水线客户端按截止时间等待结果）"""
+        if hasattr(api, 'submitDict'):
+            future = api.submitDict(writeDict)
+            try:
+                return future.result(timeout=self.request_timeout)
+            except FutureTimeoutError:
+                return {"code": 903, "data": f"识别超时（超过 {self.request_timeout} 秒），引擎疑似卡死。"}
+        return api.runDict(writeDict)
+
+    def _restart(self, generation, reason):
+        """
+        杀掉并重启引擎进程（若其他线程已完成重启则直接返回）
+        :param generation: 调用方出错时所用进程的代数
+        :param reason: 重启原因（用于日志）
+        """
+        with self._restart_lock:
+            with self._lock:
+                if self._closed or generation != self._generation:
+                    return
+                old_api, self._api = self._api, None
+
+            print(f"⚠️ OCR引擎进程异常（{reason}），正在重启...")
+            if old_api is not None:
+                try:
+                    old_api.exit()
+                except Exception as e:
+                    print(f"[Error] 关闭异常引擎进程失败: {e}")
+
+            try:
+                new_api = self._spawn()
+                print("✓ OCR引擎进程已重启")
+            except Exception as e:
+                new_api = None
+                print(f"❌ OCR引擎进程重启失败: {e}")
+
+            with self._lock:
+                self._generation += 1
+                self.restart_count += 1
+                if self._closed:  # 重启期间已关闭
+                    self._api = None
+                else:
+                    self._api = new_api
+            if new_api is not None and self._api is None:
+                new_api.exit()
+
+    # ---- 识别接口（与 PPOCR_pipe 一致） ----
+    def runDict(self, writeDict: dict):
+        """
+        发送指令字典（超时或进程异常时重启引擎并重试）
+        :param writeDict: 指令字典
+        :return: {"code": 识别码, "data": 内容列表或错误信息字符串}
+        """
+        result = None
+        for _ in range(self.max_retries + 1):
+            api, generation = self._current()
+            if api is None:
+                return {"code": 901, "data": "引擎实例不存在。"}
+            result = self._call(api, writeDict)
+            if result.get("code") not in RESTART_CODES:
+                return result
+            self._restart(generation, f"code={result['code']}, {result['data']}")
+        return result
+
+    def run(self, imgPath: str):
+        return self.runDict({"image_path": imgPath})
+
+    def runBase64(self, imageBase64: str):
+        return self.runDict({"image_base64": imageBase64})
+
+    def runBytes(self, imageBytes):
+        return self.runBase64(b64encode(imageBytes).decode("utf-8"))
+
+    def exit(self):
+        """关闭引擎进程（不再重启）"""
+        if not hasattr(self, '_api'):  # 初始化未完成（首个进程启动失败）
+            return
+        with self._lock:
+            self._closed = True
+            api, self._api = self._api, None
+        if api is not None:
+            api.exit()
+
+    def __del__(self):
+        self.exit()
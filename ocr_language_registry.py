@@ -0,0 +1,122 @@
+"""
+多语言引擎注册表
+PaddleOCR-json / RapidOCR-json 自带多种语言的识别模型（英文、日文、韩文、俄文、繁体中文），
+但一个引擎进程启动后只能使用一套模型。本模块按语言延迟启动引擎（每种语言一个进程池），
+请求按区域/模板的语言设置路由到对应引擎；不常用的语言引擎按 LRU 关闭，内存占用有上限。
+"""
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from config import Config
+
+# 语言代码 -> 显示名称
+LANGUAGE_NAMES = {
+    'ch': '简体中文',
+    'en': 'English',
+    'chinese_cht': '繁體中文',
+    'japan': '日本語',
+    'korean': '한국어',
+    'cyrillic': 'Русский',
+}
+
+# 语言代码 -> 模型文件名中的语言后缀（config_xxx.txt / dict_xxx.txt / rec_xxx_PP-OCRv3_infer.onnx）
+LANGUAGE_MODEL_SUFFIX = {
+    'ch': 'chinese',
+    'en': 'en',
+    'chinese_cht': 'chinese_cht',
+    'japan': 'japan',
+    'korean': 'korean',
+    'cyrillic': 'cyrillic',
+}
+
+
+def normalize_lang(lang=None):
+    """
+    规范化语言代码
+    :param lang: 语言代码，None或空表示默认语言 Config.OCR_LANG
+    :return: 语言代码
+    """
+    lang = lang or getattr(Config, 'OCR_LANG', 'ch')
+    if lang not in LANGUAGE_NAMES:
+        raise ValueError(f"不支持的识别语言: {lang}（可选: {', '.join(LANGUAGE_NAMES)}）")
+    return lang
+
+
+class LanguageEngineRegistry:
+    """按语言延迟创建引擎，并以 LRU 方式限制同时存在的引擎数量"""
+
+    def __init__(self, factory, max_engines=2):
+        """
+        :param factory: 函数 factory(lang) -> 引擎实例（需提供 close 方法）
+        :param max_engines: 最多同时保留的语言引擎数（正在使用的引擎不会被关闭）
+        """
+        self._factory = factory
+        self.max_engines = max(1, max_engines)
+        self._lock = threading.Lock()
+        self._engines = OrderedDict()  # {lang: 引擎}，按最近使用排序
+        self._in_use = {}              # {lang: 使用中的请求数}
+        self._creating = {}            # {lang: threading.Lock}，避免同一语言重复创建
+
+    def _get_or_create(self, lang):
+        with self._lock:
+            engine = self._engines.get(lang)
+            if engine is not None:
+                self._engines.move_to_end(lang)
+                self._in_use[lang] = self._in_use.get(lang, 0) + 1
+                return engine
+            create_lock = self._creating.setdefault(lang, threading.Lock())
+
+        with create_lock:
+            with self._lock:
+                engine = self._engines.get(lang)
+            if engine is None:
+                print(f"正在启动 {LANGUAGE_NAMES.get(lang, lang)} 识别引擎...")
+                engine = self._factory(lang)
+            with self._lock:
+                self._engines[lang] = engine
+                self._engines.move_to_end(lang)
+                self._in_use[lang] = self._in_use.get(lang, 0) + 1
+                evicted = self._evict_locked()
+        for old_lang, old_engine in evicted:
+            print(f"关闭不常用的 {LANGUAGE_NAMES.get(old_lang, old_lang)} 识别引擎")
+            old_engine.close()
+        return engine
+
+    def _evict_locked(self):
+        """关闭超出上限的最久未使用引擎（跳过正在使用的）"""
+        evicted = []
+        for lang in list(self._engines):
+            if len(self._engines) <= self.max_engines:
+                break
+            if self._in_use.get(lang, 0) == 0:
+                evicted.append((lang, self._engines.pop(lang)))
+        return evicted
+
+    @contextmanager
+    def use(self, lang):
+        """
+        取得指定语言的引擎（使用期间不会被 LRU 关闭）
+        :param lang: 语言代码
+        """
+        engine = self._get_or_create(lang)
+        try:
+            yield engine
+        finally:
+            with self._lock:
+                self._in_use[lang] -= 1
+                evicted = self._evict_locked()
+            for old_lang, old_engine in evicted:
+                old_engine.close()
+
+    def languages(self):
+        """当前已启动的语言（按最近使用排序）"""
+        with self._lock:
+            return list(self._engines)
+
+    def close_all(self):
+        """关闭所有语言引擎"""
+        with self._lock:
+            engines, self._engines = list(self._engines.values()), OrderedDict()
+        for engine in engines:
+            engine.close()
@@ -0,0 +1,96 @@
+"""
+ONNX 模型集
+同一模型可以有多个精度版本，按文件名后缀区分：
+  - fp32：随项目提供的原始模型，如 ch_PP-OCRv3_det_infer.onnx
+  - int8：ocr_quantize.py 生成的量化模型，如 ch_PP-OCRv3_det_infer.int8.onnx
+引擎按 Config.OCR_MODEL_SET 选择版本；所选版本不存在时回退到 fp32。
+本地引擎的可执行文件、模型目录与文件路径也在这里定义和解析（不依赖 NumPy / onnxruntime，可用性检测时无需导入引擎模块）。
+"""
+
+import os
+from config import Config, get_resource_path
+
+MODEL_SETS = ('fp32', 'int8')
+
+# 本地引擎可执行文件相对项目根目录的路径片段（引擎类的 EXE_RELATIVE_PATH 与可用性检测共用）
+PADDLE_EXE_RELATIVE_PATH = ("models", "PaddleOCR-json", "PaddleOCR-json_v1.4.1", "PaddleOCR-json.exe")
+RAPID_DIR_RELATIVE_PATH = ("models", "RapidOCR-json", "RapidOCR-json_v0.2.0")
+RAPID_EXE_RELATIVE_PATH = RAPID_DIR_RELATIVE_PATH + ("RapidOCR-json.exe",)
+
+# ONNX 模型目录（与 RapidOCR-json 共用同一套模型）
+MODELS_RELATIVE_PATH = RAPID_DIR_RELATIVE_PATH + ("models",)
+
+
+def variant_filename(name, model_set):
+    """
+    模型文件在指定模型集中的文件名
+    :param name: 原始（fp32）模型文件名
+    :param model_set: 'fp32' / 'int8'
+    :return: 文件名
+    """
+    if model_set not in MODEL_SETS:
+        raise ValueError(f"未知的模型集: {model_set}（可选: {', '.join(MODEL_SETS)}）")
+    if model_set == 'fp32':
+        return name
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{model_set}{ext}"
+
+
+def resolve_model_file(models_dir, name, model_set):
+    """
+    选择模型文件：所选模型集的版本存在时使用该版本，否则回退到原始模型
+    :param models_dir: 模型目录
+    :param name: 原始（fp32）模型文件名
+    :param model_set: 'fp32' / 'int8'
+    :return: (文件名, 实际使用的模型集)
+    """
+    variant = variant_filename(name, model_set)
+    if variant != name and os.path.exists(os.path.join(models_dir, variant)):
+        return variant, model_set
+    return name, 'fp32'
+
+
+def available_model_sets(models_dir, names):
+    """
+    检查模型目录中各模型集是否齐全
+    :param models_dir: 模型目录
+    :param names: 原始模型文件名列表
+    :return: {模型集: 齐全的模型文件名列表}
+    """
+    return {
+        model_set: [name for name in names
+                    if os.path.exists(os.path.join(models_dir, variant_filename(name, model_set)))]
+        for model_set in MODEL_SETS
+    }
+
+
+def get_models_dir():
+    """ONNX 模型目录"""
+    return getattr(Config, 'ONNX_MODELS_DIR', '') or get_resource_path(os.path.join(*MODELS_RELATIVE_PATH))
+
+
+def get_model_names():
+    """各模型的原始（fp32）文件名 {"det", "cls", "rec", "keys"}"""
+    return {
+        "det": getattr(Config, 'ONNX_DET_MODEL', 'ch_PP-OCRv3_det_infer.onnx'),
+        "cls": getattr(Config, 'ONNX_CLS_MODEL', 'ch_ppocr_mobile_v2.0_cls_infer.onnx'),
+        "rec": getattr(Config, 'ONNX_REC_MODEL', 'ch_PP-OCRv3_rec_infer.onnx'),
+        "keys": getattr(Config, 'ONNX_REC_KEYS', 'ppocr_keys_v1.txt'),
+    }
+
+
+def get_model_paths(model_set=None):
+    """
+    ONNX 模型文件路径
+    :param model_set: 模型集 'fp32' / 'int8'，None表示使用 Config.OCR_MODEL_SET（所选版本不存在的模型回退到 fp32）
+    :return: {"det", "cls", "rec", "keys"} -> 路径（文件不存在时为 None）
+    """
+    models_dir = get_models_dir()
+    model_set = model_set or getattr(Config, 'OCR_MODEL_SET', 'fp32')
+    paths = {}
+    for key, name in get_model_names().items():
+        if key != "keys":
+            name, _ = resolve_model_file(models_dir, name, model_set)
+        path = os.path.join(models_dir, name)
+        paths[key] = path if os.path.exists(path) else None
+    return paths
@@ -0,0 +1,188 @@
+"""
+整页方向预处理
+扫描件中整页旋转了 90°/180°/270° 的页面在读取时（ImageUtils.load_image）一次性转正，
+之后再按 OCRRect 裁剪区域；引擎因此可以关闭逐行的方向分类（逐行分类只能处理 180°，且每行都要多跑一次模型）。
+
+判断分两步：
+  - 横竖：NumPy 投影轮廓。横排文字的行投影在"文字行/行间距"之间剧烈起伏，列投影则较平坦；
+    列投影起伏明显更大时说明页面旋转了 90°/270°
+  - 正倒：在转为横排后的页面上按行投影取若干文本行，交给方向分类模型（ONNX 引擎的 cls 模型）投票；
+    没有 onnxruntime 或模型时，比较文本行上、下边缘的墨迹量（仅对拉丁字母可靠）
+无法可靠判断时（空白页、图片为主的页面、证据不足）保持原样。
+"""
+
+import threading
+import numpy as np
+from PIL import Image
+
+# 判断所用的缩略图最长边（像素）
+ANALYSIS_SIDE = 800
+# 行/列投影起伏程度之比超过该值才认为页面是竖向的
+AXIS_MARGIN = 1.3
+# 正倒判断最多取样的文本行数
+SAMPLE_LINES = 8
+# 墨迹启发式：上下边缘墨迹量之比超过该值才认为可以确定正倒
+EDGE_MARGIN = 1.15
+
+# 记录在 image.info 中的已处理标记（值为已旋转的角度），避免同一张图片重复判断
+ORIENTATION_INFO_KEY = "ocr_orientation"
+
+_TRANSPOSE = {90: Image.Transpose.ROTATE_90, 180: Image.Transpose.ROTATE_180, 270: Image.Transpose.ROTATE_270}
+
+_classifier_lock = threading.Lock()
+_classifier = None  # None=未加载，False=不可用，否则为 (session, 输入名)
+
+
+def _ink_bitmap(image):
+    """
+    缩略图的墨迹二值图
+    :return: (bool 数组, 缩放比例 = 原图尺寸 / 缩略图尺寸)；页面几乎空白时返回 (None, 1)
+    """
+    scale = max(1.0, max(image.size) / ANALYSIS_SIDE)
+    gray = image.convert('L')
+    if scale > 1:
+        gray = gray.resize((max(1, int(image.width / scale)), max(1, int(image.height / scale))), Image.BILINEAR)
+    data = np.asarray(gray, dtype=np.float32)
+    # 阈值取背景（均值）与最深墨迹之间的中点，适应不同的纸色与墨色
+    threshold = 0.5 * (float(data.mean()) + float(np.percentile(data, 1)))
+    ink = data < threshold
+    if ink.mean() < 0.002:
+        return None, scale
+    return ink, scale
+
+
+def _profile_variation(profile):
+    """投影轮廓的起伏程度：只统计有墨迹的范围内，相邻位置差值的均值 / 均值"""
+    nonzero = np.flatnonzero(profile)
+    if len(nonzero) < 2:
+        return 0.0
+    profile = profile[nonzero[0]:nonzero[-1] + 1].astype(np.float32)
+    mean = profile.mean()
+    return float(np.abs(np.diff(profile)).mean() / mean) if mean else 0.0
+
+
+def _line_bands(ink, max_lines=SAMPLE_LINES):
+    """
+    按行投影切分文本行（横排页面）
+    :return: [(y1, y2, x1, x2)]，按墨迹量从多到少取前 max_lines 行
+    """
+    rows = ink.sum(axis=1)
+    active = rows > max(1, 0.02 * ink.shape[1])
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], active.astype(np.int8), [0]))))
+    bands = []
+    for y1, y2 in zip(edges[0::2], edges[1::2]):
+        if y2 - y1 < 3:  # 噪点、分隔线
+            continue
+        cols = np.flatnonzero(ink[y1:y2].any(axis=0))
+        # 宽度至少为高度的两倍才像文本行（排除图片、印章等）
+        if len(cols) and cols[-1] - cols[0] >= 2 * (y2 - y1):
+            bands.append((int(rows[y1:y2].sum()), y1, y2, int(cols[0]), int(cols[-1]) + 1))
+    bands.sort(reverse=True)
+    return [band[1:] for band in bands[:max_lines]]
+
+
+def _get_classifier():
+    """方向分类模型（ONNX 引擎的 cls 模型，单线程会话）；不可用时返回 None"""
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            _classifier = False
+            try:
+                import onnxruntime
+                from ocr_model_sets import get_model_paths
+                path = get_model_paths()["cls"]
+                if path:
+                    options = onnxruntime.SessionOptions()
+                    options.intra_op_num_threads = 1
+                    session = onnxruntime.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+                    _classifier = (session, session.get_inputs()[0].name)
+            except Exception as e:
+                print(f"⚠️ 方向分类模型不可用，整页正倒改用墨迹分布判断: {e}")
+        return _classifier or None
+
+
+def _is_upside_down(image, ink, scale):
+    """
+    判断横排页面是否倒置
+    :param image: 原图（已转为横排）
+    :param ink: 对应的墨迹二值图
+    :param scale: 原图尺寸 / 墨迹图尺寸
+    :return: True / False；证据不足时返回 None
+    """
+    bands = _line_bands(ink)
+    if not bands:
+        return None
+
+    classifier = _get_classifier()
+    if classifier is not None:
+        from ocr_engine_onnx import OnnxOCREngine
+        session, input_name = classifier
+        crops = []
+        for y1, y2, x1, x2 in bands:
+            top, bottom = int(y1 * scale), int(np.ceil(y2 * scale))
+            pad = max(2, (bottom - top) // 4)
+            top, bottom = max(0, top - pad), min(image.height, bottom + pad)
+            # 取行首一段（约为分类模型输入的宽高比），避免整行被压缩
+            left = int(x1 * scale)
+            right = min(image.width, int(np.ceil(x2 * scale)), left + 6 * (bottom - top))
+            crops.append(image.crop((left, top, right, bottom)).convert('RGB'))
+        probs = session.run(None, {input_name: OnnxOCREngine._cls_input(crops)})[0]
+        flipped = float(probs[:, 1].mean())
+        if abs(flipped - 0.5) < 0.1:
+            return None
+        return flipped > 0.5
+
+    # 墨迹启发式：拉丁字母墨迹最密的 x 高度区贴近基线，升部又比降部高，
+    # 因此正向文本行下边缘四分之一的墨迹多于上边缘
+    top = bottom = 0
+    for y1, y2, x1, x2 in bands:
+        quarter = max(1, (y2 - y1) // 4)
+        top += int(ink[y1:y1 + quarter, x1:x2].sum())
+        bottom += int(ink[y2 - quarter:y2, x1:x2].sum())
+    if bottom > top * EDGE_MARGIN:
+        return False
+    if top > bottom * EDGE_MARGIN:
+        return True
+    return None
+
+
+def detect_page_rotation(image):
+    """
+    判断页面需要旋转多少度才能转正
+    :param image: PIL Image
+    :return: 逆时针旋转角度 0 / 90 / 180 / 270（无法判断时为 0）
+    """
+    ink, scale = _ink_bitmap(image)
+    if ink is None:
+        return 0
+
+    rotation = 0
+    if _profile_variation(ink.sum(axis=0)) > AXIS_MARGIN * _profile_variation(ink.sum(axis=1)):
+        # 竖向页面：先逆时针转 90° 成为横排，再判断正倒（倒置则实际需要转 270°）
+        rotation = 90
+        image = image.transpose(_TRANSPOSE[90])
+        ink = np.rot90(ink)
+
+    upside_down = _is_upside_down(image, ink, scale)
+    if upside_down:
+        rotation = (rotation + 180) % 360
+    return rotation
+
+
+def correct_page_orientation(image):
+    """
+    把整页旋转的页面转正（已处理过的图片直接返回）
+    :param image: PIL Image
+    :return: 转正后的 PIL Image（image.info[ORIENTATION_INFO_KEY] 记录旋转的角度）
+    """
+    if ORIENTATION_INFO_KEY in image.info:
+        return image
+    try:
+        rotation = detect_page_rotation(image)
+    except Exception as e:
+        print(f"⚠️ 页面方向判断失败，保持原样: {e}")
+        rotation = 0
+    if rotation:
+        image = image.transpose(_TRANSPOSE[rotation])
+    image.info[ORIENTATION_INFO_KEY] = rotation
+    return image
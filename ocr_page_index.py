@@ -0,0 +1,103 @@
+"""
+整页识别结果索引
+整页只调用一次引擎，保留全部文本行框与置信度，再用 NumPy 批量计算文本行与用户矩形的相交面积，
+把文本分配给各个 OCRRect。矩形新增、删除后直接重新分配，无需再次调用引擎。
+
+分配规则：
+  - 文本行框（四点坐标取外接矩形）与区域的相交面积 / 文本行面积 >= min_overlap 时归属该区域
+  - 区域内的文本按阅读顺序排列：先按行（纵向中心接近的视为同一行），行内从左到右
+"""
+
+import numpy as np
+
+
+class PageOCRIndex:
+    """一页的文本行框索引"""
+
+    def __init__(self, texts, boxes, scores):
+        """
+        :param texts: 文本列表
+        :param boxes: (N, 4) 数组，每行为 x1, y1, x2, y2
+        :param scores: (N,) 置信度数组
+        """
+        self.texts = list(texts)
+        self.boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        self.scores = np.asarray(scores, dtype=np.float32).reshape(-1)
+
+    @classmethod
+    def from_result(cls, result):
+        """
+        从 OCRResult 构建索引（四点坐标取外接矩形）
+        :param result: OCRResult（应带坐标）
+        :return: PageOCRIndex
+        """
+        quads = np.frombuffer(result.boxes, dtype=np.float32).reshape(-1, 4, 2)
+        boxes = np.concatenate([quads.min(axis=1), quads.max(axis=1)], axis=1)
+        return cls(result.texts, boxes, np.frombuffer(result.scores, dtype=np.float32))
+
+    @classmethod
+    def from_lines(cls, lines):
+        """
+        从引擎返回的文本行列表构建索引
+        :param lines: OCRResult 或 [{"text": 文本, "box": 四点坐标, "score": 置信度}, ...]
+        :return: PageOCRIndex；文本行缺少坐标（如部分在线引擎）时返回 None
+        """
+        from ocr_result import OCRResult
+        return OCRResult.from_any(lines).to_page_index()
+
+    def __len__(self):
+        return len(self.texts)
+
+    def overlap_matrix(self, rects):
+        """
+        计算文本行被各区域覆盖的比例
+        :param rects: OCRRect对象或坐标元组 (x1, y1, x2, y2) 列表
+        :return: (M, N) 数组，[i, j] 为第 j 个文本行落在第 i 个区域内的面积比例
+        """
+        regions = np.asarray(
+            [r.get_coords() if hasattr(r, 'get_coords') else r for r in rects], dtype=np.float32
+        ).reshape(-1, 4)
+        if not len(self.texts) or not len(regions):
+            return np.zeros((len(regions), len(self.texts)), dtype=np.float32)
+
+        r = regions[:, None, :]
+        b = self.boxes[None, :, :]
+        inter_w = np.clip(np.minimum(r[..., 2], b[..., 2]) - np.maximum(r[..., 0], b[..., 0]), 0, None)
+        inter_h = np.clip(np.minimum(r[..., 3], b[..., 3]) - np.maximum(r[..., 1], b[..., 1]), 0, None)
+        areas = np.maximum((self.boxes[:, 2] - self.boxes[:, 0]) * (self.boxes[:, 3] - self.boxes[:, 1]), 1.0)
+        return inter_w * inter_h / areas[None, :]
+
+    def _reading_order(self, indices):
+        """按阅读顺序排列文本行，返回 [[同一行的文本行下标], ...]"""
+        boxes = self.boxes[indices]
+        centers = (boxes[:, 1] + boxes[:, 3]) / 2
+        heights = boxes[:, 3] - boxes[:, 1]
+        rows = []
+        for k in np.argsort(centers, kind='stable'):
+            if rows and abs(centers[k] - rows[-1][0]) <= heights[rows[-1][1][0]] / 2:
+                rows[-1][1].append(k)
+            else:
+                rows.append((centers[k], [k]))
+        return [[indices[k] for k in sorted(row, key=lambda k: boxes[k, 0])] for _, row in rows]
+
+    def join(self, rects, min_overlap=0.5):
+        """
+        把文本分配给各区域
+        :param rects: OCRRect对象或坐标元组列表
+        :param min_overlap: 文本行面积落在区域内的最小比例
+        :return: 与 rects 顺序一致的文本列表（同一行以空格连接，多行以换行连接）
+        """
+        matrix = self.overlap_matrix(rects) >= min_overlap
+        texts = []
+        for row in matrix:
+            indices = np.flatnonzero(row)
+            if not len(indices):
+                texts.append("")
+                continue
+            lines = self._reading_order(indices)
+            texts.append("\n".join(" ".join(self.texts[j] for j in line) for line in lines))
+        return texts
+
+    def query(self, rect, min_overlap=0.5):
+        """取单个区域的文本"""
+        return self.join([rect], min_overlap)[0]
@@ -0,0 +1,128 @@
+"""
+线程安全的流水线式管道客户端
+PPOCR_pipe 在多个线程同时调用 runDict 时会并发写 stdin、竞争 readline，
+导致响应与请求错配。本模块的客户端独占引擎管道：
+  - 所有请求经同一把写锁按顺序写入 stdin，同时登记到待响应队列
+  - 后台读线程逐行读取 stdout，按先进先出把响应交给对应的 Future
+  - 多个请求可以同时在途，引擎处理完一个请求后无需等待 Python 解析结果即可处理下一个
+
+引擎按请求顺序逐个处理并逐行输出结果，因此 FIFO 匹配即可保证响应不会错配。
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import Future
+from json import loads as jsonLoads, dumps as jsonDumps
+from PPOCR_api import PPOCR_pipe, GetOcrApi
+
+
+class PipelinedOCRClient(PPOCR_pipe):
+    """流水线式管道客户端（一把写锁 + 一个后台读线程，返回 Future）"""
+
+    def __init__(self, exePath: str, modelsPath: str = None, argument: dict = None):
+        """
+        启动引擎进程（握手完成后启动后台读线程）
+        参数同 PPOCR_pipe
+        """
+        self._write_lock = threading.Lock()    # 保证"登记+写入"的原子性与顺序
+        self._pending_lock = threading.Lock()  # 保护待响应队列
+        self._pending = deque()  # 已写入、等待响应的 Future（与写入顺序一致）
+        super().__init__(exePath, modelsPath, argument)
+        self._reader = threading.Thread(target=self._read_loop, name="PipelinedOCRReader", daemon=True)
+        self._reader.start()
+
+    @property
+    def in_flight(self) -> int:
+        """在途请求数"""
+        return len(self._pending)
+
+    def submitDict(self, writeDict: dict) -> Future:
+        """
+        异步发送指令字典
+        :param writeDict: 指令字典
+        :return: Future，结果为 {"code": 识别码, "data": 内容列表或错误信息字符串}
+        """
+        future = Future()
+        writeBytes = (jsonDumps(writeDict, ensure_ascii=True, indent=None) + "\n").encode("utf-8")
+        with self._write_lock:
+            ret = self.ret
+            if not ret:
+                future.set_result({"code": 901, "data": "引擎实例不存在。"})
+                return future
+            if ret.poll() is not None:
+                future.set_result({"code": 902, "data": "子进程已崩溃。"})
+                return future
+            # 先登记再写入：读线程看到的响应顺序与登记顺序一致
+            with self._pending_lock:
+                self._pending.append(future)
+            try:
+                ret.stdin.write(writeBytes)
+                ret.stdin.flush()
+            except Exception as e:
+                with self._pending_lock:
+                    if future in self._pending:
+                        self._pending.remove(future)
+                future.set_result({
+                    "code": 902,
+                    "data": f"向识别器进程传入指令失败，疑似子进程已崩溃。{e}",
+                })
+        return future
+
+    def runDict(self, writeDict: dict):
+        """同步发送指令字典（可在多个线程中同时调用）"""
+        return self.submitDict(writeDict).result()
+
+    def submit(self, imgPath: str) -> Future:
+        return self.submitDict({"image_path": imgPath})
+
+    def submitBase64(self, imageBase64: str) -> Future:
+        return self.submitDict({"image_base64": imageBase64})
+
+    def _read_loop(self):
+        """后台读线程：逐行读取响应并按顺序交付"""
+        ret = self.ret
+        while True:
+            try:
+                line = ret.stdout.readline()
+            except Exception as e:
+                self._fail_pending(903, f"读取识别器进程输出值失败。异常信息：[{e}]")
+                return
+            if not line:  # 管道关闭：子进程退出
+                self._fail_pending(902, "子进程已崩溃。")
+                return
+            getStr = line.decode("utf-8", errors="ignore")
+            try:
+                result = jsonLoads(getStr)
+            except Exception as e:
+                result = {
+                    "code": 904,
+                    "data": f"识别器输出值反序列化JSON失败。异常信息：[{e}]。原始内容：[{getStr}]",
+                }
+            with self._pending_lock:
+                future = self._pending.popleft() if self._pending else None
+            if future is not None:
+                future.set_result(result)
+
+    def _fail_pending(self, code, message):
+        """以错误结果结束所有在途请求"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, deque()
+        for future in pending:
+            future.set_result({"code": code, "data": message})
+
+    def exit(self):
+        """关闭引擎子进程（在途请求以错误结果结束）"""
+        super().exit()
+        if hasattr(self, "_pending_lock"):
+            self._fail_pending(902, "引擎子进程已关闭。")
+
+
+def CreateOcrApi(exePath: str, modelsPath: str = None, argument: dict = None, ipcMode: str = "pipe",
+                 **socketOptions):
+    """
+    获取识别器API对象（管道模式使用线程安全的流水线客户端）
+    参数同 PPOCR_api.GetOcrApi
+    """
+    if ipcMode == "pipe":
+        return PipelinedOCRClient(exePath, modelsPath, argument)
+    return GetOcrApi(exePath, modelsPath, argument, ipcMode, **socketOptions)
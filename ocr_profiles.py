@@ -0,0 +1,101 @@
+"""
+本地引擎性能档位
+把 fast / balanced / accurate 三个档位映射为 PaddleOCR-json 与 RapidOCR-json 的真实启动参数
+（边长限制、线程数、MKLDNN、方向分类、检测阈值等），由引擎进程池在启动子进程时传入。
+
+档位说明：
+  - fast：缩小检测边长、关闭方向分类、提高文本框阈值，适合清晰的扫描件与小区域
+  - balanced：引擎默认附近的参数，方向分类跟随 Config.OCR_USE_ANGLE_CLS
+  - accurate：放大检测边长、开启方向分类，检测阈值使用 Config.OCR_DET_DB_* 的调优值
+启用整页方向预处理（Config.OCR_PAGE_ORIENTATION）时各档位默认关闭方向分类。
+"""
+
+from config import Config
+
+PROFILE_NAMES = ('fast', 'balanced', 'accurate')
+
+
+def get_profile(name=None):
+    """
+    获取档位的通用参数
+    :param name: 档位名称，None表示使用 Config.OCR_PROFILE
+    :return: 参数字典
+    """
+    params = _profile_params(name or getattr(Config, 'OCR_PROFILE', 'balanced'))
+    if getattr(Config, 'OCR_PAGE_ORIENTATION', False) and getattr(Config, 'OCR_PAGE_ORIENTATION_SKIP_CLS', True):
+        params["angle_cls"] = False  # 页面读取时已整页转正，省去逐行方向分类
+    return params
+
+
+def _profile_params(name):
+    """各档位的参数表"""
+    if name == 'fast':
+        return {
+            "limit_side_len": 640,
+            "threads": 2,
+            "mkldnn": True,
+            "angle_cls": False,
+            "det_db_thresh": 0.3,
+            "det_db_box_thresh": 0.6,
+            "det_db_unclip_ratio": 1.5,
+            "rec_batch_num": 6,
+        }
+    if name == 'balanced':
+        return {
+            "limit_side_len": 960,
+            "threads": 4,
+            "mkldnn": True,
+            "angle_cls": getattr(Config, 'OCR_USE_ANGLE_CLS', True),
+            "det_db_thresh": 0.3,
+            "det_db_box_thresh": 0.5,
+            "det_db_unclip_ratio": 1.6,
+            "rec_batch_num": 6,
+        }
+    if name == 'accurate':
+        return {
+            "limit_side_len": 1600,
+            "threads": 8,
+            "mkldnn": True,
+            "angle_cls": True,
+            "det_db_thresh": getattr(Config, 'OCR_DET_DB_THRESH', 0.2),
+            "det_db_box_thresh": getattr(Config, 'OCR_DET_DB_BOX_THRESH', 0.4),
+            "det_db_unclip_ratio": getattr(Config, 'OCR_DET_DB_UNCLIP_RATIO', 2.0),
+            "rec_batch_num": getattr(Config, 'OCR_REC_BATCH_NUM', 6),
+        }
+    raise ValueError(f"未知的性能档位: {name}（可选: {', '.join(PROFILE_NAMES)}）")
+
+
+def build_engine_arguments(engine, profile=None, threads=None):
+    """
+    生成引擎启动参数
+    :param engine: 引擎类型 'paddle' / 'rapid'
+    :param profile: 档位名称，None表示使用 Config.OCR_PROFILE
+    :param threads: 每个进程的线程数（由 CPU 预算分配），None表示使用档位默认值
+    :return: 启动参数字典（传给 PPOCR_pipe 的 argument；布尔值由 PPOCR_pipe 写成 gflags 的 --key=true/false 形式）
+    """
+    p = get_profile(profile)
+    if threads:
+        p["threads"] = threads
+    if engine == 'paddle':
+        return {
+            "limit_side_len": p["limit_side_len"],
+            "cpu_threads": p["threads"],
+            "enable_mkldnn": bool(p["mkldnn"]),
+            "use_angle_cls": bool(p["angle_cls"]),
+            "cls": bool(p["angle_cls"]),
+            "det_db_thresh": p["det_db_thresh"],
+            "det_db_box_thresh": p["det_db_box_thresh"],
+            "det_db_unclip_ratio": p["det_db_unclip_ratio"],
+            "rec_batch_num": p["rec_batch_num"],
+        }
+    if engine == 'rapid':
+        return {
+            "maxSideLen": p["limit_side_len"],
+            "numThread": p["threads"],
+            "doAngle": int(p["angle_cls"]),
+            "mostAngle": int(p["angle_cls"]),
+            "boxThresh": p["det_db_thresh"],
+            "boxScoreThresh": p["det_db_box_thresh"],
+            "unClipRatio": p["det_db_unclip_ratio"],
+        }
+    raise ValueError(f"未知的本地引擎: {engine}")
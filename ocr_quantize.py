@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+ONNX 模型 INT8 量化工具
+
+用法：
+    python ocr_quantize.py quantize --images 样本目录     # 用样本图片校准，静态量化检测/方向分类（识别模型动态量化）
+    python ocr_quantize.py quantize --mode dynamic       # 无需样本，动态量化（仅量化权重）
+    python ocr_quantize.py report --images 样本目录       # FP32 与 INT8 的字符准确率与吞吐量对比
+
+量化模型与原模型放在同一目录，文件名加 .int8 后缀（见 ocr_model_sets），
+设置 Config.OCR_MODEL_SET = 'int8' 后 ONNX 引擎与 RapidOCR-json 即使用量化模型。
+样本目录中与图片同名的 .txt 文件作为标注文本；没有标注时以 FP32 的识别结果为基准。
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+# 确保导入路径正确
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils import FileUtils, ImageUtils
+from ocr_model_sets import variant_filename, get_models_dir, get_model_names
+
+# 可以静态量化的模型；识别模型（CTC 输出）静态量化激活后输出几乎全部塌缩为空白，始终只做动态（权重）量化
+STATIC_MODELS = ('det', 'cls')
+
+# 未提供校准样本时用于测速的输入形状
+SAMPLE_SHAPES = {"det": (1, 3, 960, 736), "cls": (8, 3, 48, 192), "rec": (8, 3, 48, 320)}
+
+
+def load_samples(folder, limit=0):
+    """
+    读取样本图片与标注
+    :param folder: 样本目录
+    :param limit: 最多读取的图片数，0表示全部
+    :return: [(文件名, PIL Image, 标注文本或None)]
+    """
+    samples = []
+    for path in FileUtils.get_files_from_folder(folder):
+        if not FileUtils.is_image_file(path):
+            continue
+        truth_path = os.path.splitext(path)[0] + ".txt"
+        truth = None
+        if os.path.exists(truth_path):
+            with open(truth_path, 'r', encoding='utf-8') as f:
+                truth = f.read()
+        samples.append((os.path.basename(path), ImageUtils.load_image(path).convert('RGB'), truth))
+        if limit and len(samples) >= limit:
+            break
+    return samples
+
+
+class _TensorReader:
+    """量化校准数据：按顺序提供模型输入张量"""
+
+    def __init__(self, input_name, tensors):
+        self.input_name = input_name
+        self._tensors = iter(tensors)
+
+    def get_next(self):
+        tensor = next(self._tensors, None)
+        return None if tensor is None else {self.input_name: tensor}
+
+    def rewind(self):
+        pass
+
+
+def calibration_tensors(engine, samples, max_lines=256, batch_size=8):
+    """
+    用 FP32 引擎的预处理生成检测与方向分类模型的校准输入
+    :param engine: FP32 的 OnnxOCREngine
+    :param samples: load_samples 的返回值
+    :param max_lines: 方向分类校准使用的最多文本行数
+    :param batch_size: 每个方向分类校准张量的文本行数
+    :return: {"det": [张量], "cls": [张量]}
+    """
+    det, lines = [], []
+    for _, image, _ in samples:
+        det.append(engine._det_input(image)[0])
+        boxes, crops = engine._detect_lines(image)
+        lines.extend(crops)
+    lines = lines[:max_lines]
+    return {
+        "det": det,
+        "cls": [engine._cls_input(lines[i:i + batch_size]) for i in range(0, len(lines), batch_size)],
+    }
+
+
+def quantize_model(source, target, mode, tensors=None):
+    """
+    量化单个模型
+    :param source: FP32 模型路径
+    :param target: 输出路径
+    :param mode: 'static'（需要校准张量）/ 'dynamic'
+    :param tensors: 校准输入张量列表
+    """
+    import onnx
+    import onnxruntime
+    from onnxruntime.quantization import (quantize_dynamic, quantize_static, quant_pre_process,
+                                          QuantFormat, QuantType, CalibrationMethod)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 先做形状推断与图优化，量化效果更好；失败时直接量化原模型
+        prepared = os.path.join(tmp, "prepared.onnx")
+        try:
+            quant_pre_process(source, prepared, skip_symbolic_shape=True)
+        except Exception as e:
+            print(f"  ⚠️ 预处理失败，直接量化原模型: {e}")
+            prepared = source
+
+        if mode == 'dynamic' or tensors is None:
+            quantize_dynamic(prepared, target, weight_type=QuantType.QUInt8)
+            return
+
+        input_name = onnxruntime.InferenceSession(source, providers=['CPUExecutionProvider']).get_inputs()[0].name
+        # 按通道量化需要 DequantizeLinear 的 axis 属性（opset 13 起支持），PaddleOCR 导出的模型多为 opset 11/12
+        opset = max((o.version for o in onnx.load(source, load_external_data=False).opset_import
+                     if o.domain in ('', 'ai.onnx')), default=0)
+        quantize_static(
+            prepared, target, _TensorReader(input_name, tensors),
+            quant_format=QuantFormat.QDQ,
+            per_channel=opset >= 13,
+            weight_type=QuantType.QInt8,
+            activation_type=QuantType.QUInt8,
+            calibrate_method=CalibrationMethod.MinMax,
+        )
+
+
+def time_model(path, tensor=None, key='det', repeat=5):
+    """
+    单个模型的平均推理耗时（单线程）
+    :param path: 模型路径
+    :param tensor: 输入张量，None时按 SAMPLE_SHAPES 生成随机输入
+    :param key: 'det' / 'cls' / 'rec'
+    :return: 毫秒
+    """
+    import numpy as np
+    import onnxruntime
+
+    options = onnxruntime.SessionOptions()
+    options.intra_op_num_threads = 1
+    session = onnxruntime.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+    if tensor is None:
+        tensor = np.random.rand(*SAMPLE_SHAPES[key]).astype(np.float32)
+    feed = {session.get_inputs()[0].name: tensor}
+    session.run(None, feed)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        session.run(None, feed)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run_quantize(args):
+    """生成 INT8 模型"""
+    from ocr_engine_onnx import OnnxOCREngine
+
+    models_dir = get_models_dir()
+    names = get_model_names()
+    mode = args.mode or ('static' if args.images else 'dynamic')
+    tensors = {}
+    if mode == 'static':
+        if not args.images:
+            print("❌ 静态量化需要 --images 指定校准样本")
+            sys.exit(1)
+        samples = load_samples(args.images, args.limit)
+        print(f"校准样本: {len(samples)} 张图片")
+        engine = OnnxOCREngine(model_set='fp32')
+        try:
+            tensors = calibration_tensors(engine, samples)
+        finally:
+            engine.close()
+
+    for key in args.models:
+        source = os.path.join(models_dir, names[key])
+        if not os.path.exists(source):
+            print(f"⚠️ 跳过 {key}：模型不存在 {source}")
+            continue
+        model_mode = mode if key in STATIC_MODELS else 'dynamic'
+        if model_mode == 'static' and not tensors.get(key):
+            print(f"⚠️ 跳过 {key}：样本中没有可用于校准的输入")
+            continue
+        target = os.path.join(models_dir, variant_filename(names[key], 'int8'))
+        print(f"正在量化 {key}（{model_mode}）: {names[key]} -> {os.path.basename(target)}")
+        start = time.perf_counter()
+        quantize_model(source, target, model_mode, tensors.get(key) if model_mode == 'static' else None)
+        print(f"✓ 完成，耗时 {time.perf_counter() - start:.1f}s，"
+              f"大小 {os.path.getsize(source) / 1024:.0f}KB -> {os.path.getsize(target) / 1024:.0f}KB")
+
+        # INT8 是否更快取决于 CPU 指令集（VNNI 等），逐个模型测速，较慢的量化模型可以删除（该模型回退到 fp32）
+        feed = tensors[key][0] if tensors.get(key) else None
+        fp32_ms, int8_ms = time_model(source, feed, key), time_model(target, feed, key)
+        print(f"  推理耗时 fp32 {fp32_ms:.0f}ms / int8 {int8_ms:.0f}ms（{fp32_ms / int8_ms:.2f}×）")
+        if int8_ms >= fp32_ms:
+            print(f"  ⚠️ 本机上 INT8 没有加速，可删除 {os.path.basename(target)}")
+
+
+def edit_distance(a, b):
+    """字符级编辑距离"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def _compact(text):
+    """去掉空白后比较（不同引擎的分行、空格不一致不计为错误）"""
+    return "".join((text or "").split())
+
+
+def run_report(args):
+    """FP32 与 INT8 在同一批样本上的字符准确率与吞吐量"""
+    from ocr_engine_onnx import OnnxOCREngine
+
+    samples = load_samples(args.images, args.limit)
+    if not samples:
+        print("❌ 样本目录中没有图片")
+        sys.exit(1)
+    labeled = sum(truth is not None for _, _, truth in samples)
+    print(f"样本: {len(samples)} 张图片（{labeled} 张有标注，其余以 FP32 结果为基准）")
+
+    outputs = {}
+    rows = []
+    for model_set in ('fp32', 'int8'):
+        engine = OnnxOCREngine(model_set=model_set)
+        try:
+            engine.recognize_image(samples[0][1])  # 预热
+            start = time.perf_counter()
+            outputs[model_set] = [engine.recognize_image(image).text for _, image, _ in samples]
+            cost = time.perf_counter() - start
+            models = ", ".join(os.path.basename(engine.paths[k]) for k in ("det", "rec") if engine.paths[k])
+        finally:
+            engine.close()
+
+        errors = total = 0
+        for (_, _, truth), text, reference in zip(samples, outputs[model_set], outputs['fp32']):
+            expected = _compact(truth if truth is not None else reference)
+            errors += edit_distance(_compact(text), expected)
+            total += len(expected)
+        accuracy = 1 - errors / max(1, total)
+        rows.append((model_set, accuracy, len(samples) / cost, cost / len(samples) * 1000, models))
+
+    print(f"\n{'模型集':<8}{'字符准确率':>12}{'吞吐(页/秒)':>14}{'延迟(ms/页)':>14}  模型")
+    for model_set, accuracy, throughput, latency, models in rows:
+        print(f"{model_set:<8}{accuracy:>12.4f}{throughput:>14.2f}{latency:>14.0f}  {models}")
+    if len(rows) == 2:
+        print(f"\nINT8 加速比 {rows[1][2] / rows[0][2]:.2f}×，字符准确率变化 {(rows[1][1] - rows[0][1]) * 100:+.2f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ONNX 模型 INT8 量化")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("quantize", help="生成 INT8 量化模型")
+    p.add_argument("--images", help="校准样本目录（静态量化必需）")
+    p.add_argument("--mode", choices=["static", "dynamic"], help="量化方式，默认有样本时静态、否则动态")
+    p.add_argument("--models", nargs="+", choices=["det", "cls", "rec"], default=["det", "cls", "rec"],
+                   help="要量化的模型")
+    p.add_argument("--limit", type=int, default=50, help="最多使用的样本图片数，0表示全部")
+    p.set_defaults(func=run_quantize)
+
+    p = sub.add_parser("report", help="FP32 与 INT8 的准确率/吞吐量报告")
+    p.add_argument("--images", required=True, help="样本目录（同名 .txt 为标注文本）")
+    p.add_argument("--limit", type=int, default=0, help="最多使用的样本图片数，0表示全部")
+    p.set_defaults(func=run_report)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
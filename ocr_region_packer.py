@@ -0,0 +1,244 @@
+"""
+区域拼图识别（Mosaic）
+模板中的字段区域通常很小（一张发票 8~15 个），逐个发送时每个区域都要承担一次引擎往返和一次检测，
+单次调用的固定开销远大于实际识别耗时。本模块把多个区域裁剪图拼到同一张画布上（区域之间留白分隔），
+只调用一次引擎，再按文本行框的几何位置把结果分回各自的区域：
+  - MosaicPacker：按行（shelf）排布裁剪图，画布边长不超过引擎的 limit_side_len，避免被整体缩小；
+    留白随每行最高的裁剪图增大（至少一个文字高度），防止检测把相邻区域的文字连成同一个文本行
+  - MosaicBatcher：微批处理，短时间窗口内（多个线程/多个页面）到达的区域合并为一次拼图识别；
+    没有其他调用方在识别时立即发送，不为单独的请求等待时间窗口
+
+返回给调用方的是与单独识别格式一致的结果 {"code": 识别码, "data": [{"text", "box", "score"}, ...]}，
+box 已换算回各自裁剪图的坐标。
+"""
+
+import time
+import threading
+from concurrent.futures import Future
+from PIL import Image
+
+
+class MosaicPacker:
+    """把多张裁剪图排布到若干张画布上"""
+
+    def __init__(self, max_side=960, gap=24, margin=16, text_height=56):
+        """
+        :param max_side: 画布最大边长（应不超过引擎的 limit_side_len，否则整张画布会被缩小）
+        :param gap: 相邻裁剪图之间的最小留白
+        :param margin: 画布边缘留白
+        :param text_height: 裁剪图中文字的最大高度（像素，规范化后不超过 OCR_CROP_MAX_TEXT_HEIGHT）；
+                            每行的留白取该行最高裁剪图的高度，但不超过此值
+        """
+        self.max_side = max_side
+        self.gap = gap
+        self.margin = margin
+        self.text_height = text_height
+
+    def row_gap(self, height):
+        """
+        一行裁剪图的留白：检测模型按文字高度的比例扩张文本框，留白小于文字高度时相邻区域的文字会被连成一行
+        :param height: 该行最高的裁剪图高度（单行字段即文字高度）
+        :return: 同一行相邻裁剪图之间、以及该行与下一行之间的留白（像素）
+        """
+        return max(self.gap, min(height, self.text_height))
+
+    def fits(self, crop):
+        """裁剪图能否放进画布（过大的区域应单独识别）"""
+        limit = self.max_side - 2 * self.margin
+        return crop.width <= limit and crop.height <= limit
+
+    def pack(self, crops):
+        """
+        按行排布裁剪图（先按高度降序，行满换行，画布满换新画布）
+        :param crops: PIL Image 列表（均应满足 fits）
+        :return: [(canvas, [(裁剪图下标, (x, y, w, h)), ...]), ...]
+        """
+        order = sorted(range(len(crops)), key=lambda i: crops[i].height, reverse=True)
+        sheets = []  # [(宽, 高, [(下标, x, y)])]
+        placements = None
+        x = y = row_height = gap = used_width = used_height = 0
+
+        for index in order:
+            w, h = crops[index].size
+            if placements is not None and x + w > self.max_side - self.margin:
+                # 换行（与上一行之间留出上一行的留白）
+                x = self.margin
+                y += row_height + gap
+                row_height = 0
+            if placements is None or y + h > self.max_side - self.margin:
+                # 新画布
+                if placements:
+                    sheets.append((used_width, used_height, placements))
+                placements = []
+                x = y = self.margin
+                row_height = used_width = used_height = 0
+            if row_height == 0:
+                # 行首的裁剪图是该行最高的（按高度降序排布）
+                gap = self.row_gap(h)
+            placements.append((index, x, y))
+            x += w + gap
+            row_height = max(row_height, h)
+            used_width = max(used_width, x - gap)
+            used_height = max(used_height, y + h)
+        if placements:
+            sheets.append((used_width, used_height, placements))
+
+        result = []
+        for used_width, used_height, items in sheets:
+            # 全部是灰度截图（见 ImageUtils.normalize_crop）时画布也用单通道
+            mode = 'L' if all(crops[index].mode == 'L' for index, _, _ in items) else 'RGB'
+            canvas = Image.new(mode, (used_width + self.margin, used_height + self.margin), 'white')
+            boxes = []
+            for index, px, py in items:
+                crop = crops[index]
+                canvas.paste(crop.convert(mode) if crop.mode != mode else crop, (px, py))
+                boxes.append((index, (px, py, crop.width, crop.height)))
+            result.append((canvas, boxes))
+        return result
+
+    def split_result(self, result, boxes):
+        """
+        把一张画布的识别结果按几何位置分回各裁剪图
+        :param result: 引擎原始返回
+        :param boxes: pack 返回的 [(下标, (x, y, w, h)), ...]
+        :return: {下标: 结果字典}，box 坐标已换算到裁剪图内
+        """
+        if result.get("code") not in (100, 101):
+            return {index: result for index, _ in boxes}
+
+        # 同一行的裁剪图 y 相同；每行的留白由该行最高的裁剪图决定（见 row_gap）
+        row_heights = {}
+        for _, (px, py, w, h) in boxes:
+            row_heights[py] = max(row_heights.get(py, 0), h)
+
+        lines = {index: [] for index, _ in boxes}
+        for line in result["data"] if result["code"] == 100 else []:
+            points = line.get("box") or []
+            if not points:
+                continue
+            cx = sum(p[0] for p in points) / len(points)
+            cy = sum(p[1] for p in points) / len(points)
+            # 文本行中心落在哪个区域（含所在行的一半留白）就归属哪个区域，有多个时取最近的
+            distance, index, px, py = min(
+                (max(px - cx, 0, cx - px - w) + max(py - cy, 0, cy - py - h), index, px, py)
+                for index, (px, py, w, h) in boxes)
+            if distance > self.row_gap(row_heights[py]) / 2:
+                # 中心不在任何区域附近（如跨过留白连成一行的文本）：归入与文本行框重叠面积最大的区域
+                index, px, py = self._most_overlapping(points, boxes)
+                if index is None:
+                    continue
+            shifted = dict(line)
+            shifted["box"] = [[p[0] - px, p[1] - py] for p in points]
+            lines[index].append(shifted)
+
+        return {
+            index: {"code": 100, "data": data} if data else {"code": 101, "data": ""}
+            for index, data in lines.items()
+        }
+
+    @staticmethod
+    def _most_overlapping(points, boxes):
+        """
+        与文本行框（外接矩形）重叠面积最大的裁剪图
+        :return: (下标, x, y)；与所有裁剪图都不重叠时为 (None, None, None)
+        """
+        left, right = min(p[0] for p in points), max(p[0] for p in points)
+        top, bottom = min(p[1] for p in points), max(p[1] for p in points)
+        best, best_area = (None, None, None), 0
+        for index, (px, py, w, h) in boxes:
+            area = max(0, min(right, px + w) - max(left, px)) * max(0, min(bottom, py + h) - max(top, py))
+            if area > best_area:
+                best, best_area = (index, px, py), area
+        return best
+
+
+class MosaicBatcher:
+    """微批处理：时间窗口内到达的裁剪图合并为一次（或少数几次）拼图识别"""
+
+    def __init__(self, run_images, packer=None, window=0.015, max_items=64):
+        """
+        :param run_images: 函数 run_images([PIL Image]) -> [引擎原始返回]（可并发执行多张画布）
+        :param packer: MosaicPacker，None使用默认参数
+        :param window: 微批时间窗口（秒），有其他调用方正在识别时，第一个请求到达后最多等待这么久再统一发送
+                       （队列在窗口的三分之一时间内没有新请求时提前发送）
+        :param max_items: 单批最多合并的区域数（达到后立即发送）
+        """
+        self._run_images = run_images
+        self.packer = packer or MosaicPacker()
+        self.window = window
+        self.max_items = max_items
+
+        self._lock = threading.Lock()
+        self._queue = []       # [(crop, Future)]
+        self._leader = False   # 是否已有线程负责收集并发送当前批次
+        self._active = 0       # 正在识别（已提交、尚未取得结果）的调用方数
+        self._arrived = threading.Condition(self._lock)
+
+    def recognize(self, crop):
+        """识别单个裁剪图（与其他线程同时到达的区域一起拼图发送）"""
+        return self.recognize_many([crop])[0]
+
+    def recognize_many(self, crops):
+        """
+        识别多个裁剪图
+        :param crops: PIL Image 列表
+        :return: 与输入顺序一致的结果字典列表
+        """
+        futures = [Future() for _ in crops]
+        with self._lock:
+            self._queue.extend(zip(crops, futures))
+            self._active += 1
+            self._arrived.notify()
+            lead = not self._leader
+            if lead:
+                self._leader = True
+        try:
+            if lead:
+                self._lead_batch()
+            return [future.result() for future in futures]
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _lead_batch(self):
+        """
+        作为本批次的负责线程：取出队列并识别
+        只有其他调用方也在识别时（它们随时可能提交新的区域）才等待时间窗口，队列空闲时提前结束
+        """
+        deadline = time.monotonic() + self.window
+        idle = self.window / 3
+        with self._lock:
+            while self._active > 1 and len(self._queue) < self.max_items:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                queued = len(self._queue)
+                self._arrived.wait(min(remaining, idle))
+                if len(self._queue) == queued:
+                    break
+            batch, self._queue = self._queue, []
+            self._leader = False  # 之后到达的请求由下一个线程负责
+
+        try:
+            results = self._run_batch([crop for crop, _ in batch])
+        except Exception as e:
+            results = [{"code": 901, "data": f"拼图识别失败：{e}"}] * len(batch)
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _run_batch(self, crops):
+        """拼图识别一批裁剪图（放不进画布的区域单独发送）"""
+        packable = [i for i, crop in enumerate(crops) if self.packer.fits(crop)]
+        oversized = [i for i, crop in enumerate(crops) if not self.packer.fits(crop)]
+
+        sheets = self.packer.pack([crops[i] for i in packable]) if packable else []
+        images = [canvas for canvas, _ in sheets] + [crops[i] for i in oversized]
+        outputs = self._run_images(images)
+
+        results = [None] * len(crops)
+        for (_, boxes), output in zip(sheets, outputs):
+            for local_index, result in self.packer.split_result(output, boxes).items():
+                results[packable[local_index]] = result
+        for index, output in zip(oversized, outputs[len(sheets):]):
+            results[index] = output
+        return results
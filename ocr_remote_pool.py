@@ -0,0 +1,295 @@
+"""
+远程 OCR 服务器负载均衡
+PPOCR_socket 的 remote://ip:port 只能连接一台 PaddleOCR-json 套接字服务器。
+本模块把多台服务器（Config.OCR_REMOTE_ENDPOINTS）组成一个池：
+  - 每个请求派发给在途请求最少的健康服务器
+  - 连接被拒绝、超时或网络错误的服务器被摘除，等待退避时间后由后台健康检查重新探测，
+    探测成功即重新加入；连续失败时退避时间翻倍（不超过上限）
+  - 健康的服务器也定期探测，空闲时宕机的服务器不必等到真实请求失败才被发现
+  - 识别请求是幂等的，某台服务器失败的请求换另一台健康服务器重试
+
+对外接口与 PPOCR_pipe 一致（run / runBytes / runBase64 / runDict / map / exit），
+可以替换 OCREnginePool 作为引擎封装的 self.ocr。
+"""
+
+import time
+import threading
+from base64 import b64encode
+from concurrent.futures import ThreadPoolExecutor
+from PPOCR_api import PPOCR_socket
+
+# 视为服务器故障的错误码：902=连接被拒绝，903=连接超时，904=网络错误，905=响应不是合法JSON（协议不一致）
+ENDPOINT_FAILURE_CODES = (902, 903, 904, 905)
+
+
+def parse_endpoint(endpoint):
+    """
+    解析服务器地址
+    :param endpoint: 'host:port' 或 'remote://host:port'
+    :return: (host, port)
+    """
+    address = endpoint.strip()
+    if address.startswith("remote://"):
+        address = address[len("remote://"):]
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"远程OCR服务器地址格式错误: {endpoint}（应为 host:port）")
+    if host == "loopback":
+        host = "127.0.0.1"
+    return host, int(port)
+
+
+class _Endpoint:
+    """池中的单台远程服务器"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.address = f"{host}:{port}"
+        self.api = None            # PPOCR_socket（健康检查成功后创建）
+        self.healthy = False
+        self.in_flight = 0         # 已派发未完成的请求数（由池的锁保护）
+        self.last_used = 0.0
+        self.requests = 0          # 累计请求数
+        self.failures = 0          # 连续失败次数（决定退避时间）
+        self.ejections = 0         # 累计摘除次数
+        self.retry_at = 0.0        # 摘除后下次探测的时间
+        self.checked_at = 0.0      # 上次健康检查的时间
+        self.last_error = ""
+
+
+class RemoteEndpointPool:
+    """多台远程 OCR 服务器的负载均衡池（与 PPOCR_pipe 接口兼容）"""
+
+    def __init__(self, endpoints, connect_timeout=3.0, request_timeout=60, health_interval=10,
+                 backoff=5, max_backoff=300, pipeline_depth=2):
+        """
+        初始化并探测所有服务器（至少一台可用，否则抛出异常）
+        :param endpoints: 服务器地址列表，如 ['192.168.1.10:1224', '192.168.1.11:1224']
+        :param connect_timeout: 建立连接的超时秒数
+        :param request_timeout: 等待识别结果的超时秒数，0表示不限
+        :param health_interval: 健康检查间隔（秒），0表示不做后台检查（摘除的服务器不会自动恢复）
+        :param backoff: 摘除后首次重新探测前的等待秒数，连续失败时翻倍
+        :param max_backoff: 退避时间上限（秒）
+        :param pipeline_depth: 每台服务器同时在途的请求数（决定 map 的并发度）
+        """
+        if not endpoints:
+            raise ValueError("未配置远程OCR服务器")
+        self.connect_timeout = connect_timeout
+        self.request_timeout = request_timeout or None
+        self.health_interval = health_interval
+        self.backoff = backoff
+        self.max_backoff = max(backoff, max_backoff)
+        self.pipeline_depth = max(1, pipeline_depth)
+
+        self._endpoints = [_Endpoint(*parse_endpoint(endpoint)) for endpoint in endpoints]
+        self._lock = threading.Lock()
+        self._closed = False
+        self._executor = None
+
+        # 并行探测，避免不可达的服务器逐个等待连接超时
+        with ThreadPoolExecutor(max_workers=len(self._endpoints)) as executor:
+            list(executor.map(self._probe, self._endpoints))
+        if not any(endpoint.healthy for endpoint in self._endpoints):
+            errors = "; ".join(f"{e.address}: {e.last_error}" for e in self._endpoints)
+            self._close_apis()
+            raise Exception(f"没有可用的远程OCR服务器（{errors}）")
+
+        self._stop_event = threading.Event()
+        self._checker = None
+        if self.health_interval:
+            self._checker = threading.Thread(target=self._health_loop, name="RemoteEndpointHealth", daemon=True)
+            self._checker.start()
+
+    # ---- 健康检查 ----
+    def _connect(self, endpoint):
+        """连接服务器（PPOCR_socket 在远程模式下会先发送空指令确认服务器可用）"""
+        return PPOCR_socket(f"remote://{endpoint.address}",
+                            connectTimeout=self.connect_timeout, readTimeout=self.request_timeout)
+
+    def _probe(self, endpoint):
+        """
+        探测一台服务器：已连接时发送空指令，未连接时重新连接
+        :return: 是否可用
+        """
+        endpoint.checked_at = time.monotonic()
+        try:
+            if endpoint.api is None:
+                api = self._connect(endpoint)
+            else:
+                api = endpoint.api
+                result = api.runDict({})
+                if result["code"] in ENDPOINT_FAILURE_CODES:
+                    raise Exception(result["data"])
+        except Exception as e:
+            self._mark_failed(endpoint, str(e))
+            return False
+
+        with self._lock:
+            if self._closed:
+                api.exit()
+                return False
+            recovered = not endpoint.healthy and endpoint.ejections > 0
+            endpoint.api = api
+            endpoint.healthy = True
+            endpoint.failures = 0
+            endpoint.last_error = ""
+        if recovered:
+            print(f"✓ 远程OCR服务器已恢复: {endpoint.address}")
+        return True
+
+    def _mark_failed(self, endpoint, reason):
+        """摘除服务器，按连续失败次数计算下次探测时间"""
+        with self._lock:
+            was_healthy = endpoint.healthy
+            endpoint.healthy = False
+            endpoint.failures += 1
+            endpoint.last_error = reason
+            delay = min(self.max_backoff, self.backoff * 2 ** (endpoint.failures - 1))
+            endpoint.retry_at = time.monotonic() + delay
+            if was_healthy:
+                endpoint.ejections += 1
+        if was_healthy:
+            print(f"⚠️ 远程OCR服务器 {endpoint.address} 不可用，已摘除（{delay:.0f} 秒后重试）: {reason}")
+
+    def _health_loop(self):
+        """后台健康检查：探测到期的摘除服务器与空闲的健康服务器"""
+        interval = max(0.5, min(self.health_interval, self.backoff) / 2)
+        while not self._stop_event.wait(interval):
+            now = time.monotonic()
+            with self._lock:
+                due = [e for e in self._endpoints
+                       if (not e.healthy and now >= e.retry_at)
+                       or (e.healthy and e.in_flight == 0 and now - e.checked_at >= self.health_interval)]
+            for endpoint in due:
+                if self._stop_event.is_set():
+                    return
+                self._probe(endpoint)
+
+    # ---- 派发 ----
+    def _acquire(self, exclude):
+        """选出在途请求最少的健康服务器，并登记一个在途请求；没有可用服务器时返回 None"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("远程OCR服务器池已关闭")
+            candidates = [e for e in self._endpoints if e.healthy and e not in exclude]
+            if not candidates:
+                return None
+            endpoint = min(candidates, key=lambda e: (e.in_flight, e.last_used))
+            endpoint.in_flight += 1
+            endpoint.requests += 1
+            endpoint.last_used = time.monotonic()
+            return endpoint
+
+    def _release(self, endpoint):
+        with self._lock:
+            endpoint.in_flight -= 1
+            endpoint.checked_at = time.monotonic()  # 正常响应即可视为一次成功的检查
+
+    @property
+    def size(self):
+        """当前健康的服务器数"""
+        with self._lock:
+            return sum(e.healthy for e in self._endpoints)
+
+    @property
+    def max_size(self):
+        """服务器总数"""
+        return len(self._endpoints)
+
+    def stats(self):
+        """
+        服务器池状态
+        :return: {"size", "max_size", "endpoints": [{"address", "healthy", "in_flight", "requests",
+                  "ejections", "last_error"}]}
+        """
+        with self._lock:
+            return {
+                "size": sum(e.healthy for e in self._endpoints),
+                "max_size": len(self._endpoints),
+                "endpoints": [{
+                    "address": e.address,
+                    "healthy": e.healthy,
+                    "in_flight": e.in_flight,
+                    "requests": e.requests,
+                    "ejections": e.ejections,
+                    "last_error": e.last_error,
+                } for e in self._endpoints],
+            }
+
+    # ---- 识别接口（与 PPOCR_pipe 一致） ----
+    def runDict(self, writeDict: dict):
+        """将指令派发给最空闲的健康服务器，服务器故障时换另一台重试"""
+        tried = []
+        result = {"code": 902, "data": "没有可用的远程OCR服务器"}
+        while True:
+            try:
+                endpoint = self._acquire(tried)
+            except Exception as e:
+                return {"code": 901, "data": f"远程OCR服务器池不可用：{e}"}
+            if endpoint is None:
+                return result
+            tried.append(endpoint)
+            try:
+                result = endpoint.api.runDict(writeDict)
+            except Exception as e:
+                result = {"code": 904, "data": f"网络错误：{e}"}
+            finally:
+                self._release(endpoint)
+            if result["code"] not in ENDPOINT_FAILURE_CODES:
+                return result
+            self._mark_failed(endpoint, str(result["data"]))
+
+    def run(self, imgPath: str):
+        return self.runDict({"image_path": imgPath})
+
+    def runBase64(self, imageBase64: str):
+        return self.runDict({"image_base64": imageBase64})
+
+    def runBytes(self, imageBytes):
+        return self.runBase64(b64encode(imageBytes).decode("utf-8"))
+
+    def map(self, func, items):
+        """
+        并发执行 func(item)，请求分散到各服务器，结果按输入顺序返回
+        :param func: 单个任务函数（内部调用本池的 run* 方法）
+        :param items: 任务参数列表
+        :return: 结果列表
+        """
+        items = list(items)
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=len(self._endpoints) * self.pipeline_depth,
+                                                    thread_name_prefix="RemoteEndpointPool")
+            executor = self._executor
+        return list(executor.map(func, items))
+
+    def _close_apis(self):
+        for endpoint in self._endpoints:
+            api, endpoint.api = endpoint.api, None
+            endpoint.healthy = False
+            if api is not None:
+                try:
+                    api.exit()
+                except Exception as e:
+                    print(f"[Error] 关闭远程连接失败: {e}")
+
+    def exit(self):
+        """停止健康检查并关闭所有连接"""
+        if not hasattr(self, '_lock'):  # 初始化未完成
+            return
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if hasattr(self, '_stop_event'):
+            self._stop_event.set()
+        self._close_apis()
+        if executor:
+            executor.shutdown(wait=False)
+
+    def __del__(self):
+        self.exit()
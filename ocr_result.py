@@ -0,0 +1,234 @@
+"""
+统一的OCR识别结果
+各引擎的返回格式差异很大（PaddleOCR-json/RapidOCR-json 的 {"code","data"}、在线引擎的字典列表、纯文本），
+这里统一为紧凑的 OCRResult：文本列表 + array 存储的四点坐标与置信度（不再为每一行创建字典）。
+文本行框与置信度全程保留，缓存、区域重新分配、导出都可以复用同一份结果，无需重新识别。
+
+兼容旧用法：OCRResult 可迭代、可按下标取行，OCRLine 支持 line["text"] / line.get("box")。
+
+引擎内部捕获的错误（引擎崩溃、返回错误码、API请求失败）不再与"没有文字"混为一谈：
+整图结果为带 error 的空 OCRResult，区域文本为 OCRError（与 "" 相等，调用方无需区分），
+自适应路由用 is_failure() 判断引擎是否失败并切换到其他引擎。
+"""
+
+import math
+from array import array
+
+# 无坐标信息的文本行（如 DeepSeek 全图识别）用 NaN 占位
+_NO_BOX = (math.nan,) * 8
+
+
+class OCRLine:
+    """单个文本行（由 OCRResult 按需生成）"""
+
+    __slots__ = ('text', 'box', 'score')
+
+    def __init__(self, text, box, score):
+        self.text = text
+        self.box = box      # [[x, y], ...] 四点坐标，无坐标时为 None
+        self.score = score
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def to_dict(self):
+        return {"text": self.text, "box": self.box, "score": self.score}
+
+    def __repr__(self):
+        return f"OCRLine({self.text!r}, score={self.score:.3f})"
+
+
+class OCRError(str):
+    """识别失败的区域文本：与 "" 相等，error 属性为失败原因"""
+
+    def __new__(cls, error=""):
+        text = super().__new__(cls, "")
+        text.error = str(error)
+        return text
+
+    def __repr__(self):
+        return f"OCRError({self.error!r})"
+
+
+class OCRResult:
+    """一次识别的全部文本行（文本 + 四点坐标 + 置信度）"""
+
+    __slots__ = ('texts', 'boxes', 'scores', 'error')
+
+    def __init__(self, texts=None, boxes=None, scores=None):
+        """
+        :param texts: 文本列表
+        :param boxes: array('f')，每行 8 个数（四点 x, y），无坐标为 NaN
+        :param scores: array('f')，每行的置信度
+        """
+        self.texts = texts if texts is not None else []
+        self.boxes = boxes if boxes is not None else array('f')
+        self.scores = scores if scores is not None else array('f')
+        self.error = None  # 识别失败的原因；成功（包括没有文字）时为 None
+
+    @classmethod
+    def failed(cls, error):
+        """
+        识别失败的结果（空结果，带失败原因）
+        :param error: 失败原因
+        """
+        result = cls()
+        result.error = str(error)
+        return result
+
+    # ---- 构建 ----
+    def append(self, text, box=None, score=1.0):
+        """
+        添加一行
+        :param text: 文本
+        :param box: 四点坐标 [[x, y], ...]，None表示无坐标
+        :param score: 置信度
+        """
+        self.texts.append(text)
+        self.boxes.extend((c for point in box[:4] for c in point[:2]) if box else _NO_BOX)
+        self.scores.append(score if score is not None else 1.0)
+
+    @classmethod
+    def from_lines(cls, lines):
+        """
+        从字典列表构建
+        支持 {"text", "box", "score"}（本地引擎）、{"text", "confidence"}、
+        {"text", "confidence", "position": {"x","y","w","h"}}（阿里云）
+        """
+        result = cls()
+        for line in lines or []:
+            text = (line.get("text") or "").strip()
+            if not text:
+                continue
+            box = line.get("box")
+            position = line.get("position")
+            if not box and position:
+                x, y, w, h = (position.get(k, 0) for k in ("x", "y", "w", "h"))
+                box = [[x, y], [x + w, y], [x + w, y + h], [x, y + h]]
+            result.append(text, box, line.get("score", line.get("confidence")))
+        return result
+
+    @classmethod
+    def from_engine(cls, response):
+        """从 PaddleOCR-json / RapidOCR-json 的原始返回构建（无文字时为空结果，失败时为带 error 的空结果）"""
+        code = response.get("code")
+        if code == 100:
+            return cls.from_lines(response["data"])
+        if code == 101:
+            return cls()
+        return cls.failed(f"code={code}, data={response.get('data')}")
+
+    @classmethod
+    def from_text(cls, text, score=1.0):
+        """从纯文本构建（无坐标）"""
+        result = cls()
+        for line in (text or "").splitlines():
+            if line.strip():
+                result.append(line.strip(), None, score)
+        return result
+
+    @classmethod
+    def from_any(cls, value):
+        """
+        把任意引擎的返回统一为 OCRResult
+        :param value: OCRResult / 引擎原始返回 {"code","data"} / 阿里云 {"items"} / 字典列表 / 文本
+        :return: OCRResult（无法识别的格式为空结果）
+        """
+        if isinstance(value, OCRResult):
+            return value
+        if isinstance(value, str):
+            return cls.from_text(value)
+        if isinstance(value, dict):
+            if "code" in value:
+                return cls.from_engine(value)
+            if "items" in value:
+                return cls.from_lines(value["items"])
+            return cls()
+        if isinstance(value, (list, tuple)):
+            return cls.from_lines(line for line in value if isinstance(line, dict))
+        return cls()
+
+    # ---- 访问 ----
+    def __len__(self):
+        return len(self.texts)
+
+    def __bool__(self):
+        return bool(self.texts)
+
+    def box(self, i):
+        """第 i 行的四点坐标（无坐标时为 None）"""
+        coords = self.boxes[i * 8:(i + 1) * 8]
+        if math.isnan(coords[0]):
+            return None
+        return [[coords[k], coords[k + 1]] for k in range(0, 8, 2)]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self.texts)
+        return OCRLine(self.texts[i], self.box(i), self.scores[i])
+
+    def __iter__(self):
+        for i in range(len(self.texts)):
+            yield self[i]
+
+    @property
+    def has_boxes(self):
+        """是否所有文本行都带坐标（可用于按区域分配文本；空结果视为是）"""
+        return not any(math.isnan(self.boxes[i * 8]) for i in range(len(self.texts)))
+
+    @property
+    def text(self):
+        """全部文本（多行以换行连接）"""
+        return "\n".join(self.texts)
+
+    def to_lines(self):
+        """转换为字典列表"""
+        return [line.to_dict() for line in self]
+
+    def to_json(self):
+        """序列化为可JSON保存的字典（坐标保持扁平数组）"""
+        return {"texts": list(self.texts), "boxes": self.boxes.tolist(), "scores": self.scores.tolist()}
+
+    @classmethod
+    def from_json(cls, data):
+        """从 to_json 的结果恢复"""
+        return cls(list(data.get("texts", [])), array('f', data.get("boxes", [])), array('f', data.get("scores", [])))
+
+    def to_page_index(self):
+        """
+        构建可按区域取文本的整页索引
+        :return: PageOCRIndex；文本行缺少坐标时返回 None
+        """
+        if not self.has_boxes:
+            return None
+        from ocr_page_index import PageOCRIndex
+        return PageOCRIndex.from_result(self)
+
+    def __repr__(self):
+        if self.error is not None:
+            return f"OCRResult(error={self.error!r})"
+        return f"OCRResult({len(self.texts)} lines)"
+
+
+def is_failure(value):
+    """
+    识别结果是否表示引擎失败（而不是没有文字）
+    :param value: OCRResult / 区域文本 / {rect: text} / 批量识别的结果列表；None 视为失败
+    :return: bool
+    """
+    if value is None:
+        return True
+    if isinstance(value, OCRResult):
+        return value.error is not None
+    if isinstance(value, str):
+        return isinstance(value, OCRError)
+    if isinstance(value, dict):
+        return any(isinstance(text, OCRError) for text in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(is_failure(item) for item in value)
+    return False
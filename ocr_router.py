@@ -0,0 +1,262 @@
+"""
+自适应引擎路由
+OCREngineManager 默认把所有请求交给当前引擎；开启路由（Config.OCR_ROUTING_ENABLED）后每个请求按实时状态选择引擎：
+  - 每个引擎记录延迟与错误率的指数滑动平均（EWMA）、在途请求数（排队深度）
+  - 按策略排序可用引擎（Config.OCR_ROUTING_POLICY）：
+      local-first：本地引擎优先，同类之间选预计耗时最短的
+      fastest：预计耗时最短（EWMA延迟 × (在途请求数 + 1)，按错误率加罚）
+      cheapest：按次计费最低的优先（本地 < 自建服务器 < 在线服务），同价之间选预计耗时最短的
+  - 请求出错、超时（Config.OCR_ROUTING_TIMEOUT）或返回失败结果时，换下一个引擎重试；
+    连续失败的引擎进入冷却期（退避时间翻倍，不超过上限），冷却结束后再参与路由
+  - 设置了超时时每个请求在独立线程中执行，超时从请求真正开始时计算；超时的请求无法中断，在后台继续运行，
+    每个引擎最多保留 Config.OCR_ROUTING_MAX_ABANDONED 个，达到上限时该引擎不再接收请求，直到有请求结束
+  - 路由决策、故障切换次数与各引擎状态见 metrics()
+"""
+
+import time
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+ROUTING_POLICIES = ('local-first', 'fastest', 'cheapest')
+
+# 相对单次成本（本地引擎不计费，自建服务器只有网络与运维开销，在线服务按次计费）
+ENGINE_COSTS = {'paddle': 0, 'rapid': 0, 'onnx': 0, 'remote': 1, 'deepseek': 5, 'aliyun': 10}
+
+# 还没有延迟数据的引擎按该值（秒）乐观估计，使每个引擎都至少被尝试一次
+DEFAULT_LATENCY = 0.001
+
+
+class _EngineStats:
+    """单个引擎的路由状态（由路由器的锁保护）"""
+
+    def __init__(self):
+        self.latency = None        # 成功请求延迟的 EWMA（秒）
+        self.error_rate = 0.0      # 失败率的 EWMA
+        self.in_flight = 0         # 已派发未完成的请求数
+        self.abandoned = 0         # 已超时、仍在后台运行的请求数
+        self.requests = 0          # 累计派发次数
+        self.failures = 0          # 累计失败次数
+        self.consecutive_failures = 0
+        self.retry_at = 0.0        # 冷却结束时间
+        self.last_error = ""
+
+
+class EngineRouter:
+    """按延迟、错误率与排队深度在多个引擎之间路由请求，出错时自动切换"""
+
+    def __init__(self, get_engines, policy='local-first', alpha=0.2, timeout=30, backoff=5, max_backoff=300,
+                 max_abandoned=4):
+        """
+        :param get_engines: 返回可用引擎的函数 f() -> [(引擎类型, 引擎实例, 是否在线服务)]
+        :param policy: 路由策略，见 ROUTING_POLICIES
+        :param alpha: EWMA 平滑系数（越大越偏重最近的请求）
+        :param timeout: 单次请求的超时秒数，超时即切换到下一个引擎（原请求在后台继续完成），0表示不限
+        :param backoff: 引擎失败后的冷却秒数，连续失败时翻倍
+        :param max_backoff: 冷却时间上限（秒）
+        :param max_abandoned: 每个引擎最多保留的超时未结束请求数（每个占用一个线程），达到上限时跳过该引擎
+        """
+        if policy not in ROUTING_POLICIES:
+            raise ValueError(f"未知的路由策略: {policy}（可选: {', '.join(ROUTING_POLICIES)}）")
+        self.get_engines = get_engines
+        self.policy = policy
+        self.alpha = alpha
+        self.timeout = timeout or None
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_abandoned = max_abandoned
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._decisions = {}       # {引擎类型: 作为首选的次数}
+        self._failovers = 0        # 切换到下一个引擎的次数
+        self._exhausted = 0        # 所有引擎都失败的请求数
+
+    @classmethod
+    def from_config(cls, get_engines):
+        """按 Config.OCR_ROUTING_* 创建"""
+        from config import Config
+        return cls(
+            get_engines,
+            policy=getattr(Config, 'OCR_ROUTING_POLICY', 'local-first'),
+            alpha=getattr(Config, 'OCR_ROUTING_EWMA_ALPHA', 0.2),
+            timeout=getattr(Config, 'OCR_ROUTING_TIMEOUT', 30),
+            backoff=getattr(Config, 'OCR_ROUTING_BACKOFF', 5),
+            max_backoff=getattr(Config, 'OCR_ROUTING_MAX_BACKOFF', 300),
+            max_abandoned=getattr(Config, 'OCR_ROUTING_MAX_ABANDONED', 4),
+        )
+
+    def _get_stats(self, engine_type):
+        stats = self._stats.get(engine_type)
+        if stats is None:
+            stats = self._stats[engine_type] = _EngineStats()
+        return stats
+
+    def _expected_latency(self, stats):
+        """预计耗时：EWMA延迟 × 排队深度，按错误率加罚（失败的请求还要再走一遍其他引擎）"""
+        latency = DEFAULT_LATENCY if stats.latency is None else stats.latency
+        return latency * (stats.in_flight + 1) / max(0.05, 1.0 - stats.error_rate)
+
+    def rank(self, engines):
+        """
+        按策略排序引擎（冷却中、超时未结束的请求已达上限的引擎排在最后，按冷却结束时间先后）
+        :param engines: [(引擎类型, 引擎实例, 是否在线服务)]
+        :return: 排序后的同一列表
+        """
+        now = time.monotonic()
+        with self._lock:
+            def key(item):
+                engine_type, _, is_online = item
+                stats = self._get_stats(engine_type)
+                cooling = stats.retry_at > now
+                saturated = self.timeout is not None and stats.abandoned >= self.max_abandoned
+                expected = self._expected_latency(stats)
+                if self.policy == 'local-first':
+                    order = (is_online, expected)
+                elif self.policy == 'cheapest':
+                    order = (ENGINE_COSTS.get(engine_type, 1), expected)
+                else:
+                    order = (expected,)
+                return (cooling or saturated, stats.retry_at if cooling else 0) + order
+            return sorted(engines, key=key)
+
+    def _begin(self, engine_type):
+        """登记一次派发；引擎超时未结束的请求已达上限时不派发"""
+        with self._lock:
+            stats = self._get_stats(engine_type)
+            if self.timeout is not None and stats.abandoned >= self.max_abandoned:
+                return False
+            stats.in_flight += 1
+            stats.requests += 1
+            return True
+
+    def _invoke(self, engine_type, call, engine):
+        """执行请求，结束时（包括超时后在后台完成时）减少在途请求数"""
+        try:
+            return call(engine)
+        finally:
+            with self._lock:
+                self._get_stats(engine_type).in_flight -= 1
+
+    def _finish(self, engine_type, elapsed, error=None, timed_out=False):
+        """登记一次请求的结果：更新 EWMA；失败时按连续失败次数进入冷却"""
+        with self._lock:
+            stats = self._get_stats(engine_type)
+            stats.error_rate += self.alpha * ((error is not None) - stats.error_rate)
+            if error is None:
+                stats.latency = elapsed if stats.latency is None else \
+                    stats.latency + self.alpha * (elapsed - stats.latency)
+                stats.consecutive_failures = 0
+                stats.retry_at = 0.0
+                return
+            # 超时的请求耗时至少为超时时间，也计入延迟（很快就报错的请求不计入，否则故障引擎显得更快）
+            if timed_out and stats.latency is not None:
+                stats.latency += self.alpha * (elapsed - stats.latency)
+            stats.failures += 1
+            stats.consecutive_failures += 1
+            stats.last_error = error
+            delay = min(self.max_backoff, self.backoff * 2 ** (stats.consecutive_failures - 1))
+            stats.retry_at = time.monotonic() + delay
+
+    def _run(self, engine_type, call, engine):
+        """
+        执行一次请求；设置了超时时在独立线程中执行（不经过共享线程池排队，超时从请求开始时计算），
+        超时抛出 TimeoutError，请求在后台继续运行并计入该引擎的 abandoned
+        """
+        if self.timeout is None:
+            return self._invoke(engine_type, call, engine)
+
+        future = Future()
+
+        def target():
+            try:
+                future.set_result(self._invoke(engine_type, call, engine))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=target, name=f"OCRRouter-{engine_type}", daemon=True).start()
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._get_stats(engine_type).abandoned += 1
+            future.add_done_callback(lambda _: self._release_abandoned(engine_type))
+            raise
+
+    def _release_abandoned(self, engine_type):
+        """超时的请求在后台结束"""
+        with self._lock:
+            self._get_stats(engine_type).abandoned -= 1
+
+    def call(self, call, failed=None):
+        """
+        把请求派发给最合适的引擎，失败时依次换下一个
+        :param call: 执行请求的函数 f(引擎实例) -> 结果
+        :param failed: 判断结果是否表示失败的函数 f(结果) -> bool（引擎内部捕获异常后返回的空结果等），None表示只看异常
+        :return: 第一个成功的结果；全部失败时返回最后一个引擎的结果（最后一个引擎出错或超时时抛出 RuntimeError）
+        """
+        engines = self.rank(self.get_engines())
+        if not engines:
+            raise RuntimeError("没有可用的OCR引擎")
+        with self._lock:
+            self._decisions[engines[0][0]] = self._decisions.get(engines[0][0], 0) + 1
+
+        result, last_error = None, None
+        for attempt, (engine_type, engine, _) in enumerate(engines):
+            if attempt:
+                with self._lock:
+                    self._failovers += 1
+                print(f"⚠️ 路由切换到引擎 {engine_type}（上一个引擎: {last_error}）")
+            if not self._begin(engine_type):
+                last_error = f"{engine_type} 有 {self.max_abandoned} 个超时请求尚未结束"
+                result = None
+                continue
+            start = time.monotonic()
+            try:
+                result = self._run(engine_type, call, engine)
+            except FutureTimeoutError:
+                last_error = f"{engine_type} 超时（{self.timeout:g} 秒）"
+                self._finish(engine_type, time.monotonic() - start, last_error, timed_out=True)
+                result = None
+                continue
+            except Exception as e:
+                last_error = f"{engine_type}: {e}"
+                self._finish(engine_type, time.monotonic() - start, last_error)
+                result = None
+                continue
+            if failed is not None and failed(result):
+                last_error = f"{engine_type} 返回失败结果"
+                self._finish(engine_type, time.monotonic() - start, last_error)
+                continue
+            self._finish(engine_type, time.monotonic() - start)
+            return result
+
+        with self._lock:
+            self._exhausted += 1
+        if result is None and last_error is not None:
+            raise RuntimeError(f"所有引擎均失败，最后的错误: {last_error}")
+        return result
+
+    def metrics(self):
+        """
+        路由状态
+        :return: {"policy", "decisions": {引擎类型: 作为首选的次数}, "failovers": 切换次数, "exhausted": 全部失败的请求数,
+                  "engines": {引擎类型: {"latency_ms", "error_rate", "in_flight", "abandoned", "requests",
+                  "failures", "cooling_down", "last_error"}}}
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "policy": self.policy,
+                "decisions": dict(self._decisions),
+                "failovers": self._failovers,
+                "exhausted": self._exhausted,
+                "engines": {engine_type: {
+                    "latency_ms": None if s.latency is None else s.latency * 1000,
+                    "error_rate": s.error_rate,
+                    "in_flight": s.in_flight,
+                    "abandoned": s.abandoned,
+                    "requests": s.requests,
+                    "failures": s.failures,
+                    "cooling_down": max(0.0, s.retry_at - now),
+                    "last_error": s.last_error,
+                } for engine_type, s in self._stats.items()},
+            }
@@ -24,6 +24,7 @@ class OCRInitWorker(QThread):
     """后台线程：初始化OCR引擎（不阻塞UI）"""
     finished = Signal(object)  # 全部初始化完成，传递OCREngineManager实例
     primary_init_finished = Signal(object)  # 首选引擎初始化完成，传递OCREngineManager实例
+    engine_ready = Signal(str, bool)  # 某个后台引擎启动结束，传递引擎类型与是否成功
     error = Signal(str)  # 初始化失败，传递错误消息
     
     def run(self):
@@ -50,8 +51,8 @@ class OCRInitWorker(QThread):
             if self.isInterruptionRequested():
                 return
             
-            # 继续在后台初始化其他引擎
-            manager.init_background_engines()
+            # 继续在后台并行初始化其他引擎（各自就绪时单独通知；lazy 模式下不启动）
+            manager.init_background_engines(on_ready=self.engine_ready.emit)
             
             # 检查是否已请求中断
             if self.isInterruptionRequested():
@@ -242,11 +243,12 @@ class RectSelectionLabel(QLabel):
 class OCRWorker(QThread):
     """后台线程：执行OCR识别任务"""
     finished = Signal(object, str)  # 识别完成，传递(rect, text)
+    page_result = Signal(str, object)  # 全图识别结果，传递(文件路径, OCRResult)，可复用于区域分配
     error = Signal(str)
     
-    def __init__(self, ocr_engine, image, rect, is_full_image=False):
+    def __init__(self, ocr_manager, image, rect, is_full_image=False):
         super().__init__()
-        self.ocr = ocr_engine
+        self.ocr = ocr_manager  # 经由管理器识别：空白区域预过滤、自适应路由对框选区域同样生效
         self.image = image
         self.rect = rect  # OCRRect对象 或 None(全图)
         self.is_full_image = is_full_image
@@ -254,33 +256,41 @@ class OCRWorker(QThread):
     def run(self):
         try:
             if self.is_full_image:
-                # 识别全图
+                # 识别全图（管理器返回统一的 OCRResult）
                 res = self.ocr.recognize_image(self.image)
-                lines = []
-                if res and isinstance(res, list) and len(res) > 0:
-                    # 处理RapidOCR格式
-                    if isinstance(res[0], list):
-                        for item in res[0]:
-                            if isinstance(item, (list, tuple)) and len(item) >= 2:
-                                text = item[1][0] if isinstance(item[1], (list, tuple)) else item[1]
-                                lines.append(text)
-                    # 处理EasyOCR格式
-                    elif isinstance(res[0], dict) and 'text' in res[0]:
-                        for item in res:
-                            if isinstance(item, dict) and 'text' in item:
-                                lines.append(item['text'])
+                if res is not None and isinstance(self.image, str):
+                    self.page_result.emit(self.image, res)
                 
-                text = " ".join(lines) if lines else "(未识别到文字)"
+                text = " ".join(res.texts) if res else "(未识别到文字)"
                 self.finished.emit(None, text)
             else:
                 # 识别区域
                 if self.rect:
-                    text = self.ocr.recognize_region(self.image, (self.rect.x1, self.rect.y1, self.rect.x2, self.rect.y2))
+                    # 传入OCRRect对象，本地引擎按区域的 lang 属性选择语言模型；明显空白的区域不交给引擎
+                    text = self.ocr.recognize_region(self.image, self.rect)
                     self.finished.emit(self.rect, text or "")
         except Exception as e:
             self.error.emit(str(e))
 
 
+class PageOCRWorker(QThread):
+    """后台线程：整页识别一次，生成可按区域取文本的索引（整页模式）"""
+    finished = Signal(str, object, object)  # 识别完成，传递(文件路径, 识别语言, PageOCRIndex或None)
+    error = Signal(str)
+    
+    def __init__(self, ocr_manager, path, lang=None):
+        super().__init__()
+        self.ocr_manager = ocr_manager
+        self.path = path
+        self.lang = lang  # 识别语言，None表示默认语言
+        
+    def run(self):
+        try:
+            self.finished.emit(self.path, self.lang, self.ocr_manager.recognize_page(self.path, lang=self.lang))
+        except Exception as e:
+            self.error.emit(str(e))
+
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -294,6 +304,9 @@ class MainWindow(QMainWindow):
         self.cur_pix: QPixmap | None = None
         self.rects: List[OCRRect] = []  # 当前图片的区域
         self.all_ocr_results: dict = {}  # 所有文件的OCR结果 {file_path: {"rects": [OCRRect], "status": str}}
+        self.page_indexes: dict = {}  # 整页识别结果 {(file_path, lang): PageOCRIndex}（整页模式下框选区域直接从中取文本；lang为None表示默认语言）
+        self._page_waiting_rects: dict = {}  # 等待整页识别完成的区域 {(file_path, lang): [OCRRect]}
+        self.region_lang = None  # 新框选区域的识别语言（None表示默认语言 Config.OCR_LANG）
         
         # 延迟初始化OCR引擎（加快启动速度）
         self.ocr_manager = None
@@ -349,6 +362,14 @@ class MainWindow(QMainWindow):
         self.engine_combo.setMinimumWidth(120)
         tb.addWidget(self.engine_combo)
         
+        # 添加识别语言下拉框（仅本地引擎可用，作用于之后框选的区域）
+        tb.addWidget(QLabel("识别语言:"))
+        self.lang_combo = QComboBox()
+        self.lang_combo.setMinimumWidth(90)
+        self.lang_combo.setEnabled(False)
+        self.lang_combo.currentIndexChanged.connect(self.on_lang_changed)
+        tb.addWidget(self.lang_combo)
+        
         # 添加状态标签
         self.engine_status_label = QLabel("引擎: 初始化中...")
         self.engine_status_label.setStyleSheet("color: orange; font-weight: bold;")
@@ -424,6 +445,7 @@ class MainWindow(QMainWindow):
         # 创建并启动工作线程
         self._ocr_worker = OCRInitWorker()
         self._ocr_worker.primary_init_finished.connect(self._on_primary_ocr_ready)
+        self._ocr_worker.engine_ready.connect(self._on_engine_ready)
         self._ocr_worker.finished.connect(self._on_ocr_init_finished)
         self._ocr_worker.error.connect(self._on_ocr_init_error)
         self._ocr_worker.start()
@@ -440,6 +462,12 @@ class MainWindow(QMainWindow):
         
         self.statusBar().showMessage("✓ 默认OCR引擎已就绪", 3000)
     
+    def _on_engine_ready(self, engine_type, ok):
+        """单个后台引擎启动结束的回调"""
+        name = next((info.name for et, info in self.ocr_manager.ENGINE_INFO.items() if et.value == engine_type),
+                    engine_type)
+        self.statusBar().showMessage(f"✓ {name} 已就绪" if ok else f"❌ {name} 初始化失败", 3000)
+    
     def _on_ocr_init_finished(self, manager):
         """所有OCR引擎初始化完成的回调"""
         # 再次更新UI以显示所有可用引擎
@@ -485,7 +513,8 @@ class MainWindow(QMainWindow):
             )
             return False
         
-        if not self.ocr or not self.ocr.is_ready():
+        # 由管理器判断：启用自适应路由时当前引擎不可用也可以交给其他就绪的引擎
+        if not self.ocr_manager or not self.ocr_manager.is_ready():
             QMessageBox.warning(self, "OCR未就绪", "OCR引擎未就绪，请稍后再试。")
             return False
         return True
@@ -534,6 +563,31 @@ class MainWindow(QMainWindow):
         self.engine_combo.blockSignals(False)
         
         self._update_engine_status_label()
+        self._update_lang_combo()
+    
+    def _update_lang_combo(self):
+        """更新识别语言下拉框（只列出当前引擎模型齐全的语言）"""
+        self.lang_combo.blockSignals(True)
+        self.lang_combo.clear()
+        languages = self.ocr_manager.get_supported_languages() if self.ocr_manager else {}
+        default_lang = getattr(Config, 'OCR_LANG', 'ch')
+        for lang, name in languages.items():
+            self.lang_combo.addItem(name, lang)
+        if self.region_lang not in languages:
+            self.region_lang = None
+        current = self.lang_combo.findData(self.region_lang or default_lang)
+        if current >= 0:
+            self.lang_combo.setCurrentIndex(current)
+        self.lang_combo.setEnabled(len(languages) > 1)
+        self.lang_combo.blockSignals(False)
+    
+    def on_lang_changed(self, index: int):
+        """处理识别语言变化：之后框选的区域使用新语言"""
+        lang = self.lang_combo.itemData(index)
+        if not lang:
+            return
+        self.region_lang = None if lang == getattr(Config, 'OCR_LANG', 'ch') else lang
+        self.statusBar().showMessage(f"识别语言: {self.lang_combo.itemText(index)}（作用于之后框选的区域）", 3000)
     
     def on_engine_changed(self, display_text: str):
         """处理引擎选择变化"""
@@ -559,7 +613,9 @@ class MainWindow(QMainWindow):
         try:
             if self.ocr_manager.set_engine(engine_type):
                 self.ocr = self.ocr_manager.current_engine
+                self.page_indexes.clear()  # 整页识别结果与引擎相关，切换后失效
                 self._update_engine_status_label()
+                self._update_lang_combo()
                 self.statusBar().showMessage(f"已切换到 {display_text}")
             else:
                 QMessageBox.warning(self, "切换失败", f"無法切换到 {display_text}")
@@ -722,13 +778,19 @@ class MainWindow(QMainWindow):
         if img_rect.width() < Config.MIN_RECT_SIZE or img_rect.height() < Config.MIN_RECT_SIZE:
             return
         ocr_rect = OCRRect(img_rect.x(), img_rect.y(), img_rect.x()+img_rect.width(), img_rect.y()+img_rect.height())
+        ocr_rect.lang = self.region_lang
         self.rects.append(ocr_rect)
         
+        # 整页模式：从整页识别结果中直接取文本（尚未识别时先整页识别一次）
+        if self._is_page_mode():
+            self._recognize_rects_from_page([ocr_rect])
+            return
+        
         # 异步识别
         self.statusBar().showMessage("正在识别...")
         self.update_current_status("识别中...")
         
-        worker = OCRWorker(self.ocr, self.cur_pil, ocr_rect, is_full_image=False)
+        worker = OCRWorker(self.ocr_manager, self.cur_pil, ocr_rect, is_full_image=False)
         worker.finished.connect(self._on_ocr_finished)
         worker.error.connect(self._on_ocr_error)
         
@@ -763,6 +825,92 @@ class MainWindow(QMainWindow):
         self.statusBar().showMessage("✓ 识别完成", 2000)
         self.update_current_status("已识别")
         
+    @staticmethod
+    def _is_page_mode() -> bool:
+        """是否为整页识别模式（OCR_REGION_MODE='page'）"""
+        return getattr(Config, 'OCR_REGION_MODE', 'crop') == 'page'
+    
+    def _recognize_rects_from_page(self, rects):
+        """
+        整页模式下识别区域：按区域的识别语言分组，每种语言各用该语言的整页结果取文本
+        :param rects: OCRRect列表
+        """
+        if not (0 <= self.cur_index < len(self.files)):
+            return
+        path = self.files[self.cur_index]
+        groups = {}
+        for rect in rects:
+            groups.setdefault(rect.lang, []).append(rect)
+        for lang, group in groups.items():
+            self._recognize_lang_rects_from_page(path, lang, group)
+    
+    def _recognize_lang_rects_from_page(self, path, lang, rects):
+        """
+        用同一语言的整页结果识别区域：已有结果时立即按位置取文本，否则启动一次该语言的整页识别
+        :param path: 文件路径
+        :param lang: 识别语言（None表示默认语言）
+        :param rects: 识别语言均为 lang 的 OCRRect列表
+        """
+        key = (path, lang)
+        index = self.page_indexes.get(key)
+        if index is not None:
+            texts = index.join(rects, getattr(Config, 'OCR_PAGE_MIN_OVERLAP', 0.5))
+            for rect, text in zip(rects, texts):
+                self._on_ocr_finished(rect, text)
+            return
+        
+        self.statusBar().showMessage("正在整页识别...")
+        self.update_current_status("识别中...")
+        waiting = self._page_waiting_rects.setdefault(key, [])
+        waiting.extend(rects)
+        if len(waiting) > len(rects):  # 该页该语言的整页识别已在进行中
+            return
+        
+        worker = PageOCRWorker(self.ocr_manager, path, lang=lang)
+        worker.finished.connect(self._on_page_ocr_finished)
+        worker.error.connect(self._on_ocr_error)
+        self._ocr_tasks.append(worker)
+        worker.finished.connect(lambda: self._cleanup_ocr_task(worker))
+        worker.error.connect(lambda: self._cleanup_ocr_task(worker))
+        worker.error.connect(lambda: self._page_waiting_rects.pop(key, None))
+        worker.start()
+    
+    def _on_page_ocr_finished(self, path, lang, index):
+        """整页识别完成回调：保存结果并为等待中的区域分配文本"""
+        waiting = self._page_waiting_rects.pop((path, lang), [])
+        if index is None:
+            # 当前引擎不返回文本行坐标，退回逐区域识别
+            self.statusBar().showMessage("当前引擎不支持整页模式，改为逐区域识别", 3000)
+            if self.files and self.files[self.cur_index] == path:
+                for r in waiting:
+                    if r in self.rects:
+                        self._start_region_worker(r)
+            return
+        
+        self.page_indexes[(path, lang)] = index
+        if self.files and self.files[self.cur_index] == path:
+            rects = [r for r in waiting if r in self.rects]  # 识别期间被删除的区域不再处理
+            if rects:
+                self._recognize_rects_from_page(rects)
+    
+    def _on_page_result(self, path, result):
+        """全图识别结果带文本行坐标时保存为整页索引，之后框选的默认语言区域可直接取文本"""
+        index = result.to_page_index()
+        if index is not None:
+            self.page_indexes[(path, None)] = index
+    
+    def _start_region_worker(self, rect):
+        """启动单个区域的识别任务"""
+        worker = OCRWorker(self.ocr_manager, self.cur_pil, rect, is_full_image=False)
+        worker.finished.connect(self._on_ocr_finished)
+        worker.error.connect(self._on_ocr_error)
+        
+        self._ocr_tasks.append(worker)
+        worker.finished.connect(lambda: self._cleanup_ocr_task(worker))
+        worker.error.connect(lambda: self._cleanup_ocr_task(worker))
+        
+        worker.start()
+    
     def _on_ocr_error(self, error_msg):
         """OCR识别错误回调"""
         self.statusBar().showMessage(f"✗ 识别失败: {error_msg}")
@@ -850,8 +998,10 @@ class MainWindow(QMainWindow):
         self.update_current_status("识别中...")
         
         if not self.rects:
-            # 没有区域则识别整图
-            worker = OCRWorker(self.ocr, self.cur_pil, None, is_full_image=True)
+            # 没有区域则识别整图：直接传文件路径，由引擎读取原始文件（无需解码再编码）
+            source = self.files[self.cur_index] if 0 <= self.cur_index < len(self.files) else self.cur_pil
+            worker = OCRWorker(self.ocr_manager, source, None, is_full_image=True)
+            worker.page_result.connect(self._on_page_result)
             worker.finished.connect(self._on_ocr_finished)
             worker.error.connect(self._on_ocr_error)
             
@@ -860,13 +1010,19 @@ class MainWindow(QMainWindow):
             worker.error.connect(lambda: self._cleanup_ocr_task(worker))
             
             worker.start()
+        elif self._is_page_mode():
+            # 整页模式：整页识别一次后为所有区域分配文本
+            for r in self.rects:
+                r.text = ""
+            self.result_text.clear()
+            self._recognize_rects_from_page(list(self.rects))
         else:
             # 批量识别所有区域
             # 为简单起见，这里我们对每个区域启动一个任务，或者可以修改Worker支持批量
             # 考虑到区域通常不多，逐个启动是可以的，但更好的方式是Worker支持列表
             # 这里为了保持改动最小，我们循环启动
             for r in self.rects:
-                worker = OCRWorker(self.ocr, self.cur_pil, r, is_full_image=False)
+                worker = OCRWorker(self.ocr_manager, self.cur_pil, r, is_full_image=False)
                 worker.finished.connect(self._on_ocr_finished)
                 worker.error.connect(self._on_ocr_error)
                 
@@ -59,6 +59,13 @@ def ensure_config_file():
         sys.path.insert(0, exe_dir)
 
 
+if __name__ == "__main__" and "--ocr-daemon" in sys.argv:
+    # 打包环境下由主程序进入 OCR 守护进程（见 ocr_daemon.ensure_daemon）
+    ensure_config_file()
+    from ocr_daemon import main as daemon_main
+    daemon_main(sys.argv[sys.argv.index("--ocr-daemon") + 1:])
+    sys.exit(0)
+
 from qt_main import main
 
 if __name__ == "__main__":
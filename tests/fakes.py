@@ -0,0 +1,125 @@
+"""
+测试用的模拟 OCR 引擎与服务器（不依赖真实OCR引擎；ocr_benchmark 的模拟场景也使用这里的实现）
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import threading
+
+
+# 模拟引擎：与 PaddleOCR-json 相同的 JSON 行协议（握手行 + 每个请求一行JSON响应），
+# 按请求顺序串行处理，把 image_base64 原样作为识别文本返回，便于校验响应是否错配；
+# 文本为 __hang__ / __crash__ 时模拟引擎卡死 / 崩溃
+FAKE_ENGINE_SOURCE = r'''
+import sys, json, time
+delay = float(sys.argv[sys.argv.index("--delay") + 1]) if "--delay" in sys.argv else 0.0
+print("OCR init completed.", flush=True)
+for line in sys.stdin:
+    request = json.loads(line)
+    if delay:
+        time.sleep(delay)
+    text = request.get("image_base64", request.get("image_path", ""))
+    if text == "__hang__":
+        time.sleep(3600)
+    if text == "__crash__":
+        sys.exit(1)
+    if not text:
+        print(json.dumps({"code": 101, "data": ""}), flush=True)
+        continue
+    box = [[0, 0], [100, 0], [100, 20], [0, 20]]
+    print(json.dumps({"code": 100, "data": [{"text": text, "box": box, "score": 0.99}]}), flush=True)
+'''
+
+
+def write_fake_engine(directory):
+    """
+    在指定目录生成模拟引擎可执行脚本
+    :param directory: 输出目录
+    :return: 可执行文件路径（可直接传给 PPOCR_pipe / OCREnginePool）
+    """
+    script_path = os.path.join(directory, "fake_ocr_engine.py")
+    with open(script_path, 'w', encoding='utf-8') as f:
+        f.write(FAKE_ENGINE_SOURCE)
+
+    if sys.platform.startswith('win'):
+        exe_path = os.path.join(directory, "fake_ocr_engine.bat")
+        content = f'@"{sys.executable}" "{script_path}" %*\n'
+    else:
+        exe_path = os.path.join(directory, "fake_ocr_engine.sh")
+        content = f'#!/bin/sh\nexec "{sys.executable}" "{script_path}" "$@"\n'
+    with open(exe_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.chmod(exe_path, 0o755)
+    return exe_path
+
+
+class FakeSocketServer:
+    """
+    模拟 PaddleOCR-json 套接字模式服务器（本进程内的线程）：每行一个JSON请求，串行处理，
+    识别文本为服务器地址，便于统计请求分布；空指令立即返回（用于健康检查）；
+    设置 error_code 后服务器仍在线，但每个识别请求都返回该错误码（模拟引擎内部出错）；
+    keep_alive=False 时每次回复后关闭连接；accepted 统计已接受的连接数
+    """
+
+    def __init__(self, port=0, delay=0.02, error_code=None, keep_alive=True):
+        import socketserver
+
+        lock = threading.Lock()
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                with lock:
+                    server.accepted += 1
+                server._connections.add(self.connection)
+                try:
+                    for line in self.rfile:
+                        request = json.loads(line)
+                        if not request:
+                            response = {"code": 200, "data": "empty command"}
+                        else:
+                            with lock:  # 真实引擎一次只处理一张图片
+                                time.sleep(server.delay)
+                            box = [[0, 0], [100, 0], [100, 20], [0, 20]]
+                            response = {"code": 100, "data": [{"text": server.address, "box": box, "score": 0.99}]}
+                            if server.error_code is not None:
+                                response = {"code": server.error_code, "data": "模拟引擎错误"}
+                        self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+                        self.wfile.flush()
+                        if not server.keep_alive:
+                            break
+                except OSError:  # 连接被客户端重置或服务器已停止
+                    pass
+                finally:
+                    server._connections.discard(self.connection)
+
+        class Server(socketserver.ThreadingTCPServer):
+            allow_reuse_address = True
+            daemon_threads = True
+
+        self.delay = delay
+        self.error_code = error_code
+        self.keep_alive = keep_alive
+        self.accepted = 0
+        self._connections = set()
+        self._server = Server(("127.0.0.1", port), Handler)
+        self.port = self._server.server_address[1]
+        self.address = f"127.0.0.1:{self.port}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        """停止服务（模拟服务器宕机；已建立的连接随之失效）"""
+        self._server.shutdown()
+        self._server.server_close()
+        self.drop_connections()
+
+    def drop_connections(self):
+        """服务器主动关闭已建立的连接（服务仍在线，客户端池中的空闲连接随之失效）"""
+        for connection in list(self._connections):
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
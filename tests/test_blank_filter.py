@@ -0,0 +1,67 @@
+"""
+空白区域预过滤（ocr_blank_filter.BlankCropFilter）测试：合成的表单页，区域带模板框线
+"""
+
+import os
+import sys
+
+from PIL import Image, ImageDraw, ImageFont
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import OCRRect
+from ocr_blank_filter import BlankCropFilter
+
+FIELDS = {
+    "blank": OCRRect(20, 20, 620, 80),
+    "one_char": OCRRect(20, 100, 620, 160),
+    "light_text": OCRRect(20, 180, 620, 240),
+    "solid_fill": OCRRect(20, 260, 620, 320),
+    "text": OCRRect(20, 340, 620, 400),
+}
+
+
+def _form_page():
+    image = Image.new('RGB', (640, 420), 'white')
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=32)
+    for rect in FIELDS.values():
+        draw.rectangle(rect.get_coords(), outline='black', width=2)  # 模板框线（统计时向内收缩排除）
+    x1, y1, x2, y2 = FIELDS["one_char"].get_coords()
+    draw.text((x1 + 12, y1 + 12), "7", fill='black', font=font)
+    x1, y1, x2, y2 = FIELDS["light_text"].get_coords()
+    draw.text((x1 + 12, y1 + 12), "light pencil note", fill=(205, 205, 205), font=font)
+    x1, y1, x2, y2 = FIELDS["solid_fill"].get_coords()
+    draw.rectangle((x1, y1, x2, y2), fill=(150, 150, 150), outline='black', width=2)
+    x1, y1, x2, y2 = FIELDS["text"].get_coords()
+    draw.text((x1 + 12, y1 + 12), "Invoice A-1031 1250.00", fill='black', font=font)
+    return image
+
+
+def test_find_blank_classifies_fields():
+    blank = BlankCropFilter().find_blank(_form_page(), list(FIELDS.values()))
+    assert dict(zip(FIELDS, blank.tolist())) == {
+        "blank": True,          # 只有框线
+        "one_char": False,      # 宽字段里只写了一个字符：比例很低，但像素数远多于噪点
+        "light_text": False,    # 浅色文字：墨迹少，但边缘多
+        "solid_fill": True,     # 整块纯色填充：无边缘、灰度几乎不变
+        "text": False,
+    }
+
+
+def test_split_and_stats():
+    blank_filter = BlankCropFilter()
+    rects = list(FIELDS.values())
+    kept, blank = blank_filter.split(_form_page(), rects)
+    assert blank == [FIELDS["blank"], FIELDS["solid_fill"]]
+    assert kept == [FIELDS["one_char"], FIELDS["light_text"], FIELDS["text"]]
+    assert blank_filter.stats() == {"checked": 5, "skipped": 2, "skip_ratio": 0.4}
+
+
+def test_degenerate_rects_and_file_paths():
+    blank_filter = BlankCropFilter()
+    assert blank_filter.find_blank(_form_page(), []).tolist() == []
+    # 面积为0或在页面外的区域没有内容
+    assert blank_filter.find_blank(_form_page(), [(10, 10, 10, 50), (700, 500, 800, 600)]).tolist() == [True, True]
+    # 文件路径（未解码）不做判断，全部交给引擎
+    assert blank_filter.split("page.png", [FIELDS["blank"]]) == ([FIELDS["blank"]], [])
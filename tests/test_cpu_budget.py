@@ -0,0 +1,45 @@
+"""
+CPU 预算（ocr_cpu_budget.CPUBudget）的分配测试：核数只在活跃（收到过请求）的引擎之间划分
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocr_cpu_budget import CPUBudget
+
+
+def test_all_cores_go_to_engines():
+    budget = CPUBudget(total=8)
+    share = budget.register_engine("a", desired_threads=4)
+    assert share == {"cores": 8, "threads": 4, "processes": 2}
+
+
+def test_standby_engine_does_not_shrink_active_engine():
+    """已启动但从未收到请求的备用引擎不缩小正在工作的引擎的份额"""
+    budget = CPUBudget(total=8)
+    changes = []
+    budget.register_engine("active", desired_threads=4, callback=lambda share: changes.append(share))
+    standby = budget.register_engine("standby", desired_threads=4, active=False)
+    assert budget.allocation()["engines"]["active"]["processes"] == 2
+    assert standby["processes"] == 1  # 按转为活跃后的份额启动
+    assert changes == []
+
+    budget.activate_engine("standby")
+    engines = budget.allocation()["engines"]
+    assert engines["active"]["processes"] == engines["standby"]["processes"] == 1
+    assert changes == [{"cores": 4, "threads": 4, "processes": 1}]
+
+    budget.activate_engine("standby")  # 重复调用不再重新分配
+    assert len(changes) == 1
+
+
+def test_unregister_returns_cores():
+    budget = CPUBudget(total=8)
+    changes = []
+    budget.register_engine("a", desired_threads=4, callback=lambda share: changes.append(share))
+    budget.register_engine("b", desired_threads=4)
+    budget.unregister_engine("b")
+    assert changes[-1]["processes"] == 2
+    assert "b" not in budget.allocation()["engines"]
@@ -0,0 +1,105 @@
+"""
+本地引擎进程池（ocr_engine_pool.OCREnginePool）测试：按需扩容、空闲回收与 reconfigure
+使用 tests/fakes.py 中的模拟引擎（原样回显请求内容的子进程）
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocr_engine_pool import OCREnginePool
+from tests.fakes import write_fake_engine
+
+
+@pytest.fixture
+def exe_path(tmp_path):
+    return write_fake_engine(str(tmp_path))
+
+
+def _text(res):
+    return res["data"][0]["text"] if res.get("code") == 100 else None
+
+
+def _concurrent(pool, count):
+    results = [None] * count
+
+    def run(i):
+        results[i] = _text(pool.runBase64(f"req-{i}"))
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=30)
+    return results
+
+
+def test_acquire_spawns_up_to_max_size_then_reaps_idle(exe_path):
+    """所有进程都忙时扩容（不超过 max_size）；空闲超时的多余进程被回收，保留 min_size 个"""
+    pool = OCREnginePool(exe_path, argument={"delay": 0.2}, max_size=3, min_size=1, idle_timeout=0.2)
+    try:
+        assert pool.size == 1
+        assert _concurrent(pool, 6) == [f"req-{i}" for i in range(6)]
+        assert pool.size == 3
+        assert pool.stats()["in_flight"] == [0, 0, 0]
+
+        time.sleep(0.3)
+        pool.reap_idle()
+        assert pool.size == 1
+    finally:
+        pool.exit()
+
+
+def test_idle_worker_is_reused_instead_of_spawning(exe_path):
+    pool = OCREnginePool(exe_path, max_size=4, min_size=1, idle_timeout=0)
+    try:
+        for i in range(5):
+            assert _text(pool.runBase64(f"seq-{i}")) == f"seq-{i}"
+        assert pool.size == 1
+    finally:
+        pool.exit()
+
+
+def test_reconfigure_shrinks_pool_and_updates_arguments(exe_path):
+    pool = OCREnginePool(exe_path, argument={"delay": 0.1}, max_size=3, min_size=1, idle_timeout=0)
+    try:
+        _concurrent(pool, 6)
+        assert pool.size == 3
+        old_executor = pool._executor
+        assert pool.map(lambda i: _text(pool.runBase64(f"m-{i}")), range(4)) == [f"m-{i}" for i in range(4)]
+
+        pool.reconfigure(max_size=1, argument={"delay": 0})
+        assert pool.size == 1 and pool.max_size == 1 and pool.min_size == 1
+        assert pool._argument == {"delay": 0}
+        assert pool._executor is None or pool._executor is not old_executor  # map 的并发度随进程数重建
+
+        # 上限之内不再扩容；新的启动参数用于之后启动的进程
+        assert _concurrent(pool, 4) == [f"req-{i}" for i in range(4)]
+        assert pool.size == 1
+        pool.reconfigure(max_size=2)
+        assert pool.max_size == 2
+    finally:
+        pool.exit()
+
+
+def test_on_first_request_runs_once_and_not_for_warmup(exe_path):
+    calls = []
+    pool = OCREnginePool(exe_path, max_size=1, on_first_request=lambda: calls.append(1))
+    try:
+        assert calls == []  # 预热请求不算
+        pool.runBase64("a")
+        pool.runBase64("b")
+        assert calls == [1]
+    finally:
+        pool.exit()
+
+
+def test_closed_pool_reports_error(exe_path):
+    pool = OCREnginePool(exe_path, max_size=1)
+    pool.exit()
+    assert pool.runBase64("a")["code"] == 901
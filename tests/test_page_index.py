@@ -0,0 +1,49 @@
+"""
+整页识别结果索引（ocr_page_index.PageOCRIndex）的区域分配测试
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import OCRRect
+from ocr_page_index import PageOCRIndex
+from ocr_result import OCRResult
+
+
+def _quad(x1, y1, x2, y2):
+    return [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+
+
+def test_line_overlapping_two_rects_goes_to_the_one_covering_it():
+    """文本行跨两个区域：只归属覆盖比例达到 min_overlap 的区域"""
+    index = PageOCRIndex(["total 1250.00"], [(0, 0, 100, 20)], [0.99])
+    left, right = OCRRect(0, 0, 70, 20), OCRRect(70, 0, 200, 20)
+    assert index.join([left, right]) == ["total 1250.00", ""]
+    # 阈值降低后两个区域都包含该行
+    assert index.join([left, right], min_overlap=0.3) == ["total 1250.00", "total 1250.00"]
+
+
+def test_reading_order_within_a_rect():
+    """区域内的文本先按行、行内从左到右排列"""
+    index = PageOCRIndex(["b", "a", "c"], [(60, 0, 100, 20), (0, 2, 50, 22), (0, 40, 50, 60)], [1, 1, 1])
+    assert index.query((0, 0, 200, 100)) == "a b\nc"
+
+
+def test_rect_without_lines_and_empty_page():
+    index = PageOCRIndex(["a"], [(0, 0, 10, 10)], [1])
+    assert index.join([(100, 100, 200, 200)]) == [""]
+    assert PageOCRIndex([], [], []).join([(0, 0, 10, 10)]) == [""]
+
+
+def test_from_result_uses_bounding_box_of_quad():
+    result = OCRResult()
+    result.append("slanted", [[10, 5], [90, 0], [95, 20], [12, 25]], 0.9)
+    index = result.to_page_index()
+    assert index.boxes.tolist() == [[10, 0, 95, 25]]
+    assert index.query((0, 0, 100, 30)) == "slanted"
+
+
+def test_lines_without_boxes_have_no_index():
+    assert OCRResult.from_text("no coordinates").to_page_index() is None
@@ -0,0 +1,77 @@
+"""
+流水线管道客户端（ocr_pipe_client.PipelinedOCRClient）的并发回归测试
+使用 tests/fakes.py 中的模拟引擎（原样回显请求内容的子进程），不依赖真实OCR引擎
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocr_pipe_client import PipelinedOCRClient
+from tests.fakes import write_fake_engine
+
+THREADS = 16
+REQUESTS_PER_THREAD = 100
+
+
+@pytest.fixture
+def client(tmp_path):
+    client = PipelinedOCRClient(write_fake_engine(str(tmp_path)))
+    yield client
+    client.exit()
+
+
+def _text(res):
+    return res["data"][0]["text"] if res.get("code") == 100 else None
+
+
+def test_concurrent_run_dict_responses_match_requests(client):
+    """多线程同时调用 runDict：每个响应都必须对应自己的请求（不串线、不丢失）"""
+    mismatches = []
+    errors = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(THREADS)
+
+    def hammer(thread_index):
+        try:
+            barrier.wait()
+            for i in range(REQUESTS_PER_THREAD):
+                token = f"t{thread_index}-r{i}"
+                res = client.runDict({"image_base64": token})
+                if _text(res) != token:
+                    with lock:
+                        mismatches.append((token, res))
+        except Exception as e:  # 线程内的异常不会让测试失败，需要收集后断言
+            with lock:
+                errors.append(e)
+
+    threads = [threading.Thread(target=hammer, args=(t,)) for t in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=60)
+
+    assert not any(t.is_alive() for t in threads), "部分线程未在60秒内完成（响应丢失？）"
+    assert not errors
+    assert not mismatches, f"{len(mismatches)} 个错配/失败响应，例如: {mismatches[0]}"
+    assert client.in_flight == 0
+
+
+def test_submitted_futures_resolve_in_any_wait_order(client):
+    """先批量提交再倒序等待：Future 的结果与提交时的请求一一对应"""
+    tokens = [f"req-{i}" for i in range(200)]
+    futures = [client.submitDict({"image_base64": token}) for token in tokens]
+    for token, future in reversed(list(zip(tokens, futures))):
+        assert _text(future.result(timeout=30)) == token
+
+
+def test_requests_after_exit_fail_fast(client):
+    """引擎退出后的请求立即返回错误码，而不是卡住"""
+    assert _text(client.runDict({"image_base64": "before-exit"})) == "before-exit"
+    client.exit()
+    res = client.runDict({"image_base64": "after-exit"})
+    assert res["code"] in (901, 902)
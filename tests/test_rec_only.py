@@ -0,0 +1,66 @@
+"""
+单行区域仅识别通道（LocalOCREngine._get_rec_pool / _verify_rec_only）的回归测试
+使用 tests/fakes.py 中的模拟引擎：每个请求返回一个固定的 100×20 文本框
+"""
+
+import os
+import sys
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocr_cpu_budget import get_cpu_budget
+from ocr_engine_paddle import PaddleOCREngine
+from tests.fakes import write_fake_engine
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """不经过 __init__（需要真实的 PaddleOCR-json.exe），只设置仅识别通道用到的属性"""
+    engine = PaddleOCREngine.__new__(PaddleOCREngine)
+    engine.exe_path = write_fake_engine(str(tmp_path))
+    engine.profile = 'balanced'
+    engine.lang = 'ch'
+    engine.arguments = {}
+    engine._model_arguments = {}
+    engine._budget_name = f"测试引擎@{id(engine):x}"
+    engine.ocr = None
+    engine._init_region_batching()
+    yield engine
+    engine.close()
+
+
+def _budget_names():
+    return set(get_cpu_budget().allocation()["engines"])
+
+
+def test_rec_pool_has_its_own_cpu_share(engine):
+    """仅识别通道在 CPU 预算中单独登记，与主进程池不共用同一份额"""
+    assert engine.rec_only_enabled
+    # 模拟引擎的文本框正好是整张 100×20 截图：视为没有检测框，检查通过
+    assert engine._recognize_lines([Image.new('L', (100, 20), 'white')]) != [None]
+    assert engine._rec_pool is not None
+    assert engine._rec_budget_name in _budget_names()
+
+    engine.close()
+    assert engine._rec_pool is None
+    assert engine._rec_budget_name not in _budget_names()
+
+
+def test_rec_pool_exits_when_detection_still_runs(engine):
+    """引擎仍返回检测框时关闭通道：进程池退出并释放 CPU 份额，而不只是停止使用"""
+    assert engine._recognize_lines([Image.new('L', (300, 40), 'white')]) == [None]
+    assert not engine.rec_only_enabled
+    assert engine._rec_pool is None
+    assert engine._rec_budget_name not in _budget_names()
+
+
+def test_rec_pool_startup_failure_disables_fast_path(engine):
+    """仅识别通道启动失败时改走完整流程，不留下 CPU 份额"""
+    engine.exe_path = engine.exe_path + ".missing"
+    assert engine._recognize_lines([Image.new('L', (100, 20), 'white')]) == [None]
+    assert not engine.rec_only_enabled
+    assert engine._rec_pool is None
+    assert engine._rec_budget_name not in _budget_names()
@@ -0,0 +1,133 @@
+"""
+区域拼图（ocr_region_packer）的排布与结果拆分测试：不调用引擎，直接构造画布上的文本行框
+"""
+
+import os
+import sys
+import threading
+import time
+
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocr_region_packer import MosaicBatcher, MosaicPacker
+
+
+def _line(text, left, top, right, bottom):
+    return {"text": text, "box": [[left, top], [right, top], [right, bottom], [left, bottom]], "score": 0.99}
+
+
+def _texts(split):
+    return {index: [line["text"] for line in result["data"]] if result["code"] == 100 else []
+            for index, result in split.items()}
+
+
+def test_pack_scales_row_gap_with_text_height():
+    """留白随每行最高的裁剪图增大，但不超过 text_height"""
+    packer = MosaicPacker(max_side=960, gap=8, margin=16, text_height=56)
+    crops = [Image.new('L', (200, 40), 'white'), Image.new('L', (200, 40), 'white'),
+             Image.new('L', (200, 100), 'white')]
+    (_, boxes), = packer.pack(crops)
+    placed = dict(boxes)
+    # 第一行最高 100 -> 留白 56；第二个 40 高的裁剪图紧随其后
+    assert placed[2] == (16, 16, 200, 100)
+    assert placed[0][0] == 16 + 200 + 56
+    assert placed[1][0] == placed[0][0] + 200 + 56
+
+
+def test_split_result_maps_lines_back_to_crops():
+    packer = MosaicPacker(gap=8)
+    boxes = [(0, (16, 16, 200, 40)), (1, (272, 16, 200, 40))]
+    result = {"code": 100, "data": [_line("a", 20, 20, 120, 50), _line("b", 280, 20, 400, 50)]}
+    split = packer.split_result(result, boxes)
+    assert _texts(split) == {0: ["a"], 1: ["b"]}
+    assert split[1]["data"][0]["box"][0] == [8, 4]  # 换算到裁剪图内的坐标
+
+
+def test_split_result_uses_each_rows_own_gap():
+    """高行的留白比 gap 大得多：中心落在留白内（超出 gap/2）的文本行仍归属该区域"""
+    packer = MosaicPacker(gap=8, text_height=56)
+    # 第一行高 56 -> 留白 56；第二行 y = 16 + 56 + 56
+    boxes = [(0, (16, 16, 300, 56)), (1, (16, 128, 300, 20))]
+    # 检测框比区域略宽：中心在区域下方 20 像素（> 8/2，< 56/2）
+    result = {"code": 100, "data": [_line("tall", 16, 60, 316, 124)]}
+    assert _texts(packer.split_result(result, boxes)) == {0: ["tall"], 1: []}
+
+
+def test_split_result_line_straddling_a_gap_goes_to_largest_overlap():
+    """跨过留白连成一行的文本行：归入重叠面积最大的区域，而不是丢弃"""
+    packer = MosaicPacker(gap=24, text_height=40)
+    boxes = [(0, (16, 16, 100, 40)), (1, (156, 16, 200, 40))]
+    # 检测框横跨两个区域并向下延伸：中心 (180, 85) 距区域 1 有 29 像素，超出半个留白（20）
+    result = {"code": 100, "data": [_line("merged", 20, 20, 340, 150)]}
+    assert _texts(packer.split_result(result, boxes)) == {0: [], 1: ["merged"]}
+
+
+def test_split_result_line_in_no_crop():
+    """与所有区域都不重叠的文本行（画布边缘的噪声）不归入任何区域"""
+    packer = MosaicPacker(gap=8)
+    boxes = [(0, (16, 16, 200, 40))]
+    result = {"code": 100, "data": [_line("a", 20, 20, 120, 50), _line("noise", 400, 400, 500, 420)]}
+    assert _texts(packer.split_result(result, boxes)) == {0: ["a"]}
+
+
+def test_split_result_empty_and_error_codes():
+    packer = MosaicPacker()
+    boxes = [(0, (16, 16, 200, 40)), (1, (16, 100, 200, 40))]
+    assert packer.split_result({"code": 101, "data": ""}, boxes) == {
+        0: {"code": 101, "data": ""}, 1: {"code": 101, "data": ""}}
+    error = {"code": 902, "data": "引擎错误"}
+    assert packer.split_result(error, boxes) == {0: error, 1: error}
+
+
+def _batcher(window):
+    calls = []
+
+    def run_images(images):
+        calls.append(len(images))
+        return [{"code": 101, "data": ""} for _ in images]
+
+    return MosaicBatcher(run_images, MosaicPacker(), window=window), calls
+
+
+def test_batcher_sends_a_lone_request_immediately():
+    """没有其他调用方时不等待时间窗口"""
+    batcher, calls = _batcher(window=5)
+    start = time.monotonic()
+    assert batcher.recognize(Image.new('L', (100, 30), 'white')) == {"code": 101, "data": ""}
+    assert time.monotonic() - start < 1
+    assert calls == [1]
+
+
+def test_batcher_merges_concurrent_requests():
+    """其他调用方正在识别时，窗口内到达的区域合并为一张画布"""
+    batcher, calls = _batcher(window=5)
+    started, release = threading.Event(), threading.Event()
+    original = batcher._run_images
+
+    def slow_first(images):
+        if not started.is_set():  # 第一个请求一直在识别，之后的调用方都看到有其他调用方在识别
+            started.set()
+            release.wait(5)
+        return original(images)
+
+    batcher._run_images = slow_first
+    first = threading.Thread(target=batcher.recognize, args=(Image.new('L', (100, 30), 'white'),))
+    first.start()
+    started.wait(5)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(batcher.recognize(Image.new('L', (100, 30), 'white'))))
+               for _ in range(4)]
+    start = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+    release.set()
+    first.join(timeout=10)
+
+    assert len(results) == 4
+    assert time.monotonic() - start < 4  # 队列空闲后提前发送，不必等满窗口
+    assert sorted(calls) == [1, 1]       # 第一个请求单独发送；之后的 4 个区域拼成一张画布
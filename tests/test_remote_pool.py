@@ -0,0 +1,90 @@
+"""
+远程服务器负载均衡（ocr_remote_pool.RemoteEndpointPool）测试：摘除、换服务器重试与恢复
+使用 tests/fakes.py 中的模拟套接字服务器（识别文本为服务器地址）
+"""
+
+import os
+import sys
+import time
+from collections import Counter
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocr_remote_pool import RemoteEndpointPool
+from tests.fakes import FakeSocketServer
+
+
+@pytest.fixture
+def servers():
+    servers = [FakeSocketServer(delay=0.005) for _ in range(2)]
+    yield servers
+    for server in servers:
+        server.stop()
+
+
+def _text(result):
+    return result["data"][0]["text"] if result["code"] == 100 else f"code={result['code']}"
+
+
+def _run_all(pool, count=20):
+    return Counter(_text(r) for r in pool.map(lambda _: pool.runBase64("dGVzdA=="), range(count)))
+
+
+def test_requests_are_spread_across_servers(servers):
+    pool = RemoteEndpointPool([s.address for s in servers], health_interval=0)
+    try:
+        assert set(_run_all(pool)) == {s.address for s in servers}
+        assert pool.size == pool.max_size == 2
+    finally:
+        pool.exit()
+
+
+def test_failed_server_is_ejected_and_requests_retry_elsewhere(servers):
+    pool = RemoteEndpointPool([s.address for s in servers], health_interval=0)
+    try:
+        servers[0].stop()
+        # 发往宕机服务器的请求换另一台重试，调用方看不到失败
+        assert _run_all(pool) == Counter({servers[1].address: 20})
+        endpoint = pool.stats()["endpoints"][0]
+        assert not endpoint["healthy"] and endpoint["ejections"] == 1
+        assert pool.size == 1
+    finally:
+        pool.exit()
+
+
+def test_ejected_server_recovers(servers):
+    pool = RemoteEndpointPool([s.address for s in servers], health_interval=0.5, backoff=0.2, max_backoff=0.5)
+    try:
+        victim = servers[0]
+        victim.stop()
+        _run_all(pool)
+        assert pool.size == 1
+
+        servers[0] = FakeSocketServer(port=victim.port, delay=0.005)
+        deadline = time.monotonic() + 10
+        while pool.size < 2 and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert pool.size == 2
+        assert set(_run_all(pool)) == {s.address for s in servers}
+    finally:
+        pool.exit()
+
+
+def test_all_servers_down(servers):
+    for server in servers:
+        server.stop()
+    with pytest.raises(Exception, match="没有可用的远程OCR服务器"):
+        RemoteEndpointPool([s.address for s in servers], connect_timeout=1, health_interval=0)
+
+
+def test_all_servers_fail_after_start(servers):
+    pool = RemoteEndpointPool([s.address for s in servers], health_interval=0)
+    try:
+        for server in servers:
+            server.stop()
+        assert pool.runBase64("dGVzdA==")["code"] in (902, 903, 904)
+        assert pool.size == 0
+    finally:
+        pool.exit()
@@ -0,0 +1,55 @@
+"""
+统一识别结果（ocr_result.OCRResult / OCRError / is_failure）测试
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocr_result import OCRError, OCRResult, is_failure
+
+
+def test_ocr_error_equals_empty_text():
+    """识别失败的区域文本与 "" 相等，调用方无需区分；失败原因保存在 error"""
+    text = OCRError(RuntimeError("engine crashed"))
+    assert text == ""
+    assert not text
+    assert text.error == "engine crashed"
+    assert {"k": text} == {"k": ""}
+
+
+def test_from_engine_codes():
+    ok = OCRResult.from_engine({"code": 100, "data": [{"text": " a ", "box": [[0, 0], [1, 0], [1, 1], [0, 1]],
+                                                        "score": 0.5}]})
+    assert ok.texts == ["a"] and ok.error is None
+    assert ok[0].box == [[0, 0], [1, 0], [1, 1], [0, 1]]
+    empty = OCRResult.from_engine({"code": 101, "data": ""})
+    assert not empty and empty.error is None
+    failed = OCRResult.from_engine({"code": 902, "data": "timeout"})
+    assert not failed and "902" in failed.error
+
+
+def test_is_failure():
+    assert is_failure(None)
+    assert is_failure(OCRResult.failed("x"))
+    assert not is_failure(OCRResult())
+    assert is_failure(OCRError("x"))
+    assert not is_failure("")
+    assert not is_failure("text")
+    assert is_failure({"r1": "text", "r2": OCRError("x")})
+    assert not is_failure({"r1": "", "r2": "text"})
+    assert is_failure([{"r1": "text"}, None])
+    assert is_failure([OCRResult(), OCRResult.failed("x")])
+    assert not is_failure([{}, OCRResult()])
+
+
+def test_json_round_trip_keeps_boxes_and_scores():
+    result = OCRResult.from_lines([{"text": "a", "box": [[0, 0], [4, 0], [4, 2], [0, 2]], "score": 0.75},
+                                   {"text": "b", "confidence": 0.5}])
+    restored = OCRResult.from_json(result.to_json())
+    assert restored.texts == ["a", "b"]
+    assert restored[0].box == [[0, 0], [4, 0], [4, 2], [0, 2]]
+    assert restored[1].box is None
+    assert list(restored.scores) == [0.75, 0.5]
+    assert not restored.has_boxes
@@ -0,0 +1,169 @@
+"""
+自适应路由（ocr_router + OCREngineManager._dispatch）的故障切换回归测试
+参与路由的是真实的 RemoteOCREngine（连接 tests/fakes.py 中的模拟 PaddleOCR-json 服务器），
+引擎内部捕获错误、返回空结果的情况也必须触发切换，而不只是抛出异常的引擎
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config, OCRRect
+from ocr_engine_manager import OCREngineManager
+from ocr_engine_remote import RemoteOCREngine
+from ocr_result import OCRError, is_failure
+from ocr_router import EngineRouter
+from tests.fakes import FakeSocketServer
+
+
+@pytest.fixture
+def servers():
+    """paddle: 作为本地引擎（local-first 策略下的首选）的服务器；remote: 作为远程集群的服务器"""
+    servers = {"paddle": FakeSocketServer(delay=0), "remote": FakeSocketServer(delay=0)}
+    yield servers
+    for server in servers.values():
+        server.stop()
+
+
+@pytest.fixture
+def manager(servers, monkeypatch):
+    engines = []
+
+    def create(engine_type, profile=None):
+        engine = RemoteOCREngine(endpoints=[servers[engine_type.value].address])
+        engines.append(engine)
+        return engine
+
+    monkeypatch.setattr(OCREngineManager, '_check_engine_availability', staticmethod(
+        lambda: OCREngineManager._apply_availability({name: True for name in servers})))
+    monkeypatch.setattr(OCREngineManager, '_create_engine', staticmethod(create))
+    for name, value in (('OCR_ENGINE', 'paddle'), ('OCR_ENGINE_INIT_MODE', 'parallel'),
+                        ('OCR_BLANK_FILTER_ENABLED', False), ('OCR_REGION_MODE', 'crop'),
+                        ('OCR_ROUTING_ENABLED', True), ('OCR_ROUTING_POLICY', 'local-first'),
+                        ('OCR_ROUTING_ENGINES', []), ('OCR_ROUTING_TIMEOUT', 10),
+                        ('OCR_REMOTE_HEALTH_INTERVAL', 0),
+                        ('OCR_MOSAIC_ENABLED', False)):  # 模拟服务器只返回一个固定位置的文本行，每个区域单独请求
+        monkeypatch.setattr(Config, name, value, raising=False)
+
+    manager = OCREngineManager()
+    manager.init_background_engines()
+    yield manager
+    for engine in engines:
+        engine.close()
+
+
+def _page():
+    image = Image.new('RGB', (400, 200), 'white')
+    return image, [OCRRect(10, 10, 190, 60), OCRRect(210, 10, 390, 60), OCRRect(10, 100, 390, 160)]
+
+
+def test_engine_error_code_is_a_failure_not_empty_text(servers, monkeypatch):
+    """引擎返回错误码时，区域文本是 OCRError（与 "" 相等），整图结果带 error"""
+    monkeypatch.setattr(Config, 'OCR_MOSAIC_ENABLED', False, raising=False)
+    servers["paddle"].error_code = 903
+    engine = RemoteOCREngine(endpoints=[servers["paddle"].address])
+    try:
+        image, rects = _page()
+        texts = engine.recognize_regions(image, rects)
+        assert all(isinstance(text, OCRError) and text == "" for text in texts.values())
+        assert is_failure(texts)
+        assert is_failure(engine.recognize_image(image))
+    finally:
+        engine.close()
+
+
+def test_failover_on_engine_error_code(manager, servers):
+    """首选引擎返回错误码（引擎内部捕获、不抛出异常）时切换到下一个引擎"""
+    servers["paddle"].error_code = 903
+    image, rects = _page()
+
+    texts = manager.recognize_regions(image, rects)
+    assert list(texts.values()) == [servers["remote"].address] * len(rects)
+    assert manager.recognize_region(image, rects[0]) == servers["remote"].address
+    assert manager.recognize_image(image).text == servers["remote"].address
+
+    metrics = manager.get_routing_metrics()
+    assert metrics["failovers"] >= 1
+    assert metrics["engines"]["paddle"]["failures"] >= 1
+    assert metrics["engines"]["paddle"]["cooling_down"] > 0
+
+
+def test_failover_when_engine_server_goes_down(manager, servers):
+    """首选引擎的服务器宕机后，后续请求切换到下一个引擎，结果不丢失"""
+    image, rects = _page()
+    assert manager.recognize_regions(image, rects)[rects[0]] == servers["paddle"].address
+
+    servers["paddle"].stop()
+    results = manager.batch_recognize([(image, rects), (image, rects)])
+    assert [list(r.values()) for r in results] == [[servers["remote"].address] * len(rects)] * 2
+    assert manager.get_routing_metrics()["engines"]["paddle"]["failures"] >= 1
+
+
+def test_empty_text_is_not_a_failure(manager, servers):
+    """没有文字（code 101）不是故障，不切换引擎"""
+    servers["paddle"].error_code = 101
+    image, rects = _page()
+    texts = manager.recognize_regions(image, rects)
+    assert list(texts.values()) == [""] * len(rects)
+    assert not is_failure(texts)
+    metrics = manager.get_routing_metrics()
+    assert metrics["failovers"] == 0
+    assert metrics["engines"]["paddle"]["failures"] == 0
+
+
+def test_hung_engine_does_not_starve_healthy_engine():
+    """卡住的引擎超时后切换；超时未结束的请求达到上限后不再派发给它，健康引擎的请求不受影响"""
+    release = threading.Event()
+    started = []
+
+    def run(engine):
+        if engine == "paddle":
+            started.append(1)
+            release.wait(30)
+        else:
+            time.sleep(0.01)
+        return engine
+
+    router = EngineRouter(lambda: [("paddle", "paddle", False), ("onnx", "onnx", False)],
+                          timeout=0.2, backoff=0, max_abandoned=2)
+    results = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(5):
+            result = router.call(run)
+            with lock:
+                results.append(result)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=30)
+
+    metrics = router.metrics()["engines"]
+    assert results == ["onnx"] * 40
+    assert metrics["onnx"]["failures"] == 0
+    # 并发请求在第一个超时之前都已派发，之后只要达到上限就不再派发
+    assert metrics["paddle"]["abandoned"] == len(started) <= 8 + 2
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while router.metrics()["engines"]["paddle"]["abandoned"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert router.metrics()["engines"]["paddle"]["abandoned"] == 0
+
+
+def test_engine_not_ready_is_a_failure(servers):
+    """引擎未就绪（已关闭）时返回失败结果，而不是看起来成功的空结果"""
+    engine = RemoteOCREngine(endpoints=[servers["paddle"].address])
+    engine.close()
+    image, rects = _page()
+    assert is_failure(engine.recognize_image(image))
+    assert is_failure(engine.recognize_region(image, rects[0]))
@@ -0,0 +1,70 @@
+"""
+套接字模式客户端（PPOCR_api.PPOCR_socket）的连接复用测试：
+服务器保持连接时复用，服务器每次回复后关闭连接时不在已失效的连接上发送请求
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PPOCR_api import PPOCR_socket
+from tests.fakes import FakeSocketServer
+
+
+def _connect(server):
+    return PPOCR_socket(f"remote://{server.address}")
+
+
+def _recognize(api):
+    return api.runDict({"image_path": "test.png"})
+
+
+@pytest.fixture
+def keep_alive_server():
+    server = FakeSocketServer(delay=0)
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def closing_server():
+    server = FakeSocketServer(delay=0, keep_alive=False)
+    yield server
+    server.stop()
+
+
+def test_keep_alive_connection_is_reused(keep_alive_server):
+    api = _connect(keep_alive_server)
+    for _ in range(5):
+        assert _recognize(api)["code"] == 100
+    assert keep_alive_server.accepted == 1  # 健康检查与 5 次识别共用一个连接
+    api.exit()
+
+
+def test_server_closing_after_each_reply(closing_server):
+    """服务器每次回复后关闭连接：每个请求都只占用一个新连接，不先在失效的连接上失败一次"""
+    api = _connect(closing_server)
+    for _ in range(5):
+        time.sleep(0.05)  # 让服务器的关闭（EOF）先到达客户端
+        assert _recognize(api)["code"] == 100
+    assert closing_server.accepted == 6
+    time.sleep(0.05)
+    assert api._PPOCR_socket__acquireConnection() == (None, False)  # 池中没有失效的连接
+    api.exit()
+
+
+def test_stale_idle_connection_is_discarded(keep_alive_server):
+    """空闲连接被服务器关闭后，下一个请求直接建立新连接，之后仍保持复用"""
+    api = _connect(keep_alive_server)
+    assert _recognize(api)["code"] == 100
+    keep_alive_server.drop_connections()
+    time.sleep(0.05)
+    assert api._PPOCR_socket__acquireConnection() == (None, False)
+    assert _recognize(api)["code"] == 100
+    assert _recognize(api)["code"] == 100
+    assert keep_alive_server.accepted == 2
+    api.exit()
@@ -4,16 +4,21 @@
 """
 
 import os
+from io import BytesIO
 from pathlib import Path
 from datetime import datetime
 # 延迟导入重型库，减小打包体积
 # import fitz  # PyMuPDF - 改为按需导入
-from PIL import Image
+from PIL import Image, ImageChops
 # import openpyxl - 改为按需导入
 # from openpyxl.styles import Font, Alignment, Border, Side - 改为按需导入
 from config import Config
 
 
+# 本地引擎（PaddleOCR-json / RapidOCR-json，基于OpenCV imdecode）可直接解码的图片格式
+ENGINE_NATIVE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+
+
 class FileUtils:
     """文件处理工具类"""
     
@@ -35,6 +40,12 @@ class FileUtils:
         ext = Path(file_path).suffix.lower()
         return ext in Config.SUPPORTED_PDF_FORMAT
     
+    @staticmethod
+    def is_engine_native_file(file_path):
+        """检查文件是否为本地引擎可直接读取的图片格式（无需Python解码）"""
+        ext = Path(file_path).suffix.lower()
+        return ext in ENGINE_NATIVE_EXTENSIONS
+    
     @staticmethod
     def get_files_from_folder(folder_path, recursive=True):
         """
@@ -108,18 +119,22 @@ class ImageUtils:
     @staticmethod
     def load_image(file_path):
         """
-        加载图片文件
+        加载图片文件（启用 Config.OCR_PAGE_ORIENTATION 时把整页旋转的页面转正）
         :param file_path: 文件路径
         :return: PIL Image对象
         """
         if FileUtils.is_pdf_file(file_path):
-            return ImageUtils.pdf_to_image(file_path)
+            img = ImageUtils.pdf_to_image(file_path)
         else:
             img = Image.open(file_path)
             # 转换为RGB模式
             if img.mode != 'RGB':
                 img = img.convert('RGB')
-            return img
+        
+        if getattr(Config, 'OCR_PAGE_ORIENTATION', False):
+            from ocr_orientation import correct_page_orientation  # 按需导入（依赖numpy）
+            img = correct_page_orientation(img)
+        return img
     
     @staticmethod
     def pdf_to_image(pdf_path, page_num=0, zoom=None):
@@ -190,6 +205,208 @@ class ImageUtils:
         """
         return image.resize((new_width, new_height), Image.Resampling.LANCZOS)
 
+    @staticmethod
+    def sniff_image_format(data):
+        """
+        根据文件头判断图片字节流的格式
+        :param data: 图片字节流
+        :return: 'PNG' / 'JPEG' / 'BMP' / 'TIFF'，无法识别时返回None
+        """
+        if data[:8] == b'\x89PNG\r\n\x1a\n':
+            return 'PNG'
+        if data[:3] == b'\xff\xd8\xff':
+            return 'JPEG'
+        if data[:2] == b'BM':
+            return 'BMP'
+        if data[:4] in (b'II*\x00', b'MM\x00*'):
+            return 'TIFF'
+        return None
+
+    @staticmethod
+    def bmp_size(image):
+        """
+        图片保存为无压缩BMP时的像素数据字节数（每行按4字节对齐）
+        :param image: PIL Image对象
+        :return: 字节数
+        """
+        bits = {'1': 1, 'L': 8, 'P': 8, 'RGB': 24, 'RGBA': 32}.get(image.mode, 24)
+        return (image.width * bits + 31) // 32 * 4 * image.height
+
+    @staticmethod
+    def encode_for_engine(image, mode='auto'):
+        """
+        将图片编码为内存字节流，供本地引擎 runBytes 使用（替代临时PNG文件）
+
+        （磁盘上引擎可直接解码的图片文件由 _run_file 原样发送文件字节，不经过这里）
+
+        auto 模式按开销选择编码：
+          - BMP体积不超过 OCR_BMP_MAX_BYTES（单行字段等小区域）：无压缩BMP（编码几乎只是内存拷贝）
+          - 更大的图片：PNG compress_level=1（BMP体积随面积增长，经 base64 后大区域每张可达数MB，
+            管道传输与引擎解码的开销远超快速压缩的编码耗时）
+
+        :param image: PIL Image对象
+        :param mode: 'auto' / 'bmp' / 'png0' / 'png1'
+        :return: (图片字节流, 格式名)
+        """
+        # BMP/PNG 只支持常见的 8 位模式，其余模式统一转为RGB
+        if image.mode not in ('1', 'L', 'P', 'RGB', 'RGBA'):
+            image = image.convert('RGB')
+
+        if mode == 'auto':
+            max_bytes = getattr(Config, 'OCR_BMP_MAX_BYTES', 65536)
+            mode = 'bmp' if ImageUtils.bmp_size(image) <= max_bytes else 'png1'
+
+        buffer = BytesIO()
+        if mode == 'bmp':
+            image.save(buffer, format='BMP')
+        elif mode == 'png0':
+            image.save(buffer, format='PNG', compress_level=0)
+        else:
+            image.save(buffer, format='PNG', compress_level=1)
+        return buffer.getvalue(), mode
+
+    @staticmethod
+    def _text_row_heights(image, min_row_height=3):
+        """
+        水平投影中各墨迹带（文字行）的高度
+        :param image: PIL Image对象
+        :param min_row_height: 低于该高度（像素）的墨迹带视为表格线/下划线，不计为文字行
+        :return: 高度列表（对比度过低的空白图片为空列表）
+        """
+        import numpy as np
+        gray = np.asarray(image.convert('L'), dtype=np.uint8)
+        low, high = int(gray.min()), int(gray.max())
+        if high - low < 40:
+            return []
+        ink = gray < (low + high) // 2
+        rows = ink.sum(axis=1) > max(1, gray.shape[1] // 200)
+
+        # 连续墨迹行的段（忽略过薄的线条）
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], rows.view(np.int8), [0]))))
+        heights = edges[1::2] - edges[0::2]
+        return [int(h) for h in heights if h >= min_row_height]
+
+    @staticmethod
+    def count_text_rows(image, min_row_height=3):
+        """
+        用水平投影统计图片中的文字行数（墨迹行之间有空白间隔视为不同的行）
+        :param image: PIL Image对象
+        :param min_row_height: 低于该高度（像素）的墨迹带视为表格线/下划线，不计为文字行
+        :return: 文字行数（对比度过低的空白图片为0）
+        """
+        return len(ImageUtils._text_row_heights(image, min_row_height))
+
+    @staticmethod
+    def estimate_text_height(image, min_row_height=3):
+        """
+        估计文字高度（各文字行墨迹带高度的中位数，不计彩色标记）
+        :param image: PIL Image对象
+        :param min_row_height: 低于该高度（像素）的墨迹带不计为文字行
+        :return: 像素；没有文字时为0
+        """
+        if image.mode in ('RGB', 'RGBA'):
+            # 按最亮的通道判断墨迹：黑/蓝色文字仍是墨迹，红色印章等彩色标记不计入（否则贯穿多行，行高被高估）
+            r, g, b = image.convert('RGB').split()
+            image = ImageChops.lighter(ImageChops.lighter(r, g), b)
+        heights = sorted(ImageUtils._text_row_heights(image, min_row_height))
+        return heights[len(heights) // 2] if heights else 0
+
+    @staticmethod
+    def is_colorless(image, max_chroma=None, max_color_ratio=None):
+        """
+        判断图片中的色彩对识别是否没有帮助（几乎没有彩色像素，如黑白/灰度扫描件）
+        :param image: PIL Image对象
+        :param max_chroma: 色度（RGB最大值-最小值）不超过该值的像素视为无色，None表示使用 Config.OCR_CROP_MAX_CHROMA
+        :param max_color_ratio: 彩色像素占比不超过该值时判为无色，None表示使用 Config.OCR_CROP_MAX_COLOR_RATIO
+        :return: 是否可以转为灰度
+        """
+        if image.mode in ('1', 'L', 'LA', 'I', 'F'):
+            return True
+        if max_chroma is None:
+            max_chroma = getattr(Config, 'OCR_CROP_MAX_CHROMA', 40)
+        if max_color_ratio is None:
+            max_color_ratio = getattr(Config, 'OCR_CROP_MAX_COLOR_RATIO', 0.01)
+        # 大图按整数倍缩小后统计（约5万像素足以判断），色度用 ImageChops 逐通道取最大/最小值计算
+        factor = max(1, int((image.width * image.height / 50000) ** 0.5))
+        sample = image.convert('RGB')
+        if factor > 1:
+            sample = sample.reduce(factor)
+        r, g, b = sample.split()
+        chroma = ImageChops.subtract(ImageChops.lighter(ImageChops.lighter(r, g), b),
+                                     ImageChops.darker(ImageChops.darker(r, g), b))
+        histogram = chroma.histogram()
+        return sum(histogram[max_chroma + 1:]) <= max_color_ratio * sum(histogram)
+
+    @staticmethod
+    def normalize_crop(image):
+        """
+        识别前规范化区域截图（Config.OCR_CROP_NORMALIZE）：
+          - 文字高度超过 OCR_CROP_MAX_TEXT_HEIGHT（高DPI扫描）或低于 OCR_CROP_MIN_TEXT_HEIGHT 时，
+            缩放到 OCR_CROP_TARGET_TEXT_HEIGHT（略低于识别模型的输入高度48），编码、传输与检测的像素都随之减少
+          - 色彩对识别没有帮助时转为单通道灰度（编码体积约为RGB的1/3）
+        :param image: PIL Image对象
+        :return: 规范化后的图片；无需处理时返回原图
+        """
+        if not getattr(Config, 'OCR_CROP_NORMALIZE', True) or image.width < 2 or image.height < 2:
+            return image
+
+        # 大截图缩小后估计（文字高度随之按倍数换算）
+        factor = max(1, int((image.width * image.height / 100000) ** 0.5))
+        sample = image.reduce(factor) if factor > 1 else image
+        text_height = ImageUtils.estimate_text_height(sample) * factor
+        min_height = getattr(Config, 'OCR_CROP_MIN_TEXT_HEIGHT', 8)
+        max_height = getattr(Config, 'OCR_CROP_MAX_TEXT_HEIGHT', 56)
+        if text_height and (text_height > max_height or text_height < min_height):
+            scale = getattr(Config, 'OCR_CROP_TARGET_TEXT_HEIGHT', 40) / text_height
+            size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+            if scale < 1:
+                image = image.resize(size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+            else:
+                image = image.resize(size, Image.Resampling.BICUBIC)
+
+        if getattr(Config, 'OCR_CROP_GRAYSCALE', True) and image.mode != 'L' and ImageUtils.is_colorless(image):
+            image = image.convert('L')
+        return image
+
+    @staticmethod
+    def trim_to_ink(image, padding_ratio=0.25):
+        """
+        裁掉文字周围的空白（仅识别、不检测时，识别模型需要与检测框一样紧凑的输入）
+        :param image: PIL Image对象
+        :param padding_ratio: 保留的边距（相对墨迹高度）
+        :return: 裁剪后的图片；没有墨迹时返回原图
+        """
+        import numpy as np
+        gray = np.asarray(image.convert('L'), dtype=np.uint8)
+        low, high = int(gray.min()), int(gray.max())
+        if high - low < 40:
+            return image
+        ink = gray < (low + high) // 2
+        ys = np.flatnonzero(ink.any(axis=1))
+        xs = np.flatnonzero(ink.any(axis=0))
+        pad = max(2, int((ys[-1] - ys[0] + 1) * padding_ratio))
+        return image.crop((max(0, xs[0] - pad), max(0, ys[0] - pad),
+                           min(image.width, xs[-1] + pad + 1), min(image.height, ys[-1] + pad + 1)))
+
+    @staticmethod
+    def is_single_line(image, max_height=None, min_aspect=None):
+        """
+        判断区域截图是否为单行文字（身份证号、日期、金额等字段）
+        先按高度与宽高比筛选，再用水平投影确认只有一行文字
+        :param image: PIL Image对象
+        :param max_height: 单行区域的最大高度（像素），None表示使用 Config.OCR_SINGLE_LINE_MAX_HEIGHT
+        :param min_aspect: 单行区域的最小宽高比，None表示使用 Config.OCR_SINGLE_LINE_MIN_ASPECT
+        :return: 是否为单行
+        """
+        if max_height is None:
+            max_height = getattr(Config, 'OCR_SINGLE_LINE_MAX_HEIGHT', 96)
+        if min_aspect is None:
+            min_aspect = getattr(Config, 'OCR_SINGLE_LINE_MIN_ASPECT', 2.0)
+        width, height = image.size
+        if height <= 0 or height > max_height or width < height * min_aspect:
+            return False
+        return ImageUtils.count_text_rows(image) == 1
+
 
 class ExcelExporter:
     """Excel导出工具类"""